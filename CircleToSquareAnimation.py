@@ -2,10 +2,17 @@ from manim import *
 import math
 import numpy as np
 from manim.utils.color.DVIPSNAMES import MAGENTA
+from numeric_tex import NumericMathTex
+from tracked_mobjects import (TrackedAngle, TrackedArrow, TrackedBrace, TrackedDot, TrackedLine,
+                              TrackedPerpendicularBisector)
+from reactive_updaters import ReactiveScene
+from frame_elision import FrameElisionScene
+from camera_culling import CullingScene
 
 
-class CircleToSquareAnimation(MovingCameraScene):
+class CircleToSquareAnimation(FrameElisionScene, ReactiveScene, CullingScene, MovingCameraScene):
     def construct(self):
+        graph = self.updater_graph
         self.camera.frame.scale(1.35)
         axes = Axes(
             x_range=[0, 10, 1],
@@ -41,10 +48,10 @@ class CircleToSquareAnimation(MovingCameraScene):
 
         G1 = Dot(axes.coords_to_point(0.2, 3), color=BLUE)
         G2 = Dot(axes.coords_to_point(3.5, 2.678), color=RED)
-        Gm = always_redraw(lambda: Dot((G1.get_center() + G2.get_center()) / 2, color=GREEN))
-        Gm_label = always_redraw(lambda: MathTex("G_m").next_to(Gm, RIGHT))
-        G1_label = always_redraw(lambda: MathTex("G_1").next_to(G1, LEFT))
-        G2_label = always_redraw(lambda: MathTex("G_2").next_to(G2, DOWN))
+        Gm = graph.track(TrackedDot(G1, G2, color=GREEN))
+        Gm_label = graph.add_updater(MathTex("G_m"), lambda m: m.next_to(Gm, RIGHT), inputs=[Gm])
+        G1_label = graph.add_updater(MathTex("G_1"), lambda m: m.next_to(G1, LEFT), inputs=[G1])
+        G2_label = graph.add_updater(MathTex("G_2"), lambda m: m.next_to(G2, DOWN), inputs=[G2])
         circle1 = Circle(radius=0.25, color=RED).move_to(G1)
         circle2 = Circle(radius=0.25, color=RED).move_to(G2)
         self.play(Create(circle1), Create(circle2))
@@ -61,13 +68,13 @@ class CircleToSquareAnimation(MovingCameraScene):
         self.play(Create(axes))
         self.wait()
 
-        G1R = always_redraw(lambda: Line(G1.get_center(), R.get_center()))
-        G1G2 = always_redraw(lambda: Line(G1.get_center(), G2.get_center()))
+        G1R = graph.track(TrackedLine(G1, R))
+        G1G2 = graph.track(TrackedLine(G1, G2))
 
-        angle = always_redraw(lambda: Angle(Line(G1.get_center(), R.get_center()),
-                                             Line(G1.get_center(), G2.get_center()),
-                                             radius=0.5))
-        theta_label = always_redraw(lambda: MathTex("\\theta").next_to(angle, 0.7 * RIGHT + 0.7 * DOWN, buff=0.1))
+        angle = graph.track(TrackedAngle(G1, R, G2, radius=0.5))
+        theta_label = graph.add_updater(
+            MathTex("\\theta"), lambda m: m.next_to(angle, 0.7 * RIGHT + 0.7 * DOWN, buff=0.1), inputs=[angle]
+        )
 
         def calculate_angle():
             vec_G1R = R.get_center() - G1.get_center()
@@ -87,11 +94,11 @@ class CircleToSquareAnimation(MovingCameraScene):
             cos_angle = np.clip(cos_angle, -1.0, 1.0)
             return math.degrees(math.acos(cos_angle))
 
-        theta_value_label = always_redraw(
-            lambda: MathTex(f"\\theta = {calculate_angle():.2f}°")
-            .set_color(WHITE)
-            .scale(0.7)
-            .move_to(self.camera.frame.get_left() + RIGHT)
+        theta_value_label = NumericMathTex("\\theta = {}°", calculate_angle()).set_color(WHITE).scale(0.7)
+        graph.add_updater(
+            theta_value_label,
+            lambda m: m.set_value(calculate_angle()).move_to(self.camera.frame.get_left() + RIGHT),
+            inputs=[G1, G2, R, self.camera.frame],
         )
         self.wait()
         self.play(Create(G1G2), Create(angle), Create(G1R))
@@ -117,8 +124,8 @@ class CircleToSquareAnimation(MovingCameraScene):
         # Fade out axes and G1 and G2
         self.play(FadeOut(axes), FadeOut(G1_label), FadeOut(G2_label))
         self.wait()
-        arrow_r_gm = always_redraw(lambda: Arrow(R.get_center(), Gm.get_center(), color=TEAL))
-        arrow_gm_goal = always_redraw(lambda: Arrow(Gm.get_center(), O.get_center(), color=TEAL))
+        arrow_r_gm = graph.track(TrackedArrow(R, Gm, color=TEAL))
+        arrow_gm_goal = graph.track(TrackedArrow(Gm, O, color=TEAL))
         self.play(Create(arrow_r_gm), Create(arrow_gm_goal))
         for _ in range(5):
             self.play(*[FadeIn(arrow_gm_goal), FadeIn(arrow_r_gm)], run_time=0.5)
@@ -128,7 +135,7 @@ class CircleToSquareAnimation(MovingCameraScene):
         #Fade in G1 and G2 label again
         self.play(FadeIn(G1_label), FadeIn(G2_label))
         D = Dot(Gm.get_center(), color=RED)
-        D_label = always_redraw(lambda: MathTex("D").next_to(D, DOWN))
+        D_label = graph.add_updater(MathTex("D"), lambda m: m.next_to(D, DOWN), inputs=[D])
 
         self.play(Create(D), Write(D_label))
         self.wait()
@@ -144,8 +151,8 @@ class CircleToSquareAnimation(MovingCameraScene):
         def endline():
             return Gm.get_center() + normal_vector() * length / 2
 
-        perp_bisector = always_redraw(lambda: DashedLine(startline(), endline(), color=RED))
-        perp_path = always_redraw(lambda: Line(startline(), endline()))
+        perp_bisector = graph.track(TrackedPerpendicularBisector(G1, G2, length, color=RED))
+        perp_path = TrackedLine(startline, endline)
         # D.move_to(perp_path.get_start())
 
         self.play(Create(perp_bisector))
@@ -155,10 +162,10 @@ class CircleToSquareAnimation(MovingCameraScene):
         self.wait()
 
 
-        D.add_updater(lambda mob: mob.move_to(startline()))
-        brace = always_redraw(lambda: BraceBetweenPoints(D.get_center(), Gm.get_center()))
+        graph.add_updater(D, lambda mob: mob.move_to(startline()), inputs=[Gm, G1, G2])
+        brace = graph.track(TrackedBrace(D, Gm))
         label = brace.get_text("Max distance").scale(0.5)
-        label.add_updater(lambda m: m.next_to(brace, DOWN))
+        graph.add_updater(label, lambda m: m.next_to(brace, DOWN), inputs=[brace])
         self.play(Create(brace), Write(label))
         self.wait()
 
@@ -0,0 +1,82 @@
+import numpy as np
+from manim import LinearBase, VMobject
+
+# Curves from NumPy-vectorized functions. Samples start on a coarse uniform
+# grid and every refinement round evaluates the midpoints of all intervals
+# that are still too coarse in one call, so steep or strongly curved stretches
+# (the ends of the entropy curve) get dense samples while flat ones keep the
+# coarse grid. The function is never called per sample from Python.
+#
+#     graph = plot_vectorized(axes, entropy, x_range=[0.001, 0.999], color=YELLOW)
+#     dot.add_updater(lambda m: m.move_to(graph.point_from_x(t_tracker.get_value())))
+#
+# ``graph.table`` is a precomputed interpolant of the function for mobjects
+# that follow a tracker along the curve.
+
+
+def adaptive_samples(function, x_min, x_max, tolerance, initial=17, max_depth=12, y_scale=1.0):
+    # Sorted (x, y) samples; an interval is split while its midpoint is more
+    # than ``tolerance`` (in y units times ``y_scale``) off the chord.
+    x = np.linspace(x_min, x_max, initial)
+    y = np.broadcast_to(np.asarray(function(x), dtype=float), x.shape)
+    xs, ys = [x], [y]
+    a, b, fa, fb = x[:-1], x[1:], y[:-1], y[1:]
+    for _ in range(max_depth):
+        if not len(a):
+            break
+        mid = (a + b) / 2
+        fmid = np.broadcast_to(np.asarray(function(mid), dtype=float), mid.shape)
+        xs.append(mid)
+        ys.append(fmid)
+        coarse = y_scale * np.abs(fmid - (fa + fb) / 2) > tolerance
+        a, b, fa, fb, mid, fmid = a[coarse], b[coarse], fa[coarse], fb[coarse], mid[coarse], fmid[coarse]
+        a, b = np.concatenate([a, mid]), np.concatenate([mid, b])
+        fa, fb = np.concatenate([fa, fmid]), np.concatenate([fmid, fb])
+    x, y = np.concatenate(xs), np.concatenate(ys)
+    order = np.argsort(x, kind="stable")
+    return x[order], y[order]
+
+
+class FunctionTable:
+    # Piecewise-linear interpolant of ``function`` on [x_min, x_max], accurate
+    # to ``tolerance``; takes scalars or arrays.
+    def __init__(self, function, x_range, tolerance=1e-4, **kwargs):
+        self.x, self.y = adaptive_samples(function, x_range[0], x_range[1], tolerance, **kwargs)
+
+    def __call__(self, x):
+        return np.interp(x, self.x, self.y)
+
+
+def axes_transform(axes):
+    # Scene position of the coordinate origin and of one unit along x and y.
+    # Only meaningful while both axes are linear.
+    for axis in (axes.x_axis, axes.y_axis):
+        if not isinstance(axis.scaling, LinearBase):
+            raise ValueError("plot_vectorized needs linear axes, use axes.plot for logarithmic ones")
+    origin = axes.coords_to_point(0, 0)
+    return origin, axes.coords_to_point(1, 0) - origin, axes.coords_to_point(0, 1) - origin
+
+
+class AdaptiveGraph(VMobject):
+    # The transform is taken when the graph is built, so position the axes
+    # first, as with axes.plot.
+    def __init__(self, axes, function, x_range, tolerance=0.005, table_tolerance=1e-4, **kwargs):
+        super().__init__(**kwargs)
+        self.underlying_function = function
+        self.origin, self.x_unit, self.y_unit = axes_transform(axes)
+        x, y = adaptive_samples(function, x_range[0], x_range[1], tolerance, y_scale=np.linalg.norm(self.y_unit))
+        self.set_points_smoothly(self.coords_to_points(x, y))
+        self.table = FunctionTable(function, x_range, table_tolerance)
+
+    def coords_to_points(self, x, y):
+        x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+        return self.origin + x[..., None] * self.x_unit + y[..., None] * self.y_unit
+
+    def point_from_x(self, x):
+        return self.coords_to_points(x, self.table(x))
+
+
+def plot_vectorized(axes, function, x_range=None, **kwargs):
+    # ``function`` takes and returns arrays; x_range defaults to the axes'.
+    x_range = axes.x_range[:2] if x_range is None else x_range
+    return AdaptiveGraph(axes, function, x_range, **kwargs)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+import os
+import ast
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import importlib
+import datetime
+import functools
+import tempfile
+import multiprocessing
+from contextlib import suppress
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from render_cache import RenderCache
+
+# Shared store for what Text, MarkupText, Tex and MathTex cost before the first
+# frame: the SVG Pango or LaTeX produced, and the SVG parsed into submobject
+# points and style. Each job otherwise redoes both in its own media directory.
+# Keys are content hashes (the typeset source, the font settings, the SVG
+# bytes), entries are written to a temporary name and renamed into place, so
+# concurrent jobs at worst compile the same asset twice. Parsed SVGs are plain
+# .npz arrays, loaded without touching the XML.
+#
+# ``prewarm`` compiles the literal text of a scene file (string literals passed
+# to those classes) in background processes; the watcher runs it on every save
+# so the assets are usually in the store by the time the render job asks.
+
+ASSET_DIR = "asset_cache"
+DEFAULT_MAX_MB = 256
+TEXT_CLASSES = ("Text", "MarkupText", "Tex", "MathTex", "SingleStringMathTex")
+PREWARM_WORKERS = min(2, os.cpu_count() or 1)
+# Bumped whenever the .npz layout changes, so older entries are never read.
+SVG_FORMAT = 2
+# Per-member style restored as saved: rgba arrays keep one row per gradient
+# stop, the rest are one value per submobject.
+STYLE_ARRAYS = ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas")
+STYLE_VALUES = ("stroke_width", "background_stroke_width", "sheen_factor", "sheen_direction")
+
+_active = None
+_installed = False
+_UNKNOWN = object()
+
+
+def _timestamp():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+class AssetStore(RenderCache):
+    def load(self, name):
+        try:
+            with np.load(self._path(name)) as data:
+                arrays = {key: data[key] for key in data.files}
+            os.utime(self._path(name))
+        except (OSError, ValueError, EOFError):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return arrays
+
+    def save(self, name, arrays):
+        path = self._path(name)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary, "wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(temporary, path)
+        except OSError:
+            with suppress(OSError):
+                os.remove(temporary)
+            return
+        self.stats["stored"] += 1
+
+
+def use(store):
+    # Selects the store for the next renders in this process (None disables it).
+    global _active
+    _active = store
+
+
+def _digest(*parts):
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+def _stacked(arrays, width):
+    return np.concatenate(arrays) if arrays else np.zeros((0, width))
+
+
+def _flatten(svg_mobject):
+    # Parsed submobjects with their class and full style, plus the id -> group
+    # membership MathTex splits on.
+    members = svg_mobject.submobjects
+    index = {id(mobject): i for i, mobject in enumerate(members)}
+    groups = svg_mobject.id_to_vgroup_dict
+    group_members = [[index[id(m)] for m in group.submobjects if id(m) in index] for group in groups.values()]
+    flat = {
+        "classes": np.array([f"{type(m).__module__}:{type(m).__qualname__}" for m in members], dtype=str),
+        "points": _stacked([m.points for m in members], 3),
+        "offsets": np.cumsum([0] + [len(m.points) for m in members]),
+        "group_names": np.array(list(groups), dtype=str),
+        "group_offsets": np.cumsum([0] + [len(g) for g in group_members]),
+        "group_members": np.array([i for g in group_members for i in g], dtype=int),
+    }
+    for name in STYLE_ARRAYS:
+        rows = [getattr(m, name) for m in members]
+        flat[name] = _stacked(rows, 4)
+        flat[f"{name}_offsets"] = np.cumsum([0] + [len(r) for r in rows])
+    for name in STYLE_VALUES:
+        flat[name] = np.array([np.asarray(getattr(m, name), dtype=float) for m in members])
+    return flat
+
+
+@functools.lru_cache(maxsize=None)
+def _class(name):
+    module, qualname = name.split(":")
+    cls = importlib.import_module(module)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    return cls
+
+
+def _restore(svg_mobject, arrays):
+    from manim import VGroup, VMobject
+
+    offsets = arrays["offsets"]
+    members = []
+    for i in range(len(offsets) - 1):
+        # Built as a plain VMobject and then given the parsed class, since
+        # e.g. VMobjectFromSVGPath can only be constructed from an SVG path.
+        # isinstance checks see the real class; constructor-only attributes
+        # (the parsed path, a Line's start and end) aren't restored.
+        mobject = VMobject()
+        mobject.__class__ = _class(str(arrays["classes"][i]))
+        mobject.points = arrays["points"][offsets[i]:offsets[i + 1]].copy()
+        for name in STYLE_ARRAYS:
+            rows = arrays[f"{name}_offsets"]
+            setattr(mobject, name, arrays[name][rows[i]:rows[i + 1]].copy())
+        for name in STYLE_VALUES:
+            value = arrays[name][i]
+            setattr(mobject, name, value.copy() if value.ndim else float(value))
+        members.append(mobject)
+    svg_mobject.add(*members)
+    group_offsets, group_members = arrays["group_offsets"], arrays["group_members"]
+    svg_mobject.id_to_vgroup_dict = {
+        str(name): VGroup(*[members[k] for k in group_members[group_offsets[i]:group_offsets[i + 1]]])
+        for i, name in enumerate(arrays["group_names"])
+    }
+    return svg_mobject
+
+
+def install():
+    global _installed
+    if _installed:
+        return
+    from pathlib import Path
+    from manim import config
+    from manim.mobject.svg.svg_mobject import SVGMobject
+    from manim.mobject.text import tex_mobject
+    from manim.mobject.text.text_mobject import MarkupText, Text
+    from manim.utils import tex_file_writing
+
+    original_tex_to_svg = tex_file_writing.tex_to_svg_file
+    original_generate = SVGMobject.generate_mobject
+
+    @functools.wraps(original_tex_to_svg)
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        store = _active
+        if store is None:
+            return original_tex_to_svg(expression, environment, tex_template)
+        template = tex_template or config["tex_template"]
+        # The .tex file is named after a hash of its full source.
+        tex_file = tex_file_writing.generate_tex_file(expression, environment, template)
+        name = f"tex-{tex_file.stem}-{_digest(template.tex_compiler, template.output_format)[:8]}.svg"
+        svg_file = tex_file.with_suffix(".svg")
+        if not svg_file.exists():
+            store.fetch(name, str(svg_file))
+        svg_file = original_tex_to_svg(expression, environment, tex_template)
+        store.store(name, str(svg_file))
+        return svg_file
+
+    def wrap_text2svg(cls):
+        original = cls._text2svg
+
+        @functools.wraps(original)
+        def _text2svg(self, color):
+            store = _active
+            if store is None:
+                return original(self, color)
+            hash_name = self._text2hash(color)
+            # Pango lays text out on a canvas the size of the output frame.
+            name = f"text-{hash_name}-{config['pixel_width']}x{config['pixel_height']}.svg"
+            target = Path(config.get_dir("text_dir")) / f"{hash_name}.svg"
+            if not target.exists():
+                store.fetch(name, str(target))
+            svg_file = original(self, color)
+            store.store(name, str(svg_file))
+            return svg_file
+
+        cls._text2svg = _text2svg
+
+    @functools.wraps(original_generate)
+    def generate_mobject(self):
+        store = _active
+        if store is None:
+            return original_generate(self)
+        source = self.get_file_path().read_bytes()
+        name = f"svg-{_digest(SVG_FORMAT, source, type(self).__name__, self.svg_default, self.path_string_config)}.npz"
+        arrays = store.load(name)
+        if arrays is not None:
+            return _restore(self, arrays)
+        original_generate(self)
+        store.save(name, _flatten(self))
+        return self
+
+    tex_file_writing.tex_to_svg_file = tex_to_svg_file
+    tex_mobject.tex_to_svg_file = tex_to_svg_file
+    wrap_text2svg(Text)
+    wrap_text2svg(MarkupText)
+    SVGMobject.generate_mobject = generate_mobject
+    _installed = True
+
+
+def literal_calls(source):
+    # (class name, args, literal kwargs, constant kwargs) for every call of a
+    # text class whose arguments are all known without running the file.
+    # Names bound once to a literal resolve to it; other upper-case names are
+    # looked up on manim (WHITE, BLUE...) when compiled.
+    tree = ast.parse(source)
+    bound = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                value = ast.literal_eval(node.value)
+            except (ValueError, TypeError, SyntaxError):
+                value = _UNKNOWN
+            name = node.targets[0].id
+            bound[name] = value if name not in bound else _UNKNOWN
+
+    def resolve(node):
+        if isinstance(node, ast.Name):
+            value = bound.get(node.id, _UNKNOWN)
+            if value is _UNKNOWN and node.id.isupper() and node.id not in bound:
+                return None, node.id
+            return value, None
+        try:
+            return ast.literal_eval(node), None
+        except (ValueError, TypeError, SyntaxError):
+            return _UNKNOWN, None
+
+    calls = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name not in TEXT_CLASSES or any(isinstance(a, ast.Starred) for a in node.args):
+            continue
+        args = [resolve(a) for a in node.args]
+        if not args or any(value is _UNKNOWN or constant for value, constant in args):
+            continue
+        kwargs, constants = {}, {}
+        for keyword in node.keywords:
+            if keyword.arg is None:
+                break
+            value, constant = resolve(keyword.value)
+            if value is _UNKNOWN:
+                break
+            if constant:
+                constants[keyword.arg] = constant
+            else:
+                kwargs[keyword.arg] = value
+        else:
+            calls.append((name, tuple(v for v, _ in args), kwargs, constants))
+    return calls
+
+
+def _spec_key(spec):
+    name, args, kwargs, constants = spec
+    return repr((name, args, sorted(kwargs.items()), sorted(constants.items())))
+
+
+def _compile(directory, max_bytes, specs, quality):
+    # Runs in a prewarm process: builds each mobject once with the store active.
+    import manim
+    from manim import tempconfig
+
+    install()
+    store = AssetStore(directory, max_bytes)
+    use(store)
+    failed = 0
+    with tempfile.TemporaryDirectory() as scratch:
+        with tempconfig({"quality": quality, "media_dir": scratch, "progress_bar": "none", "verbosity": "ERROR"}):
+            for name, args, kwargs, constants in specs:
+                try:
+                    kwargs = dict(kwargs, **{key: getattr(manim, value) for key, value in constants.items()})
+                    getattr(manim, name)(*args, **kwargs)
+                except Exception:
+                    failed += 1
+    store.evict()
+    return {"compiled": len(specs) - failed, "failed": failed, **store.stats}
+
+
+def _chunks(items, parts):
+    parts = max(1, min(parts, len(items)))
+    return [items[k::parts] for k in range(parts)]
+
+
+def prewarm(file_paths, directory, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, quality="low_quality",
+            workers=PREWARM_WORKERS):
+    specs = {}
+    for file_path in file_paths:
+        with open(file_path, encoding="utf-8") as handle:
+            for spec in literal_calls(handle.read()):
+                specs.setdefault(_spec_key(spec), spec)
+    specs = list(specs.values())
+    totals = {"compiled": 0, "failed": 0, "hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+    if not specs:
+        return totals
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for stats in pool.map(_compile, *zip(*[(directory, max_bytes, chunk, quality)
+                                               for chunk in _chunks(specs, workers)])):
+            for key in totals:
+                totals[key] += stats[key]
+    return totals
+
+
+class AssetPrewarmer:
+    # Watcher side: literals of each saved file are compiled once per session
+    # on a small background pool, next to (not instead of) the render workers.
+    def __init__(self, directory, max_bytes, quality, workers=PREWARM_WORKERS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.quality = quality
+        self.workers = workers
+        self._pool = None
+        self._seen = set()
+
+    def prewarm(self, file_path):
+        try:
+            with open(file_path, encoding="utf-8") as handle:
+                specs = literal_calls(handle.read())
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            # Half-written saves are retried on the next event.
+            return
+        new = [spec for spec in specs if _spec_key(spec) not in self._seen]
+        if not new:
+            return
+        self._seen.update(_spec_key(spec) for spec in new)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        started = time.perf_counter()
+        filename = os.path.basename(file_path)
+        for chunk in _chunks(new, self.workers):
+            future = self._pool.submit(_compile, self.directory, self.max_bytes, chunk, self.quality)
+            future.add_done_callback(lambda f: self._done(f, filename, started))
+
+    def _done(self, future, filename, started):
+        if future.cancelled() or future.exception() is not None:
+            return
+        stats = future.result()
+        print(f"[{_timestamp()}] 🔥 Prewarmed {stats['compiled']} text assets from {filename}"
+              f" ({stats['hits']} already cached, {time.perf_counter() - started:.2f}s)")
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prewarm or trim the shared Text/Tex asset store.")
+    parser.add_argument("files", nargs="*", help="scene files whose literal text to compile")
+    parser.add_argument("--directory", default=os.path.join("media", ASSET_DIR))
+    parser.add_argument("-w", "--workers", type=int, default=PREWARM_WORKERS)
+    parser.add_argument("--quality", default="low_quality")
+    parser.add_argument("--max-mb", type=float, default=DEFAULT_MAX_MB)
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+    if args.clear:
+        shutil.rmtree(args.directory, ignore_errors=True)
+        print(f"🧹 Cleared {args.directory}")
+        sys.exit(0)
+    started = time.perf_counter()
+    totals = prewarm(args.files, args.directory, int(args.max_mb * 1024 * 1024), args.quality, args.workers)
+    entries = AssetStore(args.directory).entries()
+    print(f"🔥 {totals['compiled']} assets compiled ({totals['failed']} failed, {totals['hits']} already cached)"
+          f" in {time.perf_counter() - started:.2f}s; store holds {len(entries)} files,"
+          f" {sum(size for _, size, _ in entries) / 1024 / 1024:.1f} MB")
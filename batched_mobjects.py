@@ -0,0 +1,257 @@
+import numpy as np
+from manim import (Animation, Create, DashedVMobject, Square, Uncreate, VMobject, GRAY, GREEN, YELLOW,
+                   color_to_rgb, rgb_to_color)
+
+# Ray fans and voxel fields with thousands of elements, kept as arrays instead
+# of one Line or Square per element. Geometry lives in per-element arrays
+# (ray ends, cell centers) and style in per-element ``colors``, ``opacities``,
+# ``widths`` and ``fill_opacities``. A cairo VMobject carries a single style,
+# so elements that currently look the same share one child VMobject whose
+# points are every one of their subpaths back to back; there are as many
+# children as distinct styles, not as elements. Subclasses give the geometry
+# with ``element_points(indices, kind)``.
+#
+#     rays = RayFan(camera_pos, ray_ends, color=YELLOW, width=1, opacity=0.7)
+#     self.play(BatchedCreate(rays))
+#     self.play(BatchedStyleAnimation(rays, opacity=1, width=3))
+#
+# Plain Create would draw the children, i.e. the style buckets, one after the
+# other; BatchedCreate and BatchedUncreate time every element the way Create
+# times the members of a VGroup.
+#
+# Move elements through their arrays (``set_ends``, ``set_centers``), not by
+# transforming the children: every rebuild rewrites children from the arrays.
+# Style changes made from an updater in the middle of a play can need a new
+# child, which manim only draws from the next play on; animate styles with
+# BatchedStyleAnimation instead.
+
+_LINE_HANDLES = np.array([0.0, 1 / 3, 2 / 3, 1.0])[:, None]
+
+
+class BatchedVMobject(VMobject):
+    def __init__(self, count, color, opacity, width, fill_opacity=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.kinds = np.zeros(count, dtype=int)
+        self.colors = np.tile(color_to_rgb(color), (count, 1))
+        self.opacities = np.full(count, float(opacity))
+        self.widths = np.full(count, float(width))
+        self.fill_opacities = np.full(count, float(fill_opacity))
+
+    @property
+    def element_count(self):
+        return len(self.kinds)
+
+    def styles(self):
+        return np.column_stack([self.colors, self.opacities, self.widths, self.fill_opacities])
+
+    def rebuild(self, split=None):
+        # Regroups elements by kind and style (and ``split``, which keeps
+        # elements about to diverge apart), rewriting a child's points only
+        # when its members changed.
+        keys = np.column_stack([self.kinds, self.styles()] + ([] if split is None else [split]))
+        keys = np.ascontiguousarray(keys.round(6))
+        _, first, inverse = np.unique(keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))),
+                                      return_index=True, return_inverse=True)
+        members = np.split(np.argsort(inverse.ravel(), kind="stable"), np.cumsum(np.bincount(inverse.ravel()))[:-1])
+        children = list(self.submobjects)
+        for bucket, indices in enumerate(members):
+            kind = self.kinds[first[bucket]]
+            if bucket < len(children):
+                child = children[bucket]
+            else:
+                child = VMobject()
+                child.batch_kind, child.batch_members = None, None
+                self.add(child)
+            if child.batch_kind != kind or not np.array_equal(child.batch_members, indices):
+                child.set_points(self.element_points(indices, kind).reshape(-1, 3))
+                child.batch_kind, child.batch_members = kind, indices
+        self.remove(*children[len(members):])
+        self.restyle()
+        return self
+
+    def restyle(self):
+        # Children's members always share a style, so this is O(children).
+        for child in self.submobjects:
+            index = child.batch_members[0]
+            color = rgb_to_color(self.colors[index])
+            child.set_stroke(color=color, width=self.widths[index], opacity=self.opacities[index])
+            child.set_fill(color=color, opacity=self.fill_opacities[index])
+        return self
+
+    def set_element_style(self, indices=None, color=None, opacity=None, width=None, fill_opacity=None):
+        indices = slice(None) if indices is None else indices
+        if color is not None:
+            self.colors[indices] = color_to_rgb(color)
+        for values, value in ((self.opacities, opacity), (self.widths, width), (self.fill_opacities, fill_opacity)):
+            if value is not None:
+                values[indices] = value
+        return self.rebuild()
+
+    def element_center(self, index):
+        return self.element_points([index], self.kinds[index])[0].mean(axis=0)
+
+
+def _blossom(curves, u, v, w):
+    # Cubic blossom of every curve (..., 4, 3) at (u, v, w), with one value
+    # per curve; (t, t, t) is the point at t.
+    for t in (u, v, w):
+        curves = curves[..., :-1, :] + t[..., None, None] * (curves[..., 1:, :] - curves[..., :-1, :])
+    return curves[..., 0, :]
+
+
+def _point_at(curves, proportion):
+    # Point at ``proportion`` of each element's path of curves (elements, curves, 4, 3).
+    count = curves.shape[1]
+    index = np.minimum((proportion * count).astype(int), count - 1)
+    t = proportion * count - index
+    return _blossom(curves[np.arange(len(curves)), index], t, t, t)
+
+
+def partial_paths(points, lower, upper):
+    # The part of each element's path between its own ``lower`` and ``upper``
+    # proportions, like VMobject.pointwise_become_partial does for one path:
+    # the point count stays the same, curves outside collapse onto the ends.
+    curves = points.reshape(len(points), -1, 4, 3)
+    count = curves.shape[1]
+    index = np.arange(count)
+    start = np.clip(lower[:, None] * count - index, 0, 1)
+    end = np.clip(upper[:, None] * count - index, 0, 1)
+    partial = np.stack([_blossom(curves, start, start, start), _blossom(curves, start, start, end),
+                        _blossom(curves, start, end, end), _blossom(curves, end, end, end)], axis=2)
+    before = index[None] + 1 <= lower[:, None] * count
+    after = (end <= start) & ~before
+    partial[before] = np.broadcast_to(_point_at(curves, lower)[:, None, None], partial.shape)[before]
+    partial[after] = np.broadcast_to(_point_at(curves, upper)[:, None, None], partial.shape)[after]
+    return partial.reshape(points.shape)
+
+
+class RayFan(BatchedVMobject):
+    # One straight segment per ray from a shared origin (or one origin per ray).
+    def __init__(self, origin, ends, color=YELLOW, opacity=1.0, width=1, **kwargs):
+        ends = np.asarray(ends, dtype=float)
+        super().__init__(len(ends), color, opacity, width, **kwargs)
+        self.origins = np.broadcast_to(np.asarray(origin, dtype=float), ends.shape).copy()
+        self.ends = ends
+        self.rebuild()
+
+    def element_points(self, indices, kind):
+        origins, ends = self.origins[indices], self.ends[indices]
+        return origins[:, None] + _LINE_HANDLES[None] * (ends - origins)[:, None]
+
+    def set_ends(self, ends, origin=None):
+        self.ends = np.asarray(ends, dtype=float)
+        if origin is not None:
+            self.origins = np.broadcast_to(np.asarray(origin, dtype=float), self.ends.shape).copy()
+        for child in self.submobjects:
+            child.batch_members = None
+        return self.rebuild()
+
+
+class VoxelField(BatchedVMobject):
+    # Square cells of one size; cells flagged ``dashed`` get a dashed outline
+    # like DashedVMobject(Square(...), num_dashes=8).
+    SOLID, DASHED = 0, 1
+
+    def __init__(self, centers, side_length=0.5, dashed=None, color=GREEN, opacity=1.0, width=4,
+                 fill_opacity=0.7, num_dashes=8, **kwargs):
+        centers = np.asarray(centers, dtype=float)
+        super().__init__(len(centers), color, opacity, width, fill_opacity, **kwargs)
+        self.centers = centers
+        self.templates = {
+            self.SOLID: Square(side_length=side_length).points,
+            self.DASHED: np.concatenate([dash.points for dash in
+                                         DashedVMobject(Square(side_length=side_length), num_dashes=num_dashes)]),
+        }
+        if dashed is not None:
+            self.kinds[np.asarray(dashed, dtype=bool)] = self.DASHED
+        self.rebuild()
+
+    def element_points(self, indices, kind):
+        return self.centers[indices][:, None] + self.templates[kind][None]
+
+    def set_centers(self, centers):
+        self.centers = np.asarray(centers, dtype=float)
+        for child in self.submobjects:
+            child.batch_members = None
+        return self.rebuild()
+
+    def style_dashed(self, color=GRAY, opacity=1.0, width=4):
+        # Outline-only look of the dashed cells.
+        return self.set_element_style(self.kinds == self.DASHED, color=color, opacity=opacity, width=width,
+                                      fill_opacity=0)
+
+
+class BatchedStyleAnimation(Animation):
+    # Moves the style of a subset of elements (all of them by default) to the
+    # given values with one vectorized interpolation per frame. Elements that
+    # start alike stay alike for the whole animation, so the children are
+    # regrouped once in begin() and only restyled in between.
+    def __init__(self, mobject, indices=None, color=None, opacity=None, width=None, fill_opacity=None, **kwargs):
+        self.indices = np.arange(mobject.element_count) if indices is None else np.asarray(indices)
+        if self.indices.dtype == bool:
+            self.indices = np.flatnonzero(self.indices)
+        self.targets = {"colors": None if color is None else color_to_rgb(color), "opacities": opacity,
+                        "widths": width, "fill_opacities": fill_opacity}
+        self.targets = {name: value for name, value in self.targets.items() if value is not None}
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        mobject = self.mobject
+        self.starts = {name: getattr(mobject, name)[self.indices].copy() for name in self.targets}
+        moving = np.zeros(mobject.element_count, dtype=bool)
+        moving[self.indices] = True
+        mobject.rebuild(split=moving)
+        # Animation.begin would copy the whole mobject, which isn't needed here.
+        self.starting_mobject = mobject
+        if self.suspend_mobject_updating:
+            mobject.suspend_updating()
+        self.interpolate(0)
+
+    def interpolate_mobject(self, alpha):
+        for name, target in self.targets.items():
+            start = self.starts[name]
+            getattr(self.mobject, name)[self.indices] = start + alpha * (np.asarray(target) - start)
+        self.mobject.restyle()
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        self.mobject.rebuild()
+
+
+class _BatchedPartial:
+    # Create's per-member timing (lag_ratio and rate function included) applied
+    # to the elements of a BatchedVMobject, each drawn along its own path.
+    def begin(self):
+        # Animation.begin would copy the whole mobject, which isn't needed here.
+        self.starting_mobject = self.mobject
+        if self.suspend_mobject_updating:
+            self.mobject.suspend_updating()
+        self.interpolate(0)
+
+    def interpolate_mobject(self, alpha):
+        mobject = self.mobject
+        count = mobject.element_count
+        # Animation.get_sub_alpha for every element at once.
+        values = alpha * ((count - 1) * self.lag_ratio + 1) - np.arange(count) * self.lag_ratio
+        if self.reverse_rate_function:
+            values = 1 - values
+        sub_alphas = np.clip([self.rate_func(value) for value in values], 0, 1)
+        lower, upper = (np.broadcast_to(bound, sub_alphas.shape) for bound in self._get_bounds(sub_alphas))
+        for child in mobject.submobjects:
+            members = child.batch_members
+            points = mobject.element_points(members, child.batch_kind)
+            child.set_points(partial_paths(points, lower[members], upper[members]).reshape(-1, 3))
+
+    def clean_up_from_scene(self, scene):
+        super().clean_up_from_scene(scene)
+        for child in self.mobject.submobjects:
+            child.batch_members = None
+        self.mobject.rebuild()
+
+
+class BatchedCreate(_BatchedPartial, Create):
+    pass
+
+
+class BatchedUncreate(_BatchedPartial, Uncreate):
+    pass
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manim import Axes, Dot, ValueTracker, RED, YELLOW, always_redraw
+from adaptive_plot import plot_vectorized
+
+
+def entropy_scalar(p):
+    # The per-sample function create_entropy_animation used to plot.
+    if p <= 0 or p >= 1:
+        return 0
+    return -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+
+
+def entropy(p):
+    p = np.asarray(p, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+    return np.where((p > 0) & (p < 1), h, 0.0)
+
+
+def _axes():
+    return Axes(x_range=[0, 1, 0.1], y_range=[0, 1.2, 0.2], x_length=8, y_length=4)
+
+
+def _curve_points(graph, per_curve=16):
+    # Dense polyline along every cubic of the graph.
+    curves = graph.points.reshape(-1, 4, 3)
+    t = np.linspace(0, 1, per_curve)[:, None]
+    weights = np.stack([(1 - t) ** 3, 3 * (1 - t) ** 2 * t, 3 * (1 - t) * t ** 2, t ** 3], axis=1)[..., 0]
+    return np.einsum("tk,ckd->ctd", weights, curves).reshape(-1, 3)
+
+
+def _deviation(axes, graph, x_range):
+    # Largest distance, in scene units, from the exact curve to the drawn one.
+    x = np.linspace(*x_range, 2001)
+    exact = axes.coords_to_point(np.column_stack([x, entropy(x)]))
+    drawn = _curve_points(graph)
+    return max(np.min(np.linalg.norm(drawn - point, axis=1)) for point in exact)
+
+
+def _time(function, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - started) / repeat * 1000, result
+
+
+def run(frames=240, repeat=5):
+    axes = _axes()
+    x_range = [0.001, 0.999]
+    scalar_ms, scalar_graph = _time(lambda: axes.plot(lambda x: entropy_scalar(x) if 0 < x < 1 else 0,
+                                                      x_range=x_range, color=YELLOW), repeat)
+    vector_ms, vector_graph = _time(lambda: plot_vectorized(axes, entropy, x_range=x_range, color=YELLOW), repeat)
+
+    t_tracker = ValueTracker(0.1)
+    redraw = always_redraw(lambda: Dot(axes.c2p(t_tracker.get_value(), entropy_scalar(t_tracker.get_value())),
+                                       color=RED, radius=0.08))
+    tracked = Dot(vector_graph.point_from_x(0.1), color=RED, radius=0.08)
+    tracked.add_updater(lambda m: m.move_to(vector_graph.point_from_x(t_tracker.get_value())))
+    frame_ms = {}
+    for name, mobject in (("always_redraw", redraw), ("table", tracked)):
+        started = time.perf_counter()
+        for frame in range(frames):
+            t_tracker.set_value(0.1 + 0.8 * frame / frames)
+            mobject.update(1 / 60)
+        frame_ms[name] = (time.perf_counter() - started) / frames * 1000
+
+    return {
+        "build_ms": {"plot": scalar_ms, "plot_vectorized": vector_ms},
+        "curves": {"plot": len(scalar_graph.points) // 4, "plot_vectorized": len(vector_graph.points) // 4},
+        "deviation": {"plot": _deviation(axes, scalar_graph, x_range),
+                      "plot_vectorized": _deviation(axes, vector_graph, x_range)},
+        "frame_ms": frame_ms,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="axes.plot with a scalar function against plot_vectorized.")
+    parser.add_argument("--frames", type=int, default=240)
+    args = parser.parse_args()
+    r = run(args.frames)
+    for name in ("plot", "plot_vectorized"):
+        print(f"{name:<16} build {r['build_ms'][name]:7.2f} ms  {r['curves'][name]:>5} curves"
+              f"  max deviation {r['deviation'][name]:.4f} units")
+    for name, ms in r["frame_ms"].items():
+        print(f"{name:<16} {ms:7.3f} ms/frame for the sliding dot")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manim import Camera, Line, Mobject, Square, VGroup, GREEN, YELLOW
+from batched_mobjects import BatchedStyleAnimation, RayFan, VoxelField
+
+SIZES = (1_000, 10_000, 100_000)
+
+
+def _rays(count):
+    angles = np.linspace(-np.pi / 6, np.pi / 6, count)
+    return np.zeros(3), 6 * np.column_stack([np.cos(angles), np.sin(angles), np.zeros(count)])
+
+
+def _centers(count):
+    side = int(np.ceil(np.sqrt(count)))
+    cells = np.argwhere(np.ones((side, side), dtype=bool))[:count]
+    return np.column_stack([(cells - side / 2) * 0.05, np.zeros(count)])
+
+
+def group_rays(count):
+    # The per-ray Lines view_frustum.py used to build.
+    origin, ends = _rays(count)
+    return VGroup(*[Line(origin, end, color=YELLOW, stroke_width=1, stroke_opacity=0.7) for end in ends])
+
+
+def group_voxels(count):
+    return VGroup(*[Square(side_length=0.04, color=GREEN, fill_opacity=0.7).move_to(center)
+                    for center in _centers(count)])
+
+
+def batched_rays(count):
+    origin, ends = _rays(count)
+    return RayFan(origin, ends, color=YELLOW, width=1, opacity=0.7)
+
+
+def batched_voxels(count):
+    return VoxelField(_centers(count), side_length=0.04, color=GREEN, fill_opacity=0.7)
+
+
+def group_restyle(mobject, subset, alpha):
+    # What ``ray.animate.set_stroke(...)`` does to each element every frame.
+    for index in subset:
+        mobject[index].set_stroke(opacity=0.7 + 0.3 * alpha, width=1 + 2 * alpha)
+
+
+def _measure(build, count, frames, draw):
+    constructed = [0]
+    original_init = Mobject.__init__
+
+    def counting_init(self, *args, **kwargs):
+        constructed[0] += 1
+        original_init(self, *args, **kwargs)
+
+    Mobject.__init__ = counting_init
+    tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        mobject = build(count)
+        build_s = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        Mobject.__init__ = original_init
+
+    # Restyle every other element, as the ray scanning step does for a subset.
+    subset = np.arange(0, count, 2)
+    if isinstance(mobject, VGroup):
+        started = time.perf_counter()
+        for frame in range(frames):
+            group_restyle(mobject, subset, frame / max(frames - 1, 1))
+    else:
+        animation = BatchedStyleAnimation(mobject, subset, opacity=1, width=3)
+        started = time.perf_counter()
+        animation.begin()
+        for frame in range(frames):
+            animation.interpolate(frame / max(frames - 1, 1))
+        animation.finish()
+    restyle_ms = (time.perf_counter() - started) / frames * 1000
+
+    result = {"build_s": build_s, "mobjects": constructed[0], "peak_mb": peak / 1024 / 1024,
+              "restyle_ms": restyle_ms}
+    if draw:
+        camera = Camera()
+        started = time.perf_counter()
+        camera.capture_mobject(mobject)
+        result["draw_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def run(sizes=SIZES, frames=30, draw=False):
+    results = []
+    for count in sizes:
+        for kind, group, batched in (("rays", group_rays, batched_rays), ("voxels", group_voxels, batched_voxels)):
+            results.append({"kind": kind, "count": count,
+                            "vgroup": _measure(group, count, frames, draw),
+                            "batched": _measure(batched, count, frames, draw)})
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-element VGroups against batched ray fans and voxel fields.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES))
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--draw", action="store_true", help="also time one cairo capture of each mobject")
+    args = parser.parse_args()
+    for r in run([int(s) for s in args.sizes.split(",")], args.frames, args.draw):
+        print(f"{r['kind']:<7}{r['count']:>8}")
+        for name in ("vgroup", "batched"):
+            m = r[name]
+            print(f"  {name:<8} build {m['build_s']:8.3f}s  {m['mobjects']:>7} mobjects  peak {m['peak_mb']:8.1f} MiB"
+                  f"  restyle {m['restyle_ms']:9.3f} ms/frame"
+                  + (f"  draw {m['draw_ms']:9.1f} ms" if "draw_ms" in m else ""))
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from manim import tempconfig
+
+import frame_elision
+from render_worker import load_scene_module
+from segment_render import frame_digests
+
+SCENES = [("view_frustum.py", "NBVVisualization"), ("CircleToSquareAnimation.py", "CircleToSquareAnimation")]
+
+
+def _render(file_name, scene_name, elide):
+    # Returns wall time and the digest of every frame decoded from the finished
+    # movie, so both runs are compared on what actually ended up in the file.
+    frame_elision.enabled = elide
+    frame_elision.stats.update(frames=0, elided=0, mismatches=0)
+    try:
+        module = load_scene_module(os.path.join(ROOT, file_name), ROOT)
+        with tempfile.TemporaryDirectory() as media_dir:
+            with tempconfig({"quality": "low_quality", "media_dir": media_dir, "disable_caching": True,
+                             "progress_bar": "none", "input_file": os.path.join(ROOT, file_name)}):
+                scene = getattr(module, scene_name)()
+                started = time.perf_counter()
+                scene.render()
+                elapsed = time.perf_counter() - started
+                digests = frame_digests(str(scene.renderer.file_writer.movie_file_path))
+    finally:
+        frame_elision.enabled = True
+    return elapsed, digests, dict(frame_elision.stats)
+
+
+def run(scenes=SCENES):
+    frame_elision.install()
+    results = []
+    for file_name, scene_name in scenes:
+        baseline_s, baseline, _ = _render(file_name, scene_name, elide=False)
+        elided_s, elided, stats = _render(file_name, scene_name, elide=True)
+        results.append({
+            "scene": scene_name,
+            "frames": len(baseline),
+            "elided": stats["elided"],
+            "baseline_s": baseline_s,
+            "elided_s": elided_s,
+            "identical": baseline == elided,
+        })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render scenes with and without static-frame elision and compare.")
+    parser.add_argument("scenes", nargs="*", help="file.py:SceneName (default: the repo's scenes)")
+    args = parser.parse_args()
+    scenes = [tuple(spec.split(":", 1)) for spec in args.scenes] or SCENES
+    for r in run(scenes):
+        print(f"{r['scene']:<26} {r['frames']:>5} frames, {r['elided']:>5} elided"
+              f" | {r['baseline_s']:.2f}s -> {r['elided_s']:.2f}s ({r['baseline_s'] / r['elided_s']:.2f}x)"
+              f" | output {'identical' if r['identical'] else 'DIFFERS'}")
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manim import MathTex
+from numeric_tex import NumericMathTex
+
+
+def run(frames=120, template="\\theta = {}°"):
+    # Per-frame cost of the label in CircleToSquareAnimation: a fresh MathTex
+    # per frame (what always_redraw did) against NumericMathTex.set_value.
+    # Values sweep a range wide enough that the LaTeX cache cannot hide compiles.
+    values = [37.0 + 0.173 * frame for frame in range(frames)]
+
+    started = time.perf_counter()
+    for value in values:
+        MathTex(template.format(f"{value:.2f}")).scale(0.7)
+    rebuild = (time.perf_counter() - started) / frames
+
+    label = NumericMathTex(template, values[0]).scale(0.7)
+    started = time.perf_counter()
+    for value in values:
+        label.set_value(value)
+    templated = (time.perf_counter() - started) / frames
+    return {"frames": frames, "rebuild_ms": rebuild * 1000, "set_value_ms": templated * 1000}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-frame MathTex rebuilds with NumericMathTex.set_value.")
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+    result = run(args.frames)
+    print(f"{result['frames']} frames: MathTex per frame {result['rebuild_ms']:.2f} ms, "
+          f"set_value {result['set_value_ms']:.3f} ms ({result['rebuild_ms'] / result['set_value_ms']:.0f}x)")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manim import (Angle, Arrow, BraceBetweenPoints, DashedLine, Dot, Line, Mobject, BLUE, GREEN, ORANGE, RED,
+                   TEAL, YELLOW, PI, always_redraw, normalize, rotate_vector)
+from tracked_mobjects import (TrackedAngle, TrackedArrow, TrackedBrace, TrackedDot, TrackedLine,
+                              TrackedPerpendicularBisector)
+
+
+def _anchors():
+    R = Dot([-3.5, -3.5, 0], color=ORANGE)
+    O = Dot([-3.5, 3.5, 0], color=YELLOW)
+    G1 = Dot([-3.36, 0.0, 0], color=BLUE)
+    G2 = Dot([-1.05, -0.37, 0], color=RED)
+    return R, O, G1, G2
+
+
+def redraw_geometry(R, O, G1, G2):
+    # The always_redraw geometry of CircleToSquareAnimation, verbatim.
+    Gm = always_redraw(lambda: Dot((G1.get_center() + G2.get_center()) / 2, color=GREEN))
+
+    def normal_vector():
+        return normalize(rotate_vector(G2.get_center() - G1.get_center(), PI / 2))
+
+    D = Dot().add_updater(lambda m: m.move_to(Gm.get_center() - normal_vector() * 3))
+    return [
+        Gm, D,
+        always_redraw(lambda: Line(G1.get_center(), R.get_center())),
+        always_redraw(lambda: Line(G1.get_center(), G2.get_center())),
+        always_redraw(lambda: Angle(Line(G1.get_center(), R.get_center()), Line(G1.get_center(), G2.get_center()),
+                                    radius=0.5)),
+        always_redraw(lambda: Arrow(R.get_center(), Gm.get_center(), color=TEAL)),
+        always_redraw(lambda: Arrow(Gm.get_center(), O.get_center(), color=TEAL)),
+        always_redraw(lambda: DashedLine(Gm.get_center() - normal_vector() * 3, Gm.get_center() + normal_vector() * 3,
+                                         color=RED)),
+        always_redraw(lambda: BraceBetweenPoints(D.get_center(), Gm.get_center())),
+    ]
+
+
+def tracked_geometry(R, O, G1, G2):
+    Gm = TrackedDot(G1, G2, color=GREEN)
+    bisector = TrackedPerpendicularBisector(G1, G2, 6, color=RED)
+    D = Dot().add_updater(lambda m: m.move_to(bisector.get_start()))
+    return [
+        Gm, bisector, D,
+        TrackedLine(G1, R),
+        TrackedLine(G1, G2),
+        TrackedAngle(G1, R, G2, radius=0.5),
+        TrackedArrow(R, Gm, color=TEAL),
+        TrackedArrow(Gm, O, color=TEAL),
+        TrackedBrace(D, Gm),
+    ]
+
+
+def _measure(build, frames):
+    R, O, G1, G2 = _anchors()
+    mobjects = build(R, O, G1, G2)
+    constructed = [0]
+    original_init = Mobject.__init__
+
+    def counting_init(self, *args, **kwargs):
+        constructed[0] += 1
+        original_init(self, *args, **kwargs)
+
+    Mobject.__init__ = counting_init
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        for frame in range(frames):
+            # Same motion as the G1/G2 shifts in the scene, one frame at a time.
+            G1.shift([0.2 / frames, 0.5 / frames, 0])
+            G2.shift([-1.2 / frames, -1.0 / frames, 0])
+            for mobject in mobjects:
+                mobject.update(1 / 60)
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        Mobject.__init__ = original_init
+    return {"frame_ms": elapsed / frames * 1000, "mobjects_per_frame": constructed[0] / frames,
+            "peak_kb": peak / 1024}
+
+
+def run(frames=120):
+    return {"frames": frames, "always_redraw": _measure(redraw_geometry, frames),
+            "tracked": _measure(tracked_geometry, frames)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-frame cost of always_redraw geometry against tracked mobjects.")
+    parser.add_argument("--frames", type=int, default=120)
+    args = parser.parse_args()
+    result = run(args.frames)
+    print(f"{result['frames']} frames of CircleToSquareAnimation geometry")
+    for name in ("always_redraw", "tracked"):
+        r = result[name]
+        print(f"  {name:<14} {r['frame_ms']:7.3f} ms/frame  {r['mobjects_per_frame']:6.1f} mobjects/frame"
+              f"  peak {r['peak_kb']:8.1f} KiB")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import platform
+import resource
+import argparse
+import tempfile
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+from render_telemetry import git_revision
+
+# Headless benchmark suite: renders the repo's scenes and runs the hot-path
+# micro-benchmarks, saves the numbers as a JSON baseline and compares later
+# runs against one.
+#
+#     python benchmarks/run_benchmarks.py --save benchmarks/baseline.json
+#     python benchmarks/run_benchmarks.py --compare benchmarks/baseline.json
+#
+# Every scene renders in a fresh process at a fixed quality with movie writing
+# and caching off, so it pays its own imports, LaTeX and Pango work and its
+# peak RSS is its own. Time, memory and compile counts are lower-is-better and
+# gated by --threshold; other numbers are reported only.
+
+SCENES = [
+    ("moving_point_and_line.py", "MovingPointAndLine"),
+    ("CircleToSquareAnimation.py", "CircleToSquareAnimation"),
+    ("view_frustum.py", "NBVVisualization"),
+]
+QUALITY = "low_quality"
+DEFAULT_THRESHOLD = 0.10
+GATED_SUFFIXES = ("_s", "_ms", "_mb", "_kb", "_compiles")
+
+
+def _render_scene(file_name, scene_name, quality):
+    # Runs in its own process. Frame elision is installed first, as in the
+    # watcher's workers, so the frame timer below sees elided frames too.
+    from manim import Scene, tempconfig
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.utils import tex_file_writing
+    import manimpango
+
+    import frame_elision
+    from render_worker import load_scene_module
+
+    frame_elision.install()
+    frame_times, updater_times, compiles = [], [], {"tex": 0, "text": 0}
+
+    def timed(original, into):
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                into.append(time.perf_counter() - started)
+        return wrapper
+
+    def counted(original, key):
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            compiles[key] += 1
+            return original(*args, **kwargs)
+        return wrapper
+
+    CairoRenderer.render = timed(CairoRenderer.render, frame_times)
+    Scene.update_mobjects = timed(Scene.update_mobjects, updater_times)
+    tex_file_writing.compile_tex = counted(tex_file_writing.compile_tex, "tex")
+    manimpango.text2svg = counted(manimpango.text2svg, "text")
+
+    path = os.path.join(ROOT, file_name)
+    with tempfile.TemporaryDirectory() as media_dir:
+        options = {"quality": quality, "media_dir": media_dir, "input_file": path, "write_to_movie": False,
+                   "save_last_frame": False, "disable_caching": True, "progress_bar": "none", "preview": False,
+                   "verbosity": "WARNING"}
+        started = time.perf_counter()
+        with tempconfig(options):
+            getattr(load_scene_module(path, ROOT), scene_name)().render()
+        wall = time.perf_counter() - started
+
+    frames = np.array(frame_times) * 1000 if frame_times else np.zeros(1)
+    return {
+        "wall_s": wall,
+        "frames": len(frame_times),
+        "frame_p50_ms": float(np.percentile(frames, 50)),
+        "frame_p90_ms": float(np.percentile(frames, 90)),
+        "frame_p99_ms": float(np.percentile(frames, 99)),
+        "frame_max_ms": float(frames.max()),
+        "updater_s": sum(updater_times),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "tex_compiles": compiles["tex"],
+        "text_compiles": compiles["text"],
+    }
+
+
+def scene_benchmarks(scenes=SCENES, quality=QUALITY, repeat=1):
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for file_name, scene_name in scenes:
+        runs = []
+        for _ in range(repeat):
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                runs.append(pool.submit(_render_scene, file_name, scene_name, quality).result())
+        # Medians damp the odd slow run when repeating.
+        results[scene_name] = {key: float(np.median([run[key] for run in runs])) for key in runs[0]}
+    return results
+
+
+def voxel_hits(rays=2000, side=256, repeat=5):
+    # The hit / occluded / visible classification of NBVVisualization on a
+    # plant-sized blob in a large grid, with a dense sensor.
+    from voxel_traversal import fan_directions, grid_from_points, traverse
+
+    rng = np.random.default_rng(0)
+    points = rng.normal(0, side / 10, size=(side * side // 8, 2)).round()
+    occupied, grid_origin, cells = grid_from_points(points, 1.0)
+    camera = grid_origin - [side / 2, 0]
+    started = time.perf_counter()
+    for _ in range(repeat):
+        traversal = traverse(camera, fan_directions(0.0, np.pi / 3, rays), occupied, grid_origin, 1.0)
+        is_hit = np.zeros(occupied.shape, dtype=bool)
+        hits = traversal.first_hit[traversal.first_hit[:, 0] >= 0]
+        is_hit[tuple(hits.T)] = True
+        unique = tuple(np.unique(cells, axis=0).T)
+        classes = np.where(is_hit[unique], 0, np.where(traversal.occluded[unique], 1, 2))
+    return {"rays": rays, "cells": int(occupied.sum()), "hit_cells": int((classes == 0).sum()),
+            "classify_ms": (time.perf_counter() - started) / repeat * 1000}
+
+
+def _micro():
+    # Imported lazily: everything but voxel_hits needs manim.
+    import bench_adaptive_plot
+    import bench_batched_mobjects
+    import bench_numeric_tex
+    import bench_tracked_mobjects
+
+    return {
+        "voxel_hits": voxel_hits,
+        "redraw_geometry": lambda: bench_tracked_mobjects.run(frames=120),
+        "numeric_label": lambda: bench_numeric_tex.run(frames=60),
+        "entropy_plot": lambda: bench_adaptive_plot.run(frames=240),
+        "batched_rays": lambda: {r["kind"]: r for r in bench_batched_mobjects.run(sizes=(10_000,), frames=10)},
+    }
+
+
+def micro_benchmarks(names=None):
+    try:
+        benchmarks = _micro()
+    except ImportError as e:
+        print(f"⚠ manim micro-benchmarks unavailable ({e}), running voxel_hits only")
+        benchmarks = {"voxel_hits": voxel_hits}
+    return {name: bench() for name, bench in benchmarks.items() if names is None or name in names}
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    # (metric, baseline, current, ratio, regressed) for metrics in both runs.
+    rows = []
+    for name, value in sorted(current.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        ratio = value / base if base else float("inf") if value else 1.0
+        gated = name.endswith(GATED_SUFFIXES)
+        rows.append((name, base, value, ratio, gated and base > 0 and ratio > 1 + threshold))
+    return rows
+
+
+def run(scenes=SCENES, quality=QUALITY, repeat=1, micro=True, scene=True):
+    results = {}
+    if scene:
+        results["scene"] = scene_benchmarks(scenes, quality, repeat)
+    if micro:
+        results["micro"] = micro_benchmarks()
+    return {
+        "meta": {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "commit": git_revision(ROOT), "quality": quality,
+                 "python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "results": flatten(results),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the repo's scenes headlessly and run the micro-benchmarks.")
+    parser.add_argument("scenes", nargs="*", help="file.py:SceneName (default: the repo's scenes)")
+    parser.add_argument("--quality", default=QUALITY)
+    parser.add_argument("--repeat", type=int, default=1, help="renders per scene, the median is kept")
+    parser.add_argument("--only", choices=("scene", "micro"))
+    parser.add_argument("--save", metavar="JSON", help="write the results as a baseline")
+    parser.add_argument("--compare", metavar="JSON", help="baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="relative slowdown that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    scenes = [tuple(spec.split(":", 1)) for spec in args.scenes] or SCENES
+    report = run(scenes, args.quality, args.repeat, micro=args.only != "scene", scene=args.only != "micro")
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline written to {args.save}")
+
+    if not args.compare:
+        for name, value in sorted(report["results"].items()):
+            print(f"{name:<48} {value:>12.3f}")
+        sys.exit(0)
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    rows = compare(baseline["results"], report["results"], args.threshold)
+    print(f"Against {args.compare} (commit {baseline['meta'].get('commit') or '-'},"
+          f" threshold {args.threshold:.0%})")
+    for name, base, value, ratio, regressed in rows:
+        mark = "❌" if regressed else "  "
+        print(f"{mark} {name:<48} {base:>12.3f} -> {value:>12.3f}  {ratio:6.2f}x")
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+    print("✅ No regressions")
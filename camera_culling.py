@@ -0,0 +1,161 @@
+import os
+
+from manim import ValueTracker, VMobject, logger
+from manim.camera.moving_camera import MovingCamera
+
+# Camera-aware culling for MovingCameraScene. CullingMovingCamera drops every
+# VMobject leaf whose bounding box misses the current camera frame before it
+# is rasterized, for the moving mobjects of each frame and the static
+# background of each play alike. Bezier curves stay inside the box of their
+# control points, and the box is widened by the worst-case stroke (miter
+# joins included), so a culled leaf can't have put a single pixel on screen
+# and the frames are the same as without culling.
+#
+# CullingScene also defers, with ``defer_updaters = True``, the updaters of
+# top-level mobjects that lie more than ``defer_margin`` outside the frame
+# together with every input they read. That needs declared inputs, so only
+# mobjects whose updaters all come from the scene's UpdaterGraph
+# (reactive_updaters, tracked_mobjects) qualify, and none reading the camera
+# frame or a ValueTracker. A deferred updater runs again once the mobject or
+# one of its inputs comes back within reach, a consumer pulls it, or the play
+# ends. Deferral is exact unless an updater draws its mobject far from its
+# inputs; MANIM_CULL_VERIFY=1 runs deferred updaters anyway and counts the
+# mobjects that landed in the frame in ``mismatches``.
+#
+#     class MyScene(CullingScene, MovingCameraScene):
+#         defer_updaters = True
+#
+# MANIM_CULLING=0 turns both off for comparison renders. The per-render report
+# is logged at debug level (``manim -v DEBUG``).
+
+STAT_KEYS = ("captures", "culled_captures", "drawn", "culled", "deferred", "mismatches")
+# Cairo's default miter limit lets a join reach 10 half-widths past the path;
+# stroke widths are in hundredths of a scene unit.
+STROKE_REACH = 10 * 0.5 * 0.01
+
+enabled = os.environ.get("MANIM_CULLING") != "0"
+verify = os.environ.get("MANIM_CULL_VERIFY") == "1"
+
+
+def frame_bounds(camera, margin=0.0):
+    # (x_min, y_min, x_max, y_max) of the camera frame. A rotated frame gets
+    # its enclosing box, which only culls less.
+    points = camera.frame.points
+    low, high = points[:, :2].min(axis=0) - margin, points[:, :2].max(axis=0) + margin
+    return low[0], low[1], high[0], high[1]
+
+
+def _outside(points, bounds, margin=0.0):
+    if not len(points):
+        return False
+    low, high = points[:, :2].min(axis=0) - margin, points[:, :2].max(axis=0) + margin
+    return high[0] < bounds[0] or high[1] < bounds[1] or low[0] > bounds[2] or low[1] > bounds[3]
+
+
+class CullingMovingCamera(MovingCamera):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.culling_stats = dict.fromkeys(STAT_KEYS, 0)
+
+    def get_mobjects_to_display(self, *args, **kwargs):
+        mobjects = super().get_mobjects_to_display(*args, **kwargs)
+        if not enabled:
+            return mobjects
+        bounds = frame_bounds(self)
+        visible = [mobject for mobject in mobjects if not self._culled(mobject, bounds)]
+        stats = self.culling_stats
+        stats["captures"] += 1
+        stats["culled_captures"] += len(visible) < len(mobjects)
+        stats["drawn"] += len(visible)
+        stats["culled"] += len(mobjects) - len(visible)
+        return visible
+
+    def _culled(self, mobject, bounds):
+        # Only plain vector paths; images, point clouds and background-image
+        # fills go through untouched.
+        if not isinstance(mobject, VMobject) or mobject.get_background_image():
+            return False
+        reach = STROKE_REACH * max(mobject.get_stroke_width(), mobject.get_stroke_width(background=True))
+        return _outside(mobject.points, bounds, reach)
+
+
+class CullingScene:
+    # Scene mixin, before MovingCameraScene in the bases: installs the culling
+    # camera and keeps per-play counts in ``self.culling_segments``.
+    defer_updaters = False
+    defer_margin = 1.0
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("camera_class", CullingMovingCamera)
+        super().__init__(*args, **kwargs)
+        self.culling_segments = []
+        self._deferred = []
+
+    @property
+    def culling_stats(self):
+        return getattr(self.camera, "culling_stats", None)
+
+    def update_mobjects(self, dt):
+        stats = self.culling_stats
+        if not (enabled and self.defer_updaters and stats is not None):
+            return super().update_mobjects(dt)
+        bounds = frame_bounds(self.camera, self.defer_margin)
+        graph = self.__dict__.get("_updater_graph")
+        nodes = {id(node.updater): node for node in graph.nodes} if graph is not None else {}
+        deferred = []
+        for mobject in self.mobjects:
+            if mobject is self.camera.frame or not self._deferrable(mobject, nodes, bounds):
+                mobject.update(dt)
+                continue
+            deferred.append(mobject)
+            stats["deferred"] += 1
+            if verify:
+                mobject.update(dt)
+                stats["mismatches"] += not _outside(mobject.get_all_points(), bounds)
+        self._deferred = deferred
+
+    def _deferrable(self, mobject, nodes, bounds):
+        updaters = mobject.get_family_updaters()
+        if not updaters:
+            return False
+        watched = [mobject]
+        for updater in updaters:
+            node = nodes.get(id(updater))
+            if node is None or node.time_based:
+                return False
+            watched.extend(node.inputs)
+        for member in watched:
+            if member is self.camera.frame or isinstance(member, ValueTracker):
+                return False
+        return all(_outside(member.get_all_points(), bounds) for member in watched)
+
+    def play(self, *args, **kwargs):
+        stats = self.culling_stats
+        before = dict(stats) if stats is not None else None
+        super().play(*args, **kwargs)
+        # Catch up, so the scene state at every play boundary is exact.
+        for mobject in self._deferred:
+            mobject.update(0)
+        self._deferred = []
+        if stats is not None:
+            self.culling_segments.append({key: stats[key] - before[key] for key in STAT_KEYS})
+
+    def tear_down(self):
+        super().tear_down()
+        if self.culling_stats is not None:
+            logger.debug(culling_report(self.culling_stats, self.culling_segments))
+
+
+def culling_report(stats, segments):
+    draws = stats["drawn"] + stats["culled"]
+    lines = [f"✂ Culling: {stats['culled']} of {draws} draws skipped"
+             f" ({100 * stats['culled'] / draws if draws else 0:.0f}%),"
+             f" {stats['culled_captures']} of {stats['captures']} frames culled,"
+             f" {stats['deferred']} updates deferred over {len(segments)} segments"]
+    if verify:
+        lines[0] += f", {stats['mismatches']} deferral mismatches"
+    for index, segment in enumerate(segments):
+        if segment["culled_captures"] or segment["deferred"]:
+            lines.append(f"   segment {index:>3}: {segment['culled_captures']:>4}/{segment['captures']:<4} frames"
+                         f" culled {segment['culled']:>6} draws skipped {segment['deferred']:>5} updates deferred")
+    return "\n".join(lines)
@@ -1,13 +1,269 @@
 #!/usr/bin/env python3
 import os
-import sys
 import time
-import subprocess
+import argparse
+import threading
+import itertools
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import datetime
+from render_worker import QUALITY, WarmRenderWorker, rendered_movie
+from scene_index import SceneIndex
+from import_graph import ImportGraph
+from watch_filters import HAS_INOTIFY, IgnoreRules, FilteredWatchHandler, InotifyWatcher, PollingWatcher
+from render_telemetry import HISTORY_FILE, HistoryLog, git_revision, job_record, format_summary
+from render_cache import CACHE_DIR, DEFAULT_MAX_MB
+from asset_cache import ASSET_DIR, DEFAULT_MAX_MB as ASSET_MAX_MB, AssetPrewarmer
+from render_farm import DEFAULT_TIMEOUT as FARM_TIMEOUT, DEFAULT_RETRIES as FARM_RETRIES, TOKEN_ENV as FARM_TOKEN_ENV
+from render_farm import RenderFarm, parse_address
+from preview_server import DEFAULT_PORT as PREVIEW_PORT, DEFAULT_FPS as PREVIEW_FPS, PreviewServer
+
+DEBOUNCE_SECONDS = 0.5
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+QUALITIES = ("low_quality", "medium_quality", "high_quality", "production_quality", "fourk_quality")
+
+
+def _timestamp():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _label(job):
+    return f"{os.path.basename(job['file'])}:{','.join(job['scenes'])}"
+
+
+_print_lock = threading.Lock()
+
+
+def print_job_output(job, result, summary=""):
+    # Jobs finish concurrently; each one's output is printed as one block.
+    kind = "📼 Encoded" if job.get("encode") else "🎬"
+    with _print_lock:
+        print(f"[{_timestamp()}] {kind} {_label(job)} ({result['status']})")
+        output = result.get("output", "").rstrip()
+        if output:
+            print(output)
+        if result["status"] == "error":
+            print(f"Error while rendering the file with manim:\n{result['error']}")
+        if summary:
+            print(summary)
+        print("-" * 60)
+
+
+class RenderPool:
+    def __init__(self, workers=DEFAULT_WORKERS):
+        self.workers = [WarmRenderWorker() for _ in range(max(1, workers))]
+        self._condition = threading.Condition()
+        self._queue = []
+        self._running = {}
+        self._threads = []
+        self._stopped = False
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+            thread = threading.Thread(target=self._run, args=(worker,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, job, callback):
+        with self._condition:
+            self._queue.append((job, callback))
+            self._condition.notify()
+
+    def cancel(self, file_path):
+        # Drops queued jobs rendering or triggered by the file and restarts
+        # workers busy with them.
+        def affected(job):
+            return file_path in (job["file"], job["trigger"])
+
+        with self._condition:
+            self._queue = [item for item in self._queue if not affected(item[0])]
+            busy = [worker for worker, job in self._running.items() if affected(job)]
+        for worker in busy:
+            worker.terminate()
+            worker.start()
+        return bool(busy)
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._condition.notify_all()
+        for worker in self.workers:
+            worker.stop()
+
+    def _run(self, worker):
+        while True:
+            with self._condition:
+                while not self._queue and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                job, callback = self._queue.pop(0)
+                self._running[worker] = job
+            result = worker.render(job)
+            with self._condition:
+                self._running.pop(worker, None)
+            callback(job, result)
+
+
+class RenderScheduler:
+    def __init__(self, root, rules=None, workers=DEFAULT_WORKERS, debounce=DEBOUNCE_SECONDS, media_dir="media",
+                 cache_mb=DEFAULT_MAX_MB, prewarm=True, profile=False, preview=None, preview_fps=PREVIEW_FPS,
+                 encode_quality=None, farm=None, farm_timeout=FARM_TIMEOUT, farm_retries=FARM_RETRIES):
+        self.root = os.path.abspath(root)
+        self.debounce = debounce
+        self.media_dir = media_dir
+        # Segments are shared by every job through one store under media_dir.
+        self.cache = {"directory": os.path.join(self.root, media_dir, CACHE_DIR),
+                      "max_bytes": int(cache_mb * 1024 * 1024)} if cache_mb else None
+        # Text and Tex assets likewise, warmed from each saved file's literals.
+        self.assets = {"directory": os.path.join(self.root, media_dir, ASSET_DIR),
+                       "max_bytes": ASSET_MAX_MB * 1024 * 1024}
+        self.prewarmer = AssetPrewarmer(self.assets["directory"], self.assets["max_bytes"],
+                                        QUALITY) if prewarm else None
+        # Per-play mobject profiles (render_profiler) when asked for.
+        self.profile_dir = os.path.join(self.root, media_dir, "profiles") if profile else None
+        # With a PreviewServer, jobs stream frames to it instead of writing a
+        # movie and opening a player; encode_quality queues a movie render
+        # after each successful preview.
+        self.preview = preview
+        self.stream = {"url": preview.url, "fps": preview_fps} if preview else None
+        self.encode_quality = encode_quality
+        self.index = SceneIndex(self.root)
+        self.graph = ImportGraph(self.root, rules)
+        self.history = HistoryLog(os.path.join(self.root, media_dir, HISTORY_FILE))
+        # With a farm address, jobs go to remote worker daemons instead.
+        self.pool = (RenderFarm(farm, self.graph, farm_timeout, farm_retries) if farm
+                     else RenderPool(workers))
+        self._lock = threading.Lock()
+        self._timers = {}
+        self._generations = {}
+        self._event_times = {}
+        self._job_ids = itertools.count(1)
+
+    def start(self):
+        # Spawn the workers up front so the first save already hits a warm process.
+        self.pool.start()
+        self.graph.scan()
+
+    def schedule(self, file_path):
+        # Every event bumps the file's generation: pending timers are restarted
+        # and in-flight renders of older content are killed.
+        with self._lock:
+            generation = self._generations.get(file_path, 0) + 1
+            self._generations[file_path] = generation
+            timer = self._timers.pop(file_path, None)
+            if timer is not None:
+                timer.cancel()
+            else:
+                # Latency is measured from the first event of a coalesced burst.
+                self._event_times[file_path] = time.time()
+            timer = threading.Timer(self.debounce, self._dispatch, args=(file_path, generation))
+            timer.daemon = True
+            self._timers[file_path] = timer
+            timer.start()
+        if self.prewarmer is not None:
+            self.prewarmer.prewarm(file_path)
+        if self.pool.cancel(file_path):
+            print(f"[{_timestamp()}] ⏹ Cancelling stale render: {os.path.basename(file_path)}")
+
+    def stop(self):
+        with self._lock:
+            for timer in self._timers.values():
+                timer.cancel()
+            self._timers.clear()
+        if self.prewarmer is not None:
+            self.prewarmer.stop()
+        self.pool.stop()
+
+    def _media_dir(self, file_path, scene_name):
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        return os.path.join(self.root, self.media_dir, "jobs", f"{stem}.{scene_name}")
+
+    def _dispatch(self, file_path, generation):
+        with self._lock:
+            if self._generations.get(file_path) != generation:
+                return
+            self._timers.pop(file_path, None)
+            event_time = self._event_times.pop(file_path, time.time())
+
+        # A saved file re-renders every scene file that imports it, directly or
+        # transitively. Its own scenes go through the hash index; dependents are
+        # forced because their source didn't change, only what they import.
+        self.graph.update(file_path)
+        submitted = 0
+        for target in self.graph.scene_dependents(file_path):
+            try:
+                changed = self.index.changed_scenes(target, force=target != file_path)
+            except SyntaxError as e:
+                print(f"[{_timestamp()}] ⚠ Syntax error in {os.path.basename(target)}: {e}")
+                continue
+            # Each scene is an independent job with its own media directory, so
+            # concurrent renders never share partial movie files or caches.
+            for scene_name in sorted(changed):
+                job = {
+                    "id": next(self._job_ids),
+                    "file": target,
+                    "trigger": file_path,
+                    "root": self.root,
+                    "event_time": event_time,
+                    "scenes": [scene_name],
+                    "capture_output": True,
+                    "config": {"media_dir": self._media_dir(target, scene_name), "progress_bar": "none"},
+                    "cache": self.cache,
+                    "assets": self.assets,
+                    "profile": self.profile_dir,
+                }
+                if self.preview is not None:
+                    job.update({"preview": False, "stream": self.stream})
+                    job["config"]["write_to_movie"] = False
+                    self.preview.notify("job", {"label": _label(job)})
+                self._submit(job, generation, changed)
+                submitted += 1
+        if not submitted:
+            print(f"[{_timestamp()}] ⏭ No scene changes from {os.path.basename(file_path)}, skipping render")
+            print("-" * 60)
+
+    def _submit(self, job, generation, changed):
+        self.pool.submit(job, lambda job, result: self._finished(job, result, generation, changed))
+
+    def _encode(self, job, generation, changed):
+        # The full-quality movie of a previewed scene, rendered in the background.
+        config = {key: value for key, value in job["config"].items() if key != "write_to_movie"}
+        encode = dict(job, id=next(self._job_ids), quality=self.encode_quality, config=config, stream=None,
+                      encode=True)
+        self._submit(encode, generation, changed)
+
+    def _finished(self, job, result, generation, changed):
+        with self._lock:
+            cancelled = self._generations.get(job["trigger"]) != generation
+        record = job_record(job, result, result.get("worker"), git_revision(self.root))
+        self.history.append(record)
+        if cancelled or result["status"] == "cancelled":
+            return
+        self.index.mark_rendered(job["file"], {name: changed[name] for name in result["scenes"]})
+        print_job_output(job, result, format_summary(record))
+        if self.preview is None:
+            return
+        if job.get("encode"):
+            movie = rendered_movie(job["config"]["media_dir"], job["scenes"])
+            url = self.preview.media_url(movie) if movie and result["status"] == "ok" else None
+            if url:
+                self.preview.notify("encoded", {"label": _label(job), "url": url})
+            return
+        self.preview.notify("done", {"label": _label(job), "status": result["status"], "error": result.get("error"),
+                                     "seconds": time.time() - job["event_time"]})
+        if self.encode_quality and result["status"] == "ok":
+            self._encode(job, generation, changed)
+
+
 
 class PythonFileHandler(FileSystemEventHandler):
+    def __init__(self, scheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
     def on_modified(self, event):
         self._handle_event(event, "🔄 File modified")
 
@@ -18,26 +274,55 @@ class PythonFileHandler(FileSystemEventHandler):
         if event.is_directory or not event.src_path.endswith('.py'):
             return
         filename = os.path.basename(event.src_path)
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] {message}: {filename}")
+        print(f"[{_timestamp()}] {message}: {filename}")
         self._take_action(event.src_path)
 
     def _take_action(self, file_path):
+        self.scheduler.schedule(os.path.abspath(file_path))
+
+def _start_observer(handler, rules, poll):
+    if not poll:
+        observer = None
         try:
-            subprocess.run(['manim', file_path, '-pql'], check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error while rendering the file with manim: {e}")
-        except Exception as e:
-            print(f"Unexpected error occurred: {e}")
-        print("-" * 60)
+            if HAS_INOTIFY:
+                observer = InotifyWatcher(handler, rules)
+            else:
+                observer = Observer()
+                FilteredWatchHandler(observer, handler, rules).watch_tree(rules.root)
+            observer.start()
+            return observer
+        except OSError as e:
+            print(f"⚠ Native file watching unavailable ({e}), falling back to polling")
+            if observer is not None:
+                observer.stop()
+    observer = PollingWatcher(handler, rules)
+    observer.start()
+    return observer
 
-def start_watcher(path="."):
+def start_watcher(path=".", workers=DEFAULT_WORKERS, debounce=DEBOUNCE_SECONDS,
+                  ignore=(), media_dir="media", poll=False, cache_mb=DEFAULT_MAX_MB, prewarm=True, profile=False,
+                  preview_port=None, preview_fps=PREVIEW_FPS, encode_quality=None, farm=None,
+                  farm_timeout=FARM_TIMEOUT, farm_retries=FARM_RETRIES):
     abs_path = os.path.abspath(path)
-    event_handler = PythonFileHandler()
-    observer = Observer()
-    observer.schedule(event_handler, abs_path, recursive=True)
-    observer.start()
-    print(f"👀 Watching for Python file changes in: {abs_path}")
+    rules = IgnoreRules(abs_path, ignore, media_dir)
+    preview = None
+    if preview_port is not None:
+        preview = PreviewServer(port=preview_port, media_root=os.path.join(abs_path, media_dir)).start()
+        print(f"📺 Live preview at {preview.url}")
+    scheduler = RenderScheduler(abs_path, rules, workers=workers, debounce=debounce, media_dir=media_dir,
+                                cache_mb=cache_mb, prewarm=prewarm, profile=profile, preview=preview,
+                                preview_fps=preview_fps, encode_quality=encode_quality, farm=farm,
+                                farm_timeout=farm_timeout, farm_retries=farm_retries)
+    scheduler.start()
+    event_handler = PythonFileHandler(scheduler)
+    observer = _start_observer(event_handler, rules, poll)
+    if farm:
+        host, port = scheduler.pool.address[:2]
+        print(f"🛰 Render farm listening on {host}:{port}, start workers with"
+              f" '{FARM_TOKEN_ENV}={scheduler.pool.token} python render_farm.py worker <this host>:{port}'")
+        print(f"👀 Watching for Python file changes in: {abs_path}")
+    else:
+        print(f"👀 Watching for Python file changes in: {abs_path} ({len(scheduler.pool.workers)} render workers)")
     print("Press Ctrl+C to stop watching")
     print("-" * 60)
 
@@ -46,9 +331,50 @@ def start_watcher(path="."):
             time.sleep(1)
     except KeyboardInterrupt:
         observer.stop()
+        scheduler.stop()
+        if preview is not None:
+            preview.stop()
         print("\nFile watching stopped")
     observer.join()
 
 if __name__ == "__main__":
-    path = sys.argv[1] if len(sys.argv) > 1 else "."
-    start_watcher(path)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Re-render manim scenes when Python files change.")
+    parser.add_argument("path", nargs="?", default=".")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="number of warm render workers running scenes in parallel")
+    parser.add_argument("--debounce", type=float, default=DEBOUNCE_SECONDS,
+                        help="seconds to wait for further events before rendering")
+    parser.add_argument("--ignore", action="append", default=[], metavar="GLOB",
+                        help="extra gitignore-style pattern to exclude from watching (repeatable)")
+    parser.add_argument("--media-dir", default="media",
+                        help="manim media directory, never watched")
+    parser.add_argument("--poll", action="store_true",
+                        help="poll an mtime+size index instead of using native file events")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_MAX_MB, metavar="MB",
+                        help="size cap of the shared segment cache, 0 disables it")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="don't compile a saved file's Text/Tex literals ahead of its render")
+    parser.add_argument("--profile", action="store_true",
+                        help="write per-play updater and rasterization profiles under MEDIA_DIR/profiles")
+    parser.add_argument("--preview", action="store_true",
+                        help="stream frames to one browser tab instead of opening a player per render")
+    parser.add_argument("--preview-port", type=int, default=PREVIEW_PORT)
+    parser.add_argument("--preview-fps", type=float, default=PREVIEW_FPS,
+                        help="most frames per second streamed to the preview, the rest are dropped")
+    parser.add_argument("--encode", choices=QUALITIES, metavar="QUALITY",
+                        help="with --preview, also render each previewed scene to a movie at this quality")
+    parser.add_argument("--farm", metavar="[HOST:]PORT",
+                        help="send jobs to render_farm.py worker daemons that connect to this address"
+                             " (localhost unless a host is given)")
+    parser.add_argument("--farm-timeout", type=float, default=FARM_TIMEOUT, metavar="SECONDS",
+                        help="seconds before a farm task is given to another worker")
+    parser.add_argument("--farm-retries", type=int, default=FARM_RETRIES)
+    args = parser.parse_args()
+    if args.farm and args.preview:
+        parser.error("--preview streams from local workers only, it can't be combined with --farm")
+    start_watcher(args.path, workers=args.workers, debounce=args.debounce,
+                  ignore=args.ignore, media_dir=args.media_dir, poll=args.poll, cache_mb=args.cache_size,
+                  prewarm=not args.no_prewarm, profile=args.profile,
+                  preview_port=args.preview_port if args.preview else None, preview_fps=args.preview_fps,
+                  encode_quality=args.encode, farm=parse_address(args.farm) if args.farm else None,
+                  farm_timeout=args.farm_timeout, farm_retries=args.farm_retries)
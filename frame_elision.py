@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+import os
+import hashlib
+import functools
+
+import numpy as np
+
+import render_telemetry
+
+# Skips rasterizing frames whose visible state is identical to the previous
+# frame. Before CairoRenderer.render draws anything, the moving mobjects (points,
+# style, z-order) and the camera frame are hashed; a repeat of the last hash
+# turns into a hold on the last written frame instead of a new rasterization.
+# With MANIM_ELISION_VERIFY=1 every elided frame is still rendered and compared,
+# and mismatches are counted in ``stats["mismatches"]``.
+
+STYLE_ATTRIBUTES = ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width",
+                    "background_stroke_width", "sheen_factor", "sheen_direction", "z_index", "rgbas")
+
+enabled = True
+stats = {"frames": 0, "elided": 0, "mismatches": 0}
+
+
+def state_hash(mobjects, camera):
+    digest = hashlib.blake2b(digest_size=16)
+    frame = getattr(camera, "frame", None)
+    if frame is not None:
+        mobjects = [frame, *mobjects]
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            digest.update(type(member).__name__.encode())
+            digest.update(np.ascontiguousarray(member.points).data)
+            for name in STYLE_ATTRIBUTES:
+                value = member.__dict__.get(name)
+                if isinstance(value, np.ndarray):
+                    digest.update(np.ascontiguousarray(value).data)
+                elif value is not None:
+                    digest.update(repr(value).encode())
+            pixels = member.__dict__.get("pixel_array")
+            if pixels is not None:
+                # Images are assumed to change by replacing their array.
+                digest.update(repr((id(pixels), pixels.shape)).encode())
+            digest.update(b"|")
+    return digest.digest()
+
+
+class _Hold:
+    # Last written frame plus the number of repeats not yet handed to the writer.
+    def __init__(self):
+        self.key = None
+        self.frame = None
+        self.pending = 0
+
+    def flush(self, renderer):
+        if self.pending:
+            pending, self.pending = self.pending, 0
+            renderer.add_frame(self.frame, num_frames=pending)
+
+    def reset(self, renderer):
+        self.flush(renderer)
+        self.key = self.frame = None
+
+
+def install():
+    from manim.renderer.cairo_renderer import CairoRenderer
+    # Marked on the class rather than here, so a second copy of this module
+    # (a scene importing it after a reload) can't stack another wrapper.
+    if CairoRenderer.__dict__.get("_frame_elision"):
+        return
+    from manim.scene.scene import Scene
+    from manim.utils.iterables import list_update
+
+    original_play = CairoRenderer.play
+    original_play_internal = Scene.play_internal
+    original_render = CairoRenderer.render
+    verify = os.environ.get("MANIM_ELISION_VERIFY") == "1"
+
+    def hold_for(renderer):
+        hold = renderer.__dict__.get("_frame_hold")
+        if hold is None:
+            hold = renderer._frame_hold = _Hold()
+        return hold
+
+    @functools.wraps(original_play)
+    def play(self, scene, *args, **kwargs):
+        # The static background is rebuilt for every play, so holds never
+        # cross a play boundary.
+        hold_for(self).reset(self)
+        try:
+            return original_play(self, scene, *args, **kwargs)
+        finally:
+            hold_for(self).reset(self)
+
+    @functools.wraps(original_play_internal)
+    def play_internal(self, *args, **kwargs):
+        # CairoRenderer.play closes the partial movie right after this returns,
+        # so the held repeats have to reach the writer here.
+        try:
+            return original_play_internal(self, *args, **kwargs)
+        finally:
+            if isinstance(self.renderer, CairoRenderer):
+                hold_for(self.renderer).flush(self.renderer)
+
+    @functools.wraps(original_render)
+    def render(self, scene, time, moving_mobjects=None):
+        if not enabled or self.skip_animations:
+            return original_render(self, scene, time, moving_mobjects)
+        hold = hold_for(self)
+        stats["frames"] += 1
+        key = state_hash(moving_mobjects or list_update(scene.mobjects, scene.foreground_mobjects), self.camera)
+        if key == hold.key:
+            stats["elided"] += 1
+            metrics = render_telemetry.active_metrics()
+            if metrics is not None:
+                metrics.frames_elided += 1
+            if verify:
+                self.update_frame(scene, moving_mobjects)
+                if not np.array_equal(self.camera.pixel_array, hold.frame):
+                    stats["mismatches"] += 1
+            hold.pending += 1
+            return
+        hold.flush(self)
+        self.update_frame(scene, moving_mobjects)
+        hold.key, hold.frame = key, self.get_frame()
+        self.add_frame(hold.frame)
+
+    CairoRenderer.play = play
+    CairoRenderer.render = render
+    Scene.play_internal = play_internal
+    CairoRenderer._frame_elision = True
+
+
+class FrameElisionScene:
+    # Scene mixin for renders started outside the watcher's workers (which
+    # install elision themselves), e.g. straight from the manim CLI.
+    def render(self, *args, **kwargs):
+        install()
+        return super().render(*args, **kwargs)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+import os
+import ast
+import threading
+from scene_index import find_scene_classes
+from watch_filters import IgnoreRules
+
+
+def _imported_names(tree):
+    # Yields (module name, relative level) for every import, including the
+    # submodule form of ``from pkg import mod``.
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name, 0
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            yield module, node.level
+            for alias in node.names:
+                yield f"{module}.{alias.name}" if module else alias.name, node.level
+
+
+class ImportGraph:
+    def __init__(self, root, rules=None):
+        self.root = os.path.abspath(root)
+        self.rules = rules or IgnoreRules(self.root)
+        self._lock = threading.Lock()
+        self._imports = {}
+        self._has_scenes = {}
+
+    def scan(self):
+        for dirpath, _, filenames in self.rules.walk():
+            for filename in filenames:
+                if filename.endswith(".py"):
+                    self.update(os.path.join(dirpath, filename))
+
+    def _resolve(self, name, level, from_dir):
+        if not name:
+            return None
+        if level:
+            bases = [from_dir]
+            for _ in range(level - 1):
+                bases = [os.path.dirname(bases[0])]
+        else:
+            # The render worker puts the scene's directory on sys.path, so bare
+            # imports resolve next to the importing file first, then from the root.
+            bases = [from_dir, self.root]
+        relative = name.replace(".", os.sep)
+        for base in bases:
+            for candidate in (relative + ".py", os.path.join(relative, "__init__.py")):
+                path = os.path.join(base, candidate)
+                if os.path.isfile(path):
+                    return os.path.abspath(path)
+        return None
+
+    def update(self, file_path):
+        file_path = os.path.abspath(file_path)
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except FileNotFoundError:
+            self.remove(file_path)
+            return
+        except (OSError, SyntaxError, ValueError):
+            # Keep the last known edges until the file parses again.
+            return
+        from_dir = os.path.dirname(file_path)
+        imports = set()
+        for name, level in _imported_names(tree):
+            resolved = self._resolve(name, level, from_dir)
+            if resolved and resolved != file_path:
+                imports.add(resolved)
+        with self._lock:
+            self._imports[file_path] = imports
+            self._has_scenes[file_path] = bool(find_scene_classes(tree))
+
+    def remove(self, file_path):
+        with self._lock:
+            self._imports.pop(file_path, None)
+            self._has_scenes.pop(file_path, None)
+
+    def dependents(self, file_path):
+        # The file itself plus every file that imports it, directly or transitively.
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            reverse = {}
+            for importer, imported in self._imports.items():
+                for target in imported:
+                    reverse.setdefault(target, set()).add(importer)
+            seen = {file_path}
+            pending = [file_path]
+            while pending:
+                for importer in reverse.get(pending.pop(), ()):
+                    if importer not in seen:
+                        seen.add(importer)
+                        pending.append(importer)
+        return seen
+
+    def dependencies(self, file_path):
+        # The file itself plus every file under the root it imports, directly
+        # or transitively.
+        file_path = os.path.abspath(file_path)
+        with self._lock:
+            seen = {file_path}
+            pending = [file_path]
+            while pending:
+                for imported in self._imports.get(pending.pop(), ()):
+                    if imported not in seen:
+                        seen.add(imported)
+                        pending.append(imported)
+        return seen
+
+    def scene_dependents(self, file_path):
+        dependents = self.dependents(file_path)
+        with self._lock:
+            return sorted(path for path in dependents if self._has_scenes.get(path))
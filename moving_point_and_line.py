@@ -1,6 +1,7 @@
 from manim import *
+from reactive_updaters import ReactiveScene
 
-class MovingPointAndLine(Scene):
+class MovingPointAndLine(ReactiveScene, Scene):
     def construct(self):
         start_point = Dot(LEFT * 2, color=BLUE)
         moving_point = Dot(RIGHT * 2, color=RED)
@@ -11,7 +12,7 @@ class MovingPointAndLine(Scene):
         def update_line(line):
             line.put_start_and_end_on(start_point.get_center(), moving_point.get_center())
 
-        line.add_updater(update_line)
+        self.updater_graph.add_updater(line, update_line, inputs=[start_point, moving_point])
 
         self.play(moving_point.animate.move_to(UP * 2 + RIGHT * 2), run_time=3)
         self.play(moving_point.animate.move_to(DOWN * 2 + LEFT * 3), run_time=3)
@@ -0,0 +1,158 @@
+from collections import OrderedDict
+
+import numpy as np
+from manim import ORIGIN, MathTex, VMobject
+
+# The sign comes first so it is typeset as a unary minus, the way it follows
+# "=", "(" or "," in a real value; "." sits between glyphs so every character
+# has a measurable advance.
+NUMBER_GLYPHS = "-.0123456789"
+LAYOUT_CACHE_SIZE = 512
+
+_templates = {}
+
+
+def _leaves(mobject):
+    return [m for m in mobject.get_family() if len(m.points)]
+
+
+class _TemplateLayout:
+    # Compiles the template once with every placeholder replaced by
+    # NUMBER_GLYPHS, then keeps the static parts and one path per glyph in
+    # template coordinates. Layouts for concrete values are assembled from those
+    # paths and memoized in an LRU.
+    def __init__(self, template, tex_kwargs):
+        statics = template.split("{}")
+        parts = []
+        for k, static in enumerate(statics):
+            if static.strip():
+                parts.append(static)
+            if k < len(statics) - 1:
+                parts.append(NUMBER_GLYPHS)
+        tex = MathTex(*parts, **tex_kwargs)
+        groups = iter(tex.submobjects)
+
+        self.style_source = _leaves(tex)[0]
+        self.statics = []
+        self.occurrences = []
+        self.glyphs = {}
+        for k, static in enumerate(statics):
+            self.statics.append([leaf.points.copy() for leaf in _leaves(next(groups))] if static.strip() else [])
+            if k == len(statics) - 1:
+                break
+            glyphs = sorted(_leaves(next(groups)), key=lambda leaf: leaf.points[:, 0].min())
+            if len(glyphs) != len(NUMBER_GLYPHS):
+                raise ValueError(f"expected {len(NUMBER_GLYPHS)} glyphs for {NUMBER_GLYPHS!r}, got {len(glyphs)}")
+            lefts = [glyph.points[:, 0].min() for glyph in glyphs]
+            advances = np.diff(lefts).tolist() + [lefts[-1] - lefts[-2]]
+            if not self.glyphs:
+                for char, glyph, left, advance in zip(NUMBER_GLYPHS, glyphs, lefts, advances):
+                    self.glyphs[char] = (glyph.points.copy(), left, advance)
+            self.occurrences.append((lefts[0], lefts[-1] + advances[-1]))
+        self._cache = OrderedDict()
+
+    def points_for(self, strings):
+        cached = self._cache.get(strings)
+        if cached is not None:
+            self._cache.move_to_end(strings)
+            return cached
+        arrays = []
+        shift = 0.0
+        for k, static in enumerate(self.statics):
+            arrays.extend(points + (shift, 0, 0) for points in static)
+            if k == len(self.occurrences):
+                break
+            start, end = self.occurrences[k]
+            pen = start + shift
+            for char in strings[k]:
+                points, left, advance = self.glyphs[char]
+                arrays.append(points + (pen - left, 0, 0))
+                pen += advance
+            shift = pen - end
+        self._cache[strings] = arrays
+        if len(self._cache) > LAYOUT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return arrays
+
+
+def _affine_step(func, about_point):
+    # (matrix, offset) with p @ matrix + offset == func(p - about_point) + about_point
+    # for row vectors, or None when func isn't affine. func may work in place,
+    # so it only ever gets fresh arrays.
+    origin = func(np.zeros((1, 3)))[0]
+    matrix = func(np.eye(3)) - origin
+    probe = np.array([[1.5, -2.0, 0.5], [-3.0, 0.25, 2.0]])
+    if not np.allclose(func(probe.copy()), probe @ matrix + origin):
+        return None
+    return matrix, about_point - about_point @ matrix + origin
+
+
+class NumericMathTex(VMobject):
+    # MathTex with ``{}`` placeholders for numbers that change every frame, e.g.
+    # NumericMathTex(r"\theta = {}°", 42.0). Only the first instance of a
+    # template runs LaTeX; ``set_value`` rewrites the existing glyph paths in
+    # place, keeping the current transform, so it is cheap in an updater.
+    #
+    # The transform from layout coordinates to the scene is recorded as the
+    # label is shifted, scaled, rotated or mapped, rather than read back from
+    # the bounding box, which is wrong for a rotated label or one part-way
+    # through Write/Create. Affine steps are folded into one matrix and offset.
+    # Points changed behind the label's back (a parent group's transform,
+    # become(), a Transform animation) aren't seen.
+    def __init__(self, template, *values, num_decimal_places=2, **tex_kwargs):
+        self._steps = [(np.eye(3), np.zeros(3))]
+        super().__init__()
+        key = (template, repr(sorted(tex_kwargs.items())))
+        if key not in _templates:
+            _templates[key] = _TemplateLayout(template, tex_kwargs)
+        self.layout = _templates[key]
+        self.num_decimal_places = num_decimal_places
+        self.values = values
+        arrays = self.layout.points_for(self._format(values))
+        for points in arrays:
+            self.add(VMobject().match_style(self.layout.style_source).set_points(points))
+
+    def _record(self, step):
+        last = self._steps[-1]
+        if isinstance(step, tuple) and isinstance(last, tuple):
+            self._steps[-1] = (last[0] @ step[0], last[1] @ step[0] + step[1])
+        else:
+            self._steps.append(step)
+
+    def _to_scene(self, points):
+        for step in self._steps:
+            points = points @ step[0] + step[1] if isinstance(step, tuple) else step(points)
+        return points
+
+    def shift(self, *vectors):
+        self._record((np.eye(3), np.sum(np.array(vectors, dtype=float), axis=0)))
+        return super().shift(*vectors)
+
+    def apply_points_function_about_point(self, func, about_point=None, about_edge=None):
+        if about_point is None:
+            about_point = self.get_critical_point(ORIGIN if about_edge is None else about_edge)
+        about_point = np.array(about_point, dtype=float)
+        step = _affine_step(func, about_point)
+        self._record(step if step is not None else lambda points: func(points - about_point) + about_point)
+        return super().apply_points_function_about_point(func, about_point)
+
+    def _format(self, values):
+        if len(values) != len(self.layout.occurrences):
+            raise ValueError(f"expected {len(self.layout.occurrences)} values, got {len(values)}")
+        return tuple(f"{value:.{self.num_decimal_places}f}" for value in values)
+
+    def set_value(self, *values):
+        if values == self.values:
+            return self
+        arrays = self.layout.points_for(self._format(values))
+        while len(self.submobjects) < len(arrays):
+            self.add(VMobject().match_style(self.submobjects[0]))
+        for leaf, points in zip(self.submobjects, arrays):
+            leaf.points = self._to_scene(points)
+        for leaf in self.submobjects[len(arrays):]:
+            leaf.clear_points()
+        self.values = values
+        return self
+
+    def get_value(self):
+        return self.values[0] if len(self.values) == 1 else self.values
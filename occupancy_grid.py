@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+import os
+import time
+import argparse
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from voxel_traversal import traverse
+
+LOG_ODDS_HIT = 0.85
+LOG_ODDS_MISS = -0.4
+LOG_ODDS_LIMIT = 3.5
+OCCUPIED_PROBABILITY = 0.7
+
+
+def entropy(p):
+    # Vectorized I_v(x) = -p log2 p - (1 - p) log2 (1 - p), 0 at p = 0 and 1.
+    p = np.clip(np.asarray(p, dtype=np.float64), 1e-12, 1 - 1e-12)
+    return -p * np.log2(p) - (1 - p) * np.log2(1 - p)
+
+
+def probability(log_odds):
+    return 1.0 / (1.0 + np.exp(-np.asarray(log_odds, dtype=np.float64)))
+
+
+class OccupancyGrid:
+    # Log-odds occupancy over a regular grid. Dense by default; with
+    # ``chunk_size`` only touched chunks are allocated and everything else reads
+    # as the prior (log-odds 0, p = 0.5, maximum entropy).
+    def __init__(self, shape, origin, cell_size, chunk_size=None):
+        self.shape = tuple(shape)
+        self.origin = np.asarray(origin, dtype=np.float64)
+        self.cell_size = float(cell_size)
+        self.chunk_size = chunk_size
+        if chunk_size is None:
+            self.log_odds = np.zeros(self.shape, dtype=np.float32)
+        else:
+            self.chunks = {}
+
+    @property
+    def is_sparse(self):
+        return self.chunk_size is not None
+
+    def _chunk(self, key):
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            chunk = self.chunks[key] = np.zeros((self.chunk_size,) * len(self.shape), dtype=np.float32)
+        return chunk
+
+    def add_log_odds(self, cells, delta):
+        # ``cells`` is (n, ndim); repeated cells accumulate.
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, len(self.shape))
+        delta = np.broadcast_to(np.asarray(delta, dtype=np.float32), len(cells))
+        if not self.is_sparse:
+            np.add.at(self.log_odds, tuple(cells.T), delta)
+            np.clip(self.log_odds, -LOG_ODDS_LIMIT, LOG_ODDS_LIMIT, out=self.log_odds)
+            return
+        keys, inverse = np.unique(cells // self.chunk_size, axis=0, return_inverse=True)
+        local = cells % self.chunk_size
+        for k, key in enumerate(keys):
+            chunk = self._chunk(tuple(key))
+            members = inverse.ravel() == k
+            np.add.at(chunk, tuple(local[members].T), delta[members])
+            np.clip(chunk, -LOG_ODDS_LIMIT, LOG_ODDS_LIMIT, out=chunk)
+
+    def integrate(self, hit_cells, free_cells):
+        self.add_log_odds(free_cells, LOG_ODDS_MISS)
+        self.add_log_odds(hit_cells, LOG_ODDS_HIT)
+
+    def dense_log_odds(self):
+        if not self.is_sparse:
+            return self.log_odds
+        dense = np.zeros(self.shape, dtype=np.float32)
+        for key, chunk in self.chunks.items():
+            start = np.array(key) * self.chunk_size
+            stop = np.minimum(start + self.chunk_size, self.shape)
+            dense[tuple(slice(a, b) for a, b in zip(start, stop))] = chunk[tuple(slice(0, b - a) for a, b in zip(start, stop))]
+        return dense
+
+    def probabilities(self):
+        return probability(self.dense_log_odds())
+
+    def entropy(self):
+        return entropy(self.probabilities())
+
+    def occupied(self, threshold=OCCUPIED_PROBABILITY):
+        return self.dense_log_odds() > np.log(threshold / (1 - threshold))
+
+    def cell_centers(self, cells):
+        return self.origin + (np.asarray(cells) + 0.5) * self.cell_size
+
+
+def view_directions(yaw, pitch, fov, resolution):
+    # Pinhole camera rays (resolution x resolution) looking along yaw/pitch; in
+    # 2D (pitch None) a fan of ``resolution`` rays around yaw.
+    if pitch is None:
+        angles = yaw + np.linspace(-fov / 2, fov / 2, resolution)
+        return np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    half = np.tan(fov / 2)
+    u, v = np.meshgrid(np.linspace(-half, half, resolution), np.linspace(-half, half, resolution))
+    rays = np.stack([np.ones(u.size), u.ravel(), v.ravel()], axis=1)
+    cy, sy, cp, sp = np.cos(yaw), np.sin(yaw), np.cos(pitch), np.sin(pitch)
+    rotation = np.array([[cy * cp, -sy, -cy * sp], [sy * cp, cy, -sy * sp], [sp, 0, cp]])
+    return rays @ rotation.T
+
+
+class RankedViews(NamedTuple):
+    index: np.ndarray  # candidate pose indices, best first
+    gain: np.ndarray  # information gain of each ranked pose, in bits
+
+
+_shared = {}
+
+
+def _init_evaluator(occupied, weights, origin, cell_size):
+    _shared.update(occupied=occupied, weights=weights, origin=origin, cell_size=cell_size)
+
+
+def _score_chunk(poses, fov, resolution, max_distance):
+    # One vectorized traversal for every ray of every pose in the chunk.
+    ndim = _shared["occupied"].ndim
+    directions = np.concatenate([
+        view_directions(pose[ndim], pose[ndim + 1] if ndim == 3 else None, fov, resolution)
+        for pose in poses
+    ])
+    rays_per_view = len(directions) // len(poses)
+    origins = np.repeat(np.asarray(poses)[:, :ndim], rays_per_view, axis=0)
+    result = traverse(origins, directions, _shared["occupied"], _shared["origin"], _shared["cell_size"],
+                      max_distance=max_distance, weights=_shared["weights"], stop_at_hit=True)
+    return result.ray_weight.reshape(len(poses), rays_per_view).sum(axis=1)
+
+
+def evaluate_views(grid, poses, fov=np.pi / 3, resolution=16, max_distance=np.inf, workers=None, chunk=25):
+    # Poses are rows of (position..., yaw[, pitch]). The gain of a view is the
+    # summed entropy of the cells its rays cross up to their first occupied cell.
+    poses = np.asarray(poses, dtype=np.float64)
+    args = (grid.occupied(), grid.entropy(), grid.origin, grid.cell_size)
+    chunks = [poses[i:i + chunk] for i in range(0, len(poses), chunk)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(chunks) == 1:
+        _init_evaluator(*args)
+        gains = [_score_chunk(c, fov, resolution, max_distance) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_evaluator,
+                                 initargs=args) as pool:
+            gains = list(pool.map(_score_chunk, chunks, *zip(*[(fov, resolution, max_distance)] * len(chunks))))
+    gains = np.concatenate(gains)
+    order = np.argsort(-gains, kind="stable")
+    return RankedViews(order, gains[order])
+
+
+def candidate_poses(center, radius, count, height=None):
+    # Views on a circle (or a ring at ``height`` in 3D) looking at the centre.
+    angles = np.linspace(0, 2 * np.pi, count, endpoint=False)
+    center = np.asarray(center, dtype=np.float64)
+    xy = center[:2] + radius * np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    yaw = angles + np.pi
+    if height is None:
+        return np.column_stack([xy, yaw])
+    pitch = np.arctan2(center[2] - height, radius) * np.ones(count)
+    return np.column_stack([xy, np.full(count, height), yaw, pitch])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time batched information-gain scoring on a random grid.")
+    parser.add_argument("--size", type=int, default=128)
+    parser.add_argument("--views", type=int, default=500)
+    parser.add_argument("--resolution", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    grid = OccupancyGrid((args.size,) * 3, np.zeros(3), 1.0)
+    observed = rng.integers(0, args.size, size=(args.size ** 3 // 20, 3))
+    grid.integrate(observed[: len(observed) // 4], observed[len(observed) // 4:])
+    center = np.full(3, args.size / 2)
+    poses = candidate_poses(center, args.size * 0.45, args.views, height=args.size * 0.6)
+    started = time.perf_counter()
+    ranked = evaluate_views(grid, poses, resolution=args.resolution, workers=args.workers)
+    elapsed = time.perf_counter() - started
+    print(f"{args.views} views x {args.resolution ** 2} rays on {args.size}^3: {elapsed:.2f}s")
+    for rank, (index, gain) in enumerate(zip(ranked.index[:5], ranked.gain[:5]), 1):
+        print(f"  #{rank}: view {index:>4}  gain {gain:10.1f} bits")
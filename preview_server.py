@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+import io
+import os
+import json
+import time
+import argparse
+import threading
+import functools
+import collections
+import http.client
+import urllib.parse
+import webbrowser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Live preview for the watcher: instead of manim opening a player once the
+# whole movie is encoded, render workers POST every frame (downscaled JPEG)
+# to a small local HTTP server as it is rasterized, and one browser tab shows
+# them as an MJPEG stream. Render progress, errors and background encodes are
+# pushed to the tab as server-sent events, so it never needs reloading.
+#
+#     python file_watcher.py --preview            # then open http://127.0.0.1:8765
+#     python preview_server.py                    # server only, e.g. for a remote worker
+#
+# Streaming is best effort: a worker never waits on the server, frames that
+# arrive faster than --preview-fps are dropped, and a dead server only costs a
+# failed connect per job.
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_FPS = 30
+DEFAULT_WIDTH = 854
+JPEG_QUALITY = 70
+EVENT_BACKLOG = 200
+BOUNDARY = "manimframe"
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>manim preview</title>
+<style>
+body { margin: 0; background: #111; color: #ddd; font: 14px monospace; }
+#bar { padding: 6px 10px; background: #222; display: flex; gap: 1em; }
+#frame { display: block; margin: 10px auto; max-width: 100%; max-height: calc(100vh - 60px); }
+#error { color: #f77; white-space: pre-wrap; padding: 0 10px; }
+a { color: #8cf; }
+</style></head>
+<body>
+<div id="bar"><span id="status">waiting for a render...</span><span id="scene"></span><span id="movie"></span></div>
+<img id="frame" src="/stream">
+<pre id="error"></pre>
+<script>
+const $ = (id) => document.getElementById(id);
+const events = new EventSource("/events");
+events.onopen = () => { $("frame").src = "/stream?" + Date.now(); };
+events.addEventListener("job", (e) => {
+  const d = JSON.parse(e.data);
+  $("status").textContent = "rendering " + d.label;
+  $("error").textContent = "";
+});
+events.addEventListener("scene", (e) => { $("scene").textContent = JSON.parse(e.data).scene; });
+events.addEventListener("done", (e) => {
+  const d = JSON.parse(e.data);
+  $("status").textContent = d.label + " " + d.status + (d.seconds != null ? " in " + d.seconds.toFixed(2) + " s" : "");
+  $("error").textContent = d.error || "";
+});
+events.addEventListener("encoded", (e) => {
+  const d = JSON.parse(e.data);
+  $("movie").innerHTML = "";
+  const link = document.createElement("a");
+  link.href = d.url; link.textContent = "full quality: " + d.label;
+  $("movie").appendChild(link);
+});
+</script>
+</body></html>
+"""
+
+
+class PreviewServer:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, media_root=None):
+        self.host = host
+        self.port = port
+        # Encoded movies under media_root are served at /media/.
+        self.media_root = os.path.abspath(media_root) if media_root else None
+        self._condition = threading.Condition()
+        self._frame = None
+        self._frame_number = 0
+        self._scene = None
+        self._events = collections.deque(maxlen=EVENT_BACKLOG)
+        self._event_number = 0
+        self._stopped = False
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        server = self
+
+        class Handler(_PreviewHandler):
+            preview = server
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def publish(self, jpeg, scene=None):
+        with self._condition:
+            self._frame = jpeg
+            self._frame_number += 1
+            self._condition.notify_all()
+        if scene and scene != self._scene:
+            self._scene = scene
+            self.notify("scene", {"scene": scene})
+
+    def notify(self, event, data):
+        with self._condition:
+            self._event_number += 1
+            self._events.append((self._event_number, event, json.dumps(data)))
+            self._condition.notify_all()
+
+    def media_url(self, path):
+        # URL of a file under media_root, or None if it lies outside.
+        if self.media_root is None:
+            return None
+        relative = os.path.relpath(os.path.abspath(path), self.media_root)
+        if relative.startswith(os.pardir):
+            return None
+        return f"{self.url}/media/{urllib.parse.quote(relative.replace(os.sep, '/'))}"
+
+    def next_frame(self, seen, timeout=15):
+        # (number, jpeg) of the first frame after ``seen``; the current one
+        # again on timeout so idle streams still get a keep-alive part.
+        with self._condition:
+            self._condition.wait_for(lambda: self._stopped or self._frame_number > seen, timeout)
+            return self._frame_number, self._frame
+
+    def next_events(self, seen, timeout=15):
+        with self._condition:
+            self._condition.wait_for(lambda: self._stopped or self._event_number > seen, timeout)
+            return [event for event in self._events if event[0] > seen]
+
+
+class _PreviewHandler(BaseHTTPRequestHandler):
+    preview = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = urllib.parse.urlparse(self.path).path
+        if path == "/":
+            self._send(200, "text/html; charset=utf-8", PAGE.encode())
+        elif path == "/stream":
+            self._stream()
+        elif path == "/frame.jpg":
+            frame = self.preview.next_frame(-1, timeout=0)[1]
+            self._send(200, "image/jpeg", frame) if frame else self._send(204, "text/plain", b"")
+        elif path == "/events":
+            self._events()
+        elif path.startswith("/media/"):
+            self._media(urllib.parse.unquote(path[len("/media/"):]))
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    def do_POST(self):
+        if urllib.parse.urlparse(self.path).path != "/frame":
+            self._send(404, "text/plain", b"not found")
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.preview.publish(body, self.headers.get("X-Scene"))
+        self._send(204, "text/plain", b"")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        seen = -1
+        try:
+            while not self.preview._stopped:
+                seen, frame = self.preview.next_frame(seen)
+                if frame is None:
+                    continue
+                self.wfile.write(f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                                 f"Content-Length: {len(frame)}\r\n\r\n".encode() + frame + b"\r\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        # A reconnecting tab only replays what it missed.
+        seen = int(self.headers.get("Last-Event-ID") or 0)
+        try:
+            while not self.preview._stopped:
+                events = self.preview.next_events(seen)
+                if not events:
+                    self.wfile.write(b": keep-alive\n\n")
+                for seen, event, data in events:
+                    self.wfile.write(f"id: {seen}\nevent: {event}\ndata: {data}\n\n".encode())
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _media(self, relative):
+        root = self.preview.media_root
+        path = os.path.abspath(os.path.join(root, relative)) if root else None
+        if path is None or not path.startswith(root + os.sep) or not os.path.isfile(path):
+            self._send(404, "text/plain", b"not found")
+            return
+        content_type = {".mp4": "video/mp4", ".webm": "video/webm", ".mov": "video/quicktime",
+                        ".gif": "image/gif", ".png": "image/png"}.get(os.path.splitext(path)[1],
+                                                                      "application/octet-stream")
+        with open(path, "rb") as f:
+            self._send(200, content_type, f.read())
+
+
+class FrameStreamer:
+    # Worker side: keeps only the latest offered frame and sends it from a
+    # background thread, so rasterization never waits on encoding or the
+    # network and a slow consumer just sees fewer frames.
+    def __init__(self, url, fps=DEFAULT_FPS, width=DEFAULT_WIDTH):
+        parsed = urllib.parse.urlparse(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.interval = 1 / fps if fps else 0
+        self.width = width
+        self.scene = None
+        self._pending = None
+        self._last_offer = 0.0
+        self._condition = threading.Condition()
+        self._connection = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def offer(self, frame, force=False):
+        # Frames within ``interval`` of the last offered one are dropped.
+        now = time.perf_counter()
+        if not force and now - self._last_offer < self.interval:
+            return
+        self._last_offer = now
+        with self._condition:
+            self._pending = (frame, self.scene)
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                (frame, scene), self._pending = self._pending, None
+            try:
+                self._post(encode_jpeg(frame, self.width), scene)
+            except (OSError, http.client.HTTPException):
+                # Nobody listening; reconnect on the next frame.
+                self._close()
+
+    def _post(self, jpeg, scene):
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=2)
+        self._connection.request("POST", "/frame", body=jpeg,
+                                 headers={"Content-Type": "image/jpeg", "X-Scene": scene or ""})
+        self._connection.getresponse().read()
+
+    def _close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def encode_jpeg(frame, width=DEFAULT_WIDTH, quality=JPEG_QUALITY):
+    # RGBA pixel array to a JPEG at most ``width`` pixels wide.
+    from PIL import Image
+
+    image = Image.fromarray(frame[..., :3])
+    if width and image.width > width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.BILINEAR)
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+_streamers = {}
+_active = None
+_installed = False
+
+
+def use(stream, scene=None):
+    # Streams the frames of the next render as a job's "stream" entry asks
+    # ({"url", "fps", "width"}); None stops streaming. Streamers, and their
+    # connections, are kept for later jobs.
+    global _active
+    if not stream:
+        _active = None
+        return None
+    key = (stream["url"], stream.get("fps", DEFAULT_FPS), stream.get("width", DEFAULT_WIDTH))
+    streamer = _streamers.get(key)
+    if streamer is None:
+        streamer = _streamers[key] = FrameStreamer(*key)
+    streamer.scene = scene
+    _active = streamer
+    return streamer
+
+
+def install():
+    global _installed
+    if _installed:
+        return
+    from manim.renderer.cairo_renderer import CairoRenderer
+
+    original_add_frame = CairoRenderer.add_frame
+    original_scene_finished = CairoRenderer.scene_finished
+
+    @functools.wraps(original_add_frame)
+    def add_frame(self, frame, num_frames=1):
+        streamer = _active
+        if streamer is not None and not self.skip_animations:
+            streamer.offer(frame)
+        return original_add_frame(self, frame, num_frames)
+
+    @functools.wraps(original_scene_finished)
+    def scene_finished(self, scene):
+        # The final frame always goes out, whatever the throttle dropped.
+        result = original_scene_finished(self, scene)
+        if _active is not None:
+            _active.offer(self.get_frame(), force=True)
+        return result
+
+    CairoRenderer.add_frame = add_frame
+    CairoRenderer.scene_finished = scene_finished
+    _installed = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the live preview page that render workers stream frames to.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--media-dir", default="media", help="directory whose movies are served at /media/")
+    parser.add_argument("--open", action="store_true", help="open the page in a browser")
+    args = parser.parse_args()
+    server = PreviewServer(args.host, args.port, args.media_dir).start()
+    print(f"📺 Live preview at {server.url}")
+    if args.open:
+        webbrowser.open(server.url)
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,178 @@
+import hashlib
+import inspect
+
+import numpy as np
+from manim import Mobject, logger
+
+# Updaters that declare the mobjects (or ValueTrackers) they read and only run
+# when one of them moved. Every registered updater is still a normal mobject
+# updater, so manim's moving-mobject and static-wait detection see it as usual;
+# the graph only decides whether the wrapped function actually has to run.
+#
+#     graph.add_updater(line, update_line, inputs=[start_point, moving_point])
+#
+# An updater that reads another graph-managed mobject pulls that one up to date
+# first, so the order mobjects were added to the scene in doesn't matter.
+# ReactiveScene logs how many calls were skipped at debug level (``manim -v DEBUG``).
+
+
+STYLE_ATTRIBUTES = ("fill_rgbas", "stroke_rgbas", "stroke_width", "background_stroke_rgbas",
+                    "background_stroke_width")
+
+
+def fingerprint(mobjects):
+    # Points and style, so an updater reading a color or opacity (a label
+    # following a dot that fades) runs when only that changes. ValueTracker
+    # keeps its value in ``points`` too, so this covers trackers.
+    digest = hashlib.blake2b(digest_size=16)
+    for mobject in mobjects:
+        for member in mobject.get_family():
+            digest.update(np.ascontiguousarray(member.points).data)
+            for name in STYLE_ATTRIBUTES:
+                value = member.__dict__.get(name)
+                if isinstance(value, np.ndarray):
+                    digest.update(np.ascontiguousarray(value).data)
+                elif value is not None:
+                    digest.update(repr(value).encode())
+            digest.update(b"|")
+    return digest.digest()
+
+
+class _Node:
+    def __init__(self, graph, mobject, func, inputs):
+        self.graph = graph
+        self.mobject = mobject
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.time_based = "dt" in inspect.signature(func).parameters
+        self.input_state = None
+        self.output_state = None
+        self.pulled = False
+        self.running = False
+        # Keep the dt parameter only for time-based functions so manim can
+        # still freeze waits in which nothing is time-based.
+        if self.time_based:
+            self.updater = lambda mobject, dt: self.evaluate(dt)
+        else:
+            self.updater = lambda mobject: self.evaluate()
+
+    def evaluate(self, dt=0, pulled=False):
+        if self.running or self.mobject.updating_suspended:
+            return
+        self.running = True
+        try:
+            for producer in self.graph.producers(self.inputs):
+                if not producer.time_based:
+                    producer.evaluate(pulled=True)
+            if self.time_based:
+                # Runs every frame anyway, so there's nothing to fingerprint.
+                self.func(self.mobject, dt)
+                self.graph.calls += 1
+                return
+            state = fingerprint(self.inputs)
+            # The output is checked too, so an animation that moved the
+            # mobject itself gets overwritten just like with a plain updater.
+            # It's only hashed when the inputs are unchanged.
+            if state == self.input_state and fingerprint([self.mobject]) == self.output_state:
+                # A node already run by a consumer's pull this frame isn't a skip.
+                if not pulled:
+                    if not self.pulled:
+                        self.graph.skipped += 1
+                    self.pulled = False
+                return
+            self.func(self.mobject)
+            self.graph.calls += 1
+            self.pulled = pulled
+            self.input_state = state
+            self.output_state = fingerprint([self.mobject])
+        finally:
+            self.running = False
+
+
+class UpdaterGraph:
+    def __init__(self):
+        self.nodes = []
+        self._producers = {}
+        self.calls = 0
+        self.skipped = 0
+
+    def producers(self, mobjects):
+        for mobject in mobjects:
+            yield from self._producers.get(id(mobject), ())
+
+    def _reaches(self, inputs, target, seen=None):
+        # True when ``target`` is one of ``inputs`` or anything they derive from.
+        seen = set() if seen is None else seen
+        for mobject in inputs:
+            if mobject is target:
+                return True
+            for node in self.producers([mobject]):
+                if id(node) not in seen:
+                    seen.add(id(node))
+                    if self._reaches(node.inputs, target, seen):
+                        return True
+        return False
+
+    def add_updater(self, mobject, func, inputs, call_updater=True):
+        inputs = list(inputs)
+        if self._reaches(inputs, mobject):
+            raise ValueError(f"updater on {type(mobject).__name__} would depend on its own output")
+        node = _Node(self, mobject, func, inputs)
+        self.nodes.append(node)
+        self._producers.setdefault(id(mobject), []).append(node)
+        mobject.add_updater(node.updater)
+        if call_updater:
+            node.evaluate()
+        return mobject
+
+    def remove_updater(self, mobject, func):
+        for node in [n for n in self.nodes if n.mobject is mobject and n.func is func]:
+            self.nodes.remove(node)
+            self._producers[id(mobject)].remove(node)
+            mobject.remove_updater(node.updater)
+        return mobject
+
+    def track(self, tracked):
+        # Takes over a tracked_mobjects instance: its refresh runs through the
+        # graph instead of unconditionally. Point callables can't be
+        # fingerprinted, so those keep refreshing every frame.
+        if not all(isinstance(d, Mobject) for d in tracked.dependencies):
+            return tracked
+        tracked.remove_updater(tracked.refresh_updater)
+        return self.add_updater(tracked, lambda m: m.refresh(), tracked.dependencies)
+
+    def totals(self):
+        return {"calls": self.calls, "skipped": self.skipped}
+
+
+class ReactiveScene:
+    # Scene mixin: ``self.updater_graph`` plus per-play counts of updater runs
+    # and skips in ``self.updater_segments``.
+    @property
+    def updater_graph(self):
+        if "_updater_graph" not in self.__dict__:
+            self._updater_graph = UpdaterGraph()
+            self.updater_segments = []
+        return self._updater_graph
+
+    def play(self, *args, **kwargs):
+        graph = self.updater_graph
+        before = graph.totals()
+        super().play(*args, **kwargs)
+        after = graph.totals()
+        self.updater_segments.append({key: after[key] - before[key] for key in after})
+
+    def tear_down(self):
+        super().tear_down()
+        logger.debug(updater_report(self.updater_graph, self.updater_segments))
+
+
+def updater_report(graph, segments):
+    calls, skipped = graph.calls, graph.skipped
+    total = calls + skipped
+    lines = [f"🔁 Updaters: {calls} run, {skipped} skipped ({100 * skipped / total if total else 0:.0f}%)"
+             f" over {len(segments)} segments"]
+    for index, segment in enumerate(segments):
+        if segment["skipped"]:
+            lines.append(f"   segment {index:>3}: {segment['calls']:>5} run {segment['skipped']:>5} skipped")
+    return "\n".join(lines)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import os
+import sys
+import shutil
+import argparse
+import functools
+import threading
+from contextlib import suppress
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: no reflinks, entries are plain copies.
+    fcntl = None
+
+import render_telemetry
+
+# Content-addressed store of rendered play() segments shared by every watcher
+# job. Keys are manim's own per-play hash (scene state before the play, the
+# animations and their parameters, camera and encoder settings, which include
+# quality), so a segment rendered by any job or any earlier session is reused
+# as is. Files are copied between the store and the job's partial movie
+# directory, as reflinks where the filesystem has them, so each entry's bytes
+# are its own and evicting it frees them. Least recently used entries are
+# evicted at the end of each job once the store grows past its size cap.
+
+CACHE_DIR = "render_cache"
+DEFAULT_MAX_MB = 2048
+# ioctl(2) request for a copy-on-write clone of a whole file (Linux).
+FICLONE = 0x40049409
+
+_active = None
+_installed = False
+
+
+class RenderCache:
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "stored": 0, "evicted": 0}
+        self._lock = threading.Lock()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name[:2], name)
+
+    def fetch(self, name, target):
+        path = self._path(name)
+        # manim takes any file at target for a finished segment, so a copy cut
+        # short must never be left there.
+        temporary = f"{target}.{os.getpid()}.tmp"
+        try:
+            _place(path, temporary)
+            os.replace(temporary, target)
+            # mtime doubles as the LRU clock.
+            os.utime(path)
+        except OSError:
+            with suppress(OSError):
+                os.remove(temporary)
+            self.stats["misses"] += 1
+            return False
+        self.stats["hits"] += 1
+        return True
+
+    def store(self, name, source):
+        path = self._path(name)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        try:
+            _place(source, temporary)
+            os.replace(temporary, path)
+            os.utime(path)
+        except OSError:
+            with suppress(OSError):
+                os.remove(temporary)
+            return
+        self.stats["stored"] += 1
+
+    def entries(self):
+        found = []
+        for dirpath, _, filenames in os.walk(self.directory):
+            for filename in filenames:
+                if filename.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime, stat.st_size, path))
+        return sorted(found)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        if self.max_bytes is None:
+            return
+        with self._lock:
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                with suppress(OSError):
+                    os.remove(path)
+                    self.stats["evicted"] += 1
+                total -= size
+
+
+def _place(source, target):
+    # A reflink shares the blocks until either side is written, at no cost up
+    # front; other filesystems get a plain copy. Never a hard link: the store
+    # would count bytes that evicting the entry doesn't free.
+    os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        if fcntl is not None:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+    shutil.copy2(source, target)
+
+
+def use(cache):
+    # Selects the store for the next renders in this process (None disables it).
+    global _active
+    _active = cache
+
+
+def install():
+    global _installed
+    if _installed:
+        return
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    original_is_cached = SceneFileWriter.is_already_cached
+    original_finish = SceneFileWriter.finish
+
+    @functools.wraps(original_is_cached)
+    def is_already_cached(self, hash_invocation):
+        cache = _active
+        hit = original_is_cached(self, hash_invocation)
+        if cache is None or not self.output_spec.is_video:
+            return hit
+        if not hit:
+            target = self.output_plan.segment_path(hash_invocation)
+            hit = cache.fetch(target.name, str(target))
+        metrics = render_telemetry.active_metrics()
+        if metrics is not None:
+            metrics.segment_cache_hits += hit
+            metrics.segment_cache_misses += not hit
+        return hit
+
+    @functools.wraps(original_finish)
+    def finish(self, *args, **kwargs):
+        result = original_finish(self, *args, **kwargs)
+        cache = _active
+        if cache is not None:
+            # Segments are only complete once finish() has drained the encoders.
+            for path in self.partial_movie_files:
+                if path and not os.path.basename(path).startswith("uncached_") and os.path.exists(path):
+                    cache.store(os.path.basename(path), path)
+        return result
+
+    SceneFileWriter.is_already_cached = is_already_cached
+    SceneFileWriter.finish = finish
+    _installed = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect or trim the shared render segment cache.")
+    parser.add_argument("directory", nargs="?", default=os.path.join("media", CACHE_DIR))
+    parser.add_argument("--max-mb", type=float, help="evict least recently used segments down to this size")
+    parser.add_argument("--clear", action="store_true")
+    args = parser.parse_args()
+    if not os.path.isdir(args.directory):
+        print(f"No render cache at {args.directory}")
+        sys.exit(1)
+    if args.clear:
+        shutil.rmtree(args.directory)
+        print(f"🧹 Cleared {args.directory}")
+        sys.exit(0)
+    cache = RenderCache(args.directory, None if args.max_mb is None else int(args.max_mb * 1024 * 1024))
+    cache.evict()
+    entries = cache.entries()
+    print(f"{len(entries)} segments, {sum(size for _, size, _ in entries) / 1024 / 1024:.1f} MB"
+          + (f", evicted {cache.stats['evicted']}" if cache.stats["evicted"] else ""))
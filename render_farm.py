@@ -0,0 +1,725 @@
+#!/usr/bin/env python3
+import os
+import sys
+import ast
+import json
+import hmac
+import time
+import shutil
+import hashlib
+import secrets
+import socket
+import struct
+import argparse
+import datetime
+import tempfile
+import itertools
+import threading
+import traceback
+import subprocess
+import socketserver
+import multiprocessing
+from contextlib import suppress
+from concurrent.futures import ProcessPoolExecutor
+
+from render_worker import MOVIE_EXTENSIONS, QUALITY, WarmRenderWorker, rendered_movie
+from import_graph import ImportGraph
+from scene_index import find_scene_classes
+from render_cache import CACHE_DIR, DEFAULT_MAX_MB
+from asset_cache import ASSET_DIR, DEFAULT_MAX_MB as ASSET_MAX_MB
+import segment_render
+
+# Renders watcher jobs on worker daemons on other machines. The coordinator
+# (a RenderFarm, in the watcher with --farm) listens on a TCP port; worker
+# daemons connect to it and pull one task at a time, so a fast node simply
+# takes more of the queue. A task is one scene, or one play range of a scene,
+# sent with a snapshot of the scene file and every module under the root it
+# imports, and the quality to render at. The daemon renders it in a warm
+# render_worker process and streams the movie back in chunks; ranges of one
+# scene are joined with segment_render.concat_movies.
+#
+#     python file_watcher.py --farm 0.0.0.0:8766                      # on the coordinator
+#     MANIM_FARM_TOKEN=... python render_farm.py worker coordinator-host:8766 --slots 4   # on every node
+#     python render_farm.py local scene.py -w 4 [--split 4]           # all on localhost
+#
+# The coordinator listens on localhost unless given a host. Workers have to
+# prove they know the coordinator's token (MANIM_FARM_TOKEN, or a random one
+# printed at startup) by signing a nonce before they're sent any source, and
+# the coordinator picks where finished movies go itself, under media_dir.
+#
+# A task that runs past --timeout, or whose worker disconnects, is queued
+# again, up to --retries times. When the queue runs dry, idle workers also
+# pick up a second copy of the oldest task running longer than STEAL_AFTER
+# seconds; the first copy to finish wins and the other is cancelled. Scene
+# errors are not retried, they would fail the same way again, but a render
+# process that died (a crash, the OOM killer) is.
+#
+# Messages are length-prefixed: a header of two big-endian uint32 (JSON size,
+# payload size), the JSON object, then the raw payload (movie chunks).
+
+DEFAULT_PORT = 8766
+TOKEN_ENV = "MANIM_FARM_TOKEN"
+HANDSHAKE_TIMEOUT = 10.0
+DEFAULT_TIMEOUT = 600
+DEFAULT_RETRIES = 2
+STEAL_AFTER = 10.0
+CHUNK_BYTES = 1 << 20
+HEADER = struct.Struct(">II")
+
+
+def _timestamp():
+    return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def send_message(sock, message, payload=b""):
+    header = json.dumps(message).encode()
+    sock.sendall(HEADER.pack(len(header), len(payload)) + header + payload)
+
+
+def _recv_exactly(sock, size):
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(min(size - len(buffer), CHUNK_BYTES))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def recv_message(sock):
+    header_size, payload_size = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    message = json.loads(_recv_exactly(sock, header_size))
+    return message, _recv_exactly(sock, payload_size) if payload_size else b""
+
+
+def parse_address(text, default_host="127.0.0.1"):
+    # "host:port", ":port" or "port".
+    host, _, port = text.rpartition(":")
+    return host or default_host, int(port or DEFAULT_PORT)
+
+
+def sign(token, nonce):
+    return hmac.new(token.encode(), nonce.encode(), hashlib.sha256).hexdigest()
+
+
+def confined(root, relative):
+    # Path of the "/"-separated ``relative`` under root, or None if it would
+    # land outside of it.
+    root = os.path.abspath(root)
+    path = os.path.abspath(os.path.join(root, *relative.split("/")))
+    return path if os.path.commonpath([root, path]) == root else None
+
+
+def snapshot(graph, file_path, root):
+    # {path relative to root: source} of the file and the modules it imports.
+    sources = {}
+    for path in sorted(graph.dependencies(file_path)):
+        relative = os.path.relpath(path, root)
+        if relative.startswith(os.pardir):
+            continue
+        with open(path, encoding="utf-8") as f:
+            sources[relative.replace(os.sep, "/")] = f.read()
+    return sources
+
+
+class _Task:
+    def __init__(self, farm_job, task_id, index, first, last):
+        self.farm_job = farm_job
+        self.id = task_id
+        self.index = index
+        self.first = first
+        self.last = last
+        self.attempts = 0
+        self.failures = 0
+        self.holders = {}
+        self.done = False
+
+
+class _FarmJob:
+    def __init__(self, job, callback, sources, ranges, task_ids):
+        self.job = job
+        self.callback = callback
+        self.sources = sources
+        self.tasks = [_Task(self, next(task_ids), k, first, last) for k, (first, last) in enumerate(ranges)]
+        self.results = [None] * len(self.tasks)
+        self.scratch = os.path.join(job["config"]["media_dir"], "farm", str(job.get("id")))
+        self.started_at = None
+        self.finished = False
+
+
+class _Connection:
+    def __init__(self, sock, address, hello):
+        self.sock = sock
+        self.name = hello.get("name") or f"{address[0]}:{address[1]}"
+        self.task = None
+        self.attempt = None
+        self.started = None
+        self.upload = None
+        self._send_lock = threading.Lock()
+
+    def send(self, message, payload=b""):
+        with self._send_lock:
+            send_message(self.sock, message, payload)
+
+    def cancel(self, task):
+        with suppress(OSError):
+            self.send({"type": "cancel", "task": task.id})
+
+    def close(self):
+        with suppress(OSError):
+            self.sock.shutdown(socket.SHUT_RDWR)
+
+    def write_chunk(self, message, payload):
+        task = self.task
+        if task is None or message["task"] != task.id:
+            return
+        if message["offset"] == 0:
+            self.discard_upload()
+            os.makedirs(task.farm_job.scratch, exist_ok=True)
+            path = os.path.join(task.farm_job.scratch, f"task_{task.id}_{self.attempt}.part")
+            self.upload = open(path, "wb")
+        if self.upload is not None:
+            self.upload.write(payload)
+
+    def finish_upload(self, size, extension):
+        # Path of the complete movie, or None if it's missing or truncated.
+        upload, self.upload = self.upload, None
+        if upload is None:
+            return None
+        upload.close()
+        if os.path.getsize(upload.name) != size:
+            os.remove(upload.name)
+            return None
+        path = upload.name[:-len(".part")] + extension
+        os.replace(upload.name, path)
+        return path
+
+    def discard_upload(self):
+        upload, self.upload = self.upload, None
+        if upload is not None:
+            upload.close()
+            with suppress(OSError):
+                os.remove(upload.name)
+
+
+class _FarmServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class RenderFarm:
+    # Drop-in for the watcher's RenderPool: jobs go to connected worker
+    # daemons instead of local processes. Jobs render one scene each and may
+    # carry "ranges", [first, last] play ranges rendered as separate tasks.
+    def __init__(self, address=("127.0.0.1", DEFAULT_PORT), graph=None, timeout=DEFAULT_TIMEOUT,
+                 retries=DEFAULT_RETRIES, steal_after=STEAL_AFTER, token=None):
+        self.address = address
+        self.token = token or os.environ.get(TOKEN_ENV) or secrets.token_urlsafe(16)
+        self.graph = graph
+        self.timeout = timeout
+        self.retries = retries
+        self.steal_after = steal_after
+        self._condition = threading.Condition()
+        self._queue = []
+        self._connections = set()
+        self._task_ids = itertools.count(1)
+        self._stopped = False
+        self._server = None
+
+    @property
+    def workers(self):
+        with self._condition:
+            return list(self._connections)
+
+    def start(self):
+        farm = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                farm._serve(self.request, self.client_address)
+
+        self._server = _FarmServer(self.address, Handler)
+        self.address = self._server.server_address
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._watchdog, daemon=True).start()
+
+    def submit(self, job, callback):
+        sources = snapshot(self.graph, job["file"], job["root"])
+        farm_job = _FarmJob(job, callback, sources, job.get("ranges") or [(0, -1)], self._task_ids)
+        with self._condition:
+            self._queue.extend(farm_job.tasks)
+            self._condition.notify_all()
+
+    def cancel(self, file_path):
+        # Same contract as RenderPool.cancel: queued tasks are dropped, running
+        # ones cancelled on their workers and reported as cancelled.
+        def affected(farm_job):
+            return file_path in (farm_job.job["file"], farm_job.job.get("trigger"))
+
+        with self._condition:
+            self._queue = [task for task in self._queue if not affected(task.farm_job)]
+            busy = [(connection, connection.task) for connection in self._connections
+                    if connection.task is not None and affected(connection.task.farm_job)]
+            cancelled = {task.farm_job for _, task in busy if not task.farm_job.finished}
+            for farm_job in cancelled:
+                farm_job.finished = True
+        for connection, task in busy:
+            connection.cancel(task)
+        for farm_job in cancelled:
+            self._report(farm_job, "cancelled")
+        return bool(busy)
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            connections = list(self._connections)
+            self._condition.notify_all()
+        for connection in connections:
+            connection.close()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def _serve(self, sock, address):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        nonce = secrets.token_hex(16)
+        try:
+            sock.settimeout(HANDSHAKE_TIMEOUT)
+            send_message(sock, {"type": "challenge", "nonce": nonce})
+            hello, _ = recv_message(sock)
+            if not (isinstance(hello, dict) and hmac.compare_digest(str(hello.get("auth")), sign(self.token, nonce))):
+                print(f"[{_timestamp()}] 🚫 Refused farm worker at {address[0]}:{address[1]} (bad token)")
+                send_message(sock, {"type": "rejected"})
+                return
+            sock.settimeout(None)
+        except (OSError, ConnectionError, ValueError):
+            return
+        connection = _Connection(sock, address, hello)
+        with self._condition:
+            self._connections.add(connection)
+        print(f"[{_timestamp()}] 🛰 Farm worker joined: {connection.name}")
+        try:
+            while True:
+                message, payload = recv_message(sock)
+                if message["type"] == "ready":
+                    task = self._next_task(connection)
+                    if task is None:
+                        return
+                    connection.send(self._task_message(task, connection.attempt))
+                elif message["type"] == "chunk":
+                    connection.write_chunk(message, payload)
+                elif message["type"] == "result":
+                    self._result(connection, message)
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._drop(connection)
+
+    def _next_task(self, connection):
+        with self._condition:
+            while not self._stopped:
+                task = self._pop() or self._steal()
+                if task is not None:
+                    task.attempts += 1
+                    task.holders[connection] = task.attempts
+                    connection.task, connection.attempt, connection.started = task, task.attempts, time.time()
+                    if task.farm_job.started_at is None:
+                        task.farm_job.started_at = connection.started
+                    return task
+                # Also wakes up periodically to look for stragglers to steal.
+                self._condition.wait(timeout=1.0)
+            return None
+
+    def _pop(self):
+        while self._queue:
+            task = self._queue.pop(0)
+            if not task.farm_job.finished and not task.done:
+                return task
+        return None
+
+    def _steal(self):
+        now = time.time()
+        running = [connection for connection in self._connections
+                   if connection.task is not None and not connection.task.done
+                   and not connection.task.farm_job.finished and len(connection.task.holders) == 1
+                   and now - connection.started > self.steal_after]
+        return min(running, key=lambda connection: connection.started).task if running else None
+
+    def _task_message(self, task, attempt):
+        job = task.farm_job.job
+        config = {key: value for key, value in job.get("config", {}).items() if key != "media_dir"}
+        return {"type": "task", "task": task.id, "attempt": attempt, "scene": job["scenes"][0],
+                "file": os.path.relpath(job["file"], job["root"]).replace(os.sep, "/"),
+                "sources": task.farm_job.sources, "quality": job.get("quality", QUALITY), "config": config,
+                "first": task.first, "last": task.last}
+
+    def _result(self, connection, message):
+        task = connection.task
+        if task is None or message["task"] != task.id:
+            connection.discard_upload()
+            return
+        result = message["result"]
+        # Only the extension is taken from the worker, the coordinator names the file.
+        extension = message.get("extension")
+        upload = (connection.finish_upload(message.get("size", 0), extension) if extension in MOVIE_EXTENSIONS
+                  else connection.discard_upload())
+        losers, complete, failed = [], False, False
+        with self._condition:
+            connection.task = None
+            task.holders.pop(connection, None)
+            farm_job = task.farm_job
+            if farm_job.finished or task.done:
+                # A losing copy, or a job that was cancelled or failed meanwhile.
+                if upload:
+                    os.remove(upload)
+            elif result["status"] == "ok" and upload:
+                task.done = True
+                result["farm_worker"] = connection.name
+                farm_job.results[task.index] = (result, upload)
+                losers = list(task.holders)
+                complete = all(farm_job.results)
+                farm_job.finished = complete
+            elif result["status"] == "error" and not result.get("crashed"):
+                farm_job.finished = failed = True
+            else:
+                status = "crashed" if result.get("crashed") else result["status"]
+                failed = self._retry(task, f"{status} on {connection.name}")
+        for loser in losers:
+            loser.cancel(task)
+        if complete:
+            self._complete(farm_job)
+        elif failed:
+            self._report(farm_job, "error", result.get("error") or f"task {task.id} failed", result.get("output", ""))
+
+    def _retry(self, task, reason):
+        # Called with the lock held; True if the job has run out of retries.
+        farm_job = task.farm_job
+        if task.holders or task.done or farm_job.finished:
+            return False
+        task.failures += 1
+        if task.failures > self.retries:
+            farm_job.finished = True
+            return True
+        print(f"[{_timestamp()}] 🔁 Retrying {farm_job.job['scenes'][0]} task {task.id} ({reason})")
+        self._queue.insert(0, task)
+        self._condition.notify_all()
+        return False
+
+    def _drop(self, connection):
+        connection.discard_upload()
+        with self._condition:
+            self._connections.discard(connection)
+            task, connection.task = connection.task, None
+            failed = False
+            if task is not None:
+                task.holders.pop(connection, None)
+                failed = self._retry(task, f"lost {connection.name}")
+        if failed:
+            self._report(task.farm_job, "error", f"task {task.id} failed {task.failures} times")
+        if not self._stopped:
+            print(f"[{_timestamp()}] 🛰 Farm worker left: {connection.name}")
+
+    def _watchdog(self):
+        # Timed-out workers are disconnected; their tasks are retried
+        # elsewhere and the daemon reconnects with a fresh render process.
+        while not self._stopped:
+            time.sleep(1.0)
+            now = time.time()
+            with self._condition:
+                late = [(connection, connection.task) for connection in self._connections
+                        if connection.task is not None and now - connection.started > self.timeout]
+            for connection, task in late:
+                print(f"[{_timestamp()}] ⏱ Task {task.id} timed out on {connection.name}")
+                connection.close()
+
+    def _complete(self, farm_job):
+        job = farm_job.job
+        parts = [upload for _, upload in farm_job.results]
+        media_dir = os.path.abspath(job["config"]["media_dir"])
+        module = os.path.splitext(os.path.basename(job["file"]))[0]
+        output_file = confined(media_dir, f"videos/{module}/farm/{job['scenes'][0]}{os.path.splitext(parts[0])[1]}")
+        if output_file is None:
+            self._report(farm_job, "error", f"{job['scenes'][0]} would be written outside {media_dir}")
+            return
+        try:
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            if len(parts) == 1:
+                os.replace(parts[0], output_file)
+            else:
+                segment_render.concat_movies(parts, output_file)
+        except Exception:
+            self._report(farm_job, "error", traceback.format_exc())
+            return
+        self._report(farm_job, "ok", movie=output_file)
+
+    def _report(self, farm_job, status, error=None, output="", movie=None):
+        job = farm_job.job
+        results = [entry[0] for entry in farm_job.results if entry]
+        outputs = [output] + [result.get("output", "") for result in results]
+        result = {
+            "id": job.get("id"),
+            "file": job["file"],
+            "scenes": list(job["scenes"]) if status == "ok" else [],
+            "status": status,
+            "started_at": farm_job.started_at or time.time(),
+            "metrics": [metrics for result in results for metrics in result.get("metrics", [])],
+            "output": "\n".join(text.rstrip() for text in outputs if text),
+            "worker": results[0].get("worker") if results else None,
+            "warm": all(result.get("warm") for result in results) if results else None,
+            "farm_workers": [result["farm_worker"] for result in results],
+        }
+        if error:
+            result["error"] = error
+        if movie:
+            result["movie"] = movie
+        if status != "ok":
+            # Other ranges of a failed or cancelled job are not worth finishing.
+            with self._condition:
+                running = [(connection, task) for task in farm_job.tasks for connection in task.holders]
+            for connection, task in running:
+                connection.cancel(task)
+        shutil.rmtree(farm_job.scratch, ignore_errors=True)
+        farm_job.callback(job, result)
+
+
+class FarmWorker:
+    # One slot of a worker daemon: a connection to the coordinator and a warm
+    # render process. Sources are synced into the slot's own tree, so the
+    # render worker's module purge picks up changed helpers.
+    def __init__(self, address, workdir, name=None, token=None):
+        self.address = address
+        self.token = token or os.environ.get(TOKEN_ENV, "")
+        self.workdir = os.path.abspath(workdir)
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}:{os.path.basename(self.workdir)}"
+        self.source_dir = os.path.join(self.workdir, "src")
+        shared = os.path.dirname(self.workdir)
+        self.cache = {"directory": os.path.join(shared, CACHE_DIR), "max_bytes": DEFAULT_MAX_MB * 1024 * 1024}
+        self.assets = {"directory": os.path.join(shared, ASSET_DIR), "max_bytes": ASSET_MAX_MB * 1024 * 1024}
+        self.renderer = WarmRenderWorker()
+        self.sock = None
+        self._current = None
+        self._thread = None
+        self._send_lock = threading.Lock()
+
+    def run(self):
+        self.renderer.start()
+        delay = 1
+        while True:
+            try:
+                self.sock = socket.create_connection(self.address)
+            except OSError:
+                time.sleep(delay)
+                delay = min(delay * 2, 30)
+                continue
+            delay = 1
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            print(f"[{_timestamp()}] 🛰 {self.name} connected to {self.address[0]}:{self.address[1]}")
+            try:
+                self._session()
+            except (OSError, ConnectionError, ValueError) as e:
+                print(f"[{_timestamp()}] ⚠ {self.name} lost the coordinator ({e})")
+            finally:
+                self.sock.close()
+                # A task the coordinator gave up on is not worth finishing.
+                if self._thread is not None and self._thread.is_alive():
+                    self.renderer.terminate()
+                    self._thread.join()
+
+    def stop(self):
+        self.renderer.stop()
+
+    def _send(self, message, payload=b""):
+        with self._send_lock:
+            send_message(self.sock, message, payload)
+
+    def _session(self):
+        challenge, _ = recv_message(self.sock)
+        if challenge.get("type") != "challenge":
+            raise ConnectionError("no challenge from the coordinator")
+        self._send({"type": "hello", "name": self.name, "auth": sign(self.token, challenge["nonce"])})
+        self._send({"type": "ready"})
+        while True:
+            message, _ = recv_message(self.sock)
+            if message["type"] == "rejected":
+                raise ConnectionError(f"the coordinator rejected the token, check {TOKEN_ENV}")
+            if message["type"] == "task":
+                self._current = message["task"]
+                self._thread = threading.Thread(target=self._render, args=(message,), daemon=True)
+                self._thread.start()
+            elif message["type"] == "cancel" and message["task"] == self._current:
+                self.renderer.terminate()
+
+    def _sync(self, sources, relative):
+        for name, text in sources.items():
+            path = confined(self.source_dir, name)
+            if path is None:
+                raise ValueError(f"refusing to write {name} outside {self.source_dir}")
+            with suppress(OSError):
+                with open(path, encoding="utf-8") as f:
+                    if f.read() == text:
+                        continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        path = confined(self.source_dir, relative)
+        if path is None:
+            raise ValueError(f"refusing to render {relative} outside {self.source_dir}")
+        return path
+
+    def _render(self, message):
+        media_dir = os.path.join(self.workdir, "jobs", str(message["task"]))
+        shutil.rmtree(media_dir, ignore_errors=True)
+        try:
+            try:
+                file_path = self._sync(message["sources"], message["file"])
+            except ValueError as e:
+                self._current = None
+                self._send({"type": "result", "task": message["task"], "attempt": message["attempt"],
+                            "result": {"status": "error", "error": str(e)}})
+                self._send({"type": "ready"})
+                return
+            config = dict(message["config"], media_dir=media_dir, progress_bar="none",
+                          from_animation_number=message["first"], upto_animation_number=message["last"])
+            job = {"id": message["task"], "file": file_path, "root": self.source_dir, "scenes": [message["scene"]],
+                   "preview": False, "capture_output": True, "quality": message["quality"], "config": config,
+                   "cache": self.cache, "assets": self.assets}
+            result = self.renderer.render(job)
+            movie = rendered_movie(media_dir, job["scenes"]) if result["status"] == "ok" else None
+            if result["status"] == "ok" and movie is None:
+                result.update(status="error", error=f"{message['scene']} wrote no movie")
+            reply = {"type": "result", "task": message["task"], "attempt": message["attempt"], "result": result}
+            if movie:
+                size = self._upload(message, movie)
+                reply.update(extension=os.path.splitext(movie)[1], size=size)
+            self._current = None
+            self._send(reply)
+            self._send({"type": "ready"})
+        except (OSError, ConnectionError):
+            # The session loop notices the broken connection.
+            self._current = None
+        finally:
+            shutil.rmtree(media_dir, ignore_errors=True)
+
+    def _upload(self, message, movie):
+        offset = 0
+        with open(movie, "rb") as f:
+            while True:
+                chunk = f.read(CHUNK_BYTES)
+                if not chunk and offset:
+                    return offset
+                self._send({"type": "chunk", "task": message["task"], "attempt": message["attempt"],
+                            "offset": offset}, chunk)
+                offset += len(chunk)
+                if not chunk:
+                    return offset
+
+
+def serve_worker(address, slots=1, workdir=None):
+    workdir = os.path.abspath(workdir or os.path.join(tempfile.gettempdir(), "render_farm"))
+    workers = [FarmWorker(address, os.path.join(workdir, f"slot_{k}")) for k in range(max(1, slots))]
+    for worker in workers:
+        threading.Thread(target=worker.run, daemon=True).start()
+    print(f"🛰 {len(workers)} render slots pulling from {address[0]}:{address[1]} (workdir {workdir})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.stop()
+
+
+def _durations(file_path, scene_name, root):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(segment_render._dry_run, file_path, scene_name, root).result()
+
+
+def run_local(file_path, scenes=None, workers=2, split=1, quality=QUALITY, media_dir="media", **options):
+    # Coordinator plus ``workers`` single-slot daemons on localhost; returns
+    # the per-scene results and the wall time from first submit to last result.
+    file_path = os.path.abspath(file_path)
+    root = os.path.dirname(file_path)
+    if not scenes:
+        with open(file_path, encoding="utf-8") as f:
+            scenes = sorted(find_scene_classes(ast.parse(f.read())))
+    graph = ImportGraph(root)
+    graph.scan()
+    farm = RenderFarm(("127.0.0.1", 0), graph, **options)
+    farm.start()
+    workdir = tempfile.mkdtemp(prefix="render_farm-")
+    address = f"{farm.address[0]}:{farm.address[1]}"
+    env = dict(os.environ, **{TOKEN_ENV: farm.token})
+    daemons = [subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", address,
+                                 "--workdir", workdir, "--name", f"local-{k}"], env=env) for k in range(workers)]
+    results = {}
+    finished = threading.Condition()
+
+    def done(job, result):
+        with finished:
+            results[job["scenes"][0]] = result
+            finished.notify()
+
+    try:
+        while len(farm.workers) < workers:
+            if any(daemon.poll() is not None for daemon in daemons):
+                raise RuntimeError("a local worker daemon exited before connecting")
+            time.sleep(0.1)
+        started = time.perf_counter()
+        for k, scene in enumerate(scenes):
+            ranges = segment_render.partition(_durations(file_path, scene, root), split) if split > 1 else None
+            farm.submit({"id": k + 1, "file": file_path, "root": root, "scenes": [scene], "quality": quality,
+                         "config": {"media_dir": os.path.abspath(media_dir)}, "ranges": ranges}, done)
+        with finished:
+            finished.wait_for(lambda: len(results) == len(scenes))
+        return results, time.perf_counter() - started
+    finally:
+        farm.stop()
+        for daemon in daemons:
+            daemon.terminate()
+            daemon.wait()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render manim scenes on worker daemons over TCP.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    worker = commands.add_parser("worker", help="run a worker daemon that pulls tasks from a coordinator")
+    worker.add_argument("coordinator", help="host:port of the coordinator (the watcher's --farm)")
+    worker.add_argument("--slots", type=int, default=1, help="scenes rendered in parallel on this node")
+    worker.add_argument("--workdir", help="where sources, caches and partial renders live")
+    worker.add_argument("--name", help="name shown by the coordinator (single slot only)")
+    local = commands.add_parser("local", help="render a file's scenes through a farm of local worker processes")
+    local.add_argument("file")
+    local.add_argument("scenes", nargs="*")
+    local.add_argument("-w", "--workers", type=int, default=2)
+    local.add_argument("--split", type=int, default=1, help="play ranges per scene, joined after rendering")
+    local.add_argument("--quality", default=QUALITY)
+    local.add_argument("--media-dir", default="media")
+    local.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    local.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        if not os.environ.get(TOKEN_ENV):
+            parser.error(f"set {TOKEN_ENV} to the token the coordinator printed")
+        host, port = parse_address(args.coordinator)
+        if args.name and args.slots == 1:
+            slot = FarmWorker((host, port), os.path.join(args.workdir or tempfile.gettempdir(), args.name), args.name)
+            try:
+                slot.run()
+            except KeyboardInterrupt:
+                slot.stop()
+        else:
+            serve_worker((host, port), args.slots, args.workdir)
+        sys.exit(0)
+
+    results, elapsed = run_local(args.file, args.scenes, args.workers, args.split, args.quality, args.media_dir,
+                                 timeout=args.timeout, retries=args.retries)
+    for scene, result in sorted(results.items()):
+        where = ", ".join(sorted(set(result["farm_workers"])))
+        print(f"{'🎬' if result['status'] == 'ok' else '❌'} {scene} ({result['status']}) on {where or '-'}"
+              f" -> {result.get('movie') or result.get('error', '').strip().splitlines()[-1:]}")
+    print(f"⏱ {len(results)} scenes on {args.workers} workers in {elapsed:.2f}s"
+          f" ({len(results) / elapsed:.2f} scenes/s)")
+    sys.exit(0 if all(result["status"] == "ok" for result in results.values()) else 1)
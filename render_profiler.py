@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+import os
+import sys
+import csv
+import time
+import inspect
+import argparse
+import linecache
+import functools
+import tracemalloc
+
+# Opt-in profiler that charges render time to the mobjects that cost it.
+# While a Profiler is active:
+# - every updater registered through Mobject.add_updater, including the one
+#   always_redraw sets up, is wrapped to record its time and allocations,
+#   attributed to the mobject and to the line of the scene file that
+#   registered it;
+# - Camera.display_vectorized is timed per top-level scene mobject.
+# After every play() a CSV report and a folded-stack file (flamegraph.pl,
+# speedscope, inferno) are written to the profile directory. Nothing is
+# patched until install(), and once it is the wrappers reduce to a global
+# check while no Profiler is active.
+#
+# Enable with MANIM_PROFILE=<dir> (or a job's "profile" key), or run
+#     python render_profiler.py scene.py SceneName -o profile/
+# MANIM_PROFILE_ALLOC=0 drops allocation tracking, which costs more than timing.
+
+PROFILE_ENV = "MANIM_PROFILE"
+ALLOC_ENV = "MANIM_PROFILE_ALLOC"
+REPORT_FIELDS = ("kind", "mobject", "site", "code", "calls", "total_ms", "mean_ms", "max_ms", "alloc_kb")
+
+_active = None
+_installed = False
+_SKIPPED = (os.path.abspath(__file__),)
+
+
+class Profiler:
+    def __init__(self, directory, scene_name, alloc=None):
+        self.directory = os.path.join(directory, scene_name)
+        self.scene = scene_name
+        self.alloc = os.environ.get(ALLOC_ENV, "1") != "0" if alloc is None else alloc
+        self.samples = {}
+        self.sites = {}
+        self.owners = {}
+        self.play_index = 0
+        self.written = []
+
+    def __enter__(self):
+        global _active
+        os.makedirs(self.directory, exist_ok=True)
+        if self.alloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _active = self
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+        if self.alloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        if self.written:
+            print(f"🔬 Profile of {self.scene}: {len(self.written)} plays written to {self.directory}")
+        return False
+
+    def record(self, key, elapsed, allocated=0):
+        sample = self.samples.get(key)
+        if sample is None:
+            sample = self.samples[key] = [0, 0.0, 0.0, 0]
+        sample[0] += 1
+        sample[1] += elapsed
+        sample[2] = max(sample[2], elapsed)
+        sample[3] += allocated
+
+    def label(self, mobject):
+        site = self.sites.get(id(mobject))
+        name = type(mobject).__name__
+        return f"{name} ({site[0]})" if site else f"{name}#{id(mobject) % 10000:04d}"
+
+    def begin_play(self, scene):
+        self.samples = {}
+        self.owners = {id(member): top for top in scene.mobjects for member in top.get_family()}
+
+    def end_play(self, scene):
+        names = "+".join(type(animation).__name__ for animation in scene.animations or []) or "wait"
+        stem = os.path.join(self.directory, f"play_{self.play_index:03d}")
+        rows = sorted(self._rows(), key=lambda row: row["total_ms"], reverse=True)
+        with open(stem + ".csv", "w", newline="") as handle:
+            writer = csv.DictWriter(handle, REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        with open(stem + ".folded", "w") as handle:
+            for row in rows:
+                frames = [self.scene, f"play {self.play_index} {names}", row["kind"]]
+                frames += [row["site"], row["mobject"]] if row["site"] else [row["mobject"]]
+                handle.write(";".join(frame.replace(";", ",") for frame in frames)
+                             + f" {max(1, round(row['total_ms'] * 1000))}\n")
+        self.written.append(stem)
+        self.play_index += 1
+
+    def _rows(self):
+        for (kind, mobject, site), (calls, total, worst, allocated) in self.samples.items():
+            yield {
+                "kind": kind,
+                "mobject": mobject,
+                "site": site[0] if site else "",
+                "code": site[1] if site else "",
+                "calls": calls,
+                "total_ms": round(total * 1000, 3),
+                "mean_ms": round(total / calls * 1000, 4),
+                "max_ms": round(worst * 1000, 3),
+                "alloc_kb": round(allocated / 1024, 1),
+            }
+
+
+def _call_site(scene_file):
+    # The registering line in the scene file, else the innermost frame outside
+    # manim and this module. always_redraw is reported as such.
+    def site(frame, filename):
+        return (f"{os.path.basename(filename)}:{frame.f_lineno}",
+                linecache.getline(filename, frame.f_lineno).strip())
+
+    frame = sys._getframe(2)
+    fallback, redraw = None, False
+    while frame is not None:
+        code = frame.f_code
+        filename = os.path.abspath(code.co_filename)
+        if code.co_name == "always_redraw":
+            redraw = True
+        elif filename == scene_file:
+            return site(frame, filename), redraw
+        elif fallback is None and f"{os.sep}manim{os.sep}" not in filename and filename not in _SKIPPED:
+            fallback = site(frame, filename)
+        frame = frame.f_back
+    return fallback, redraw
+
+
+def _wrap(profiler, mobject, function, site, kind):
+    key = (kind, type(mobject).__name__, site)
+
+    def run(*args):
+        if _active is not profiler:
+            return function(*args)
+        before = 0
+        if profiler.alloc:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            # Peak over the call; nested updaters (graph pulls) reset it, so
+            # the outer call's figure can come out low.
+            allocated = tracemalloc.get_traced_memory()[1] - before if profiler.alloc else 0
+            profiler.record(key, elapsed, max(0, allocated))
+
+    # Mobject.update decides whether to pass dt from the parameter names.
+    if "dt" in _parameters(function):
+        wrapper = lambda mobject, dt: run(mobject, dt)  # noqa: E731
+    else:
+        wrapper = lambda mobject: run(mobject)  # noqa: E731
+    wrapper.profiled_function = function
+    return wrapper
+
+
+def _parameters(function):
+    try:
+        return inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return {}
+
+
+def install():
+    global _installed
+    if _installed:
+        return
+    from manim import Mobject, config
+    from manim.camera.camera import Camera
+    from manim.renderer.cairo_renderer import CairoRenderer
+
+    original_add_updater = Mobject.add_updater
+    original_remove_updater = Mobject.remove_updater
+    original_display = Camera.display_vectorized
+    original_play = CairoRenderer.play
+
+    @functools.wraps(original_add_updater)
+    def add_updater(self, update_function, index=None, call_updater=False):
+        profiler = _active
+        if profiler is not None and not hasattr(update_function, "profiled_function"):
+            scene_file = os.path.abspath(str(config.input_file)) if config.input_file else None
+            site, redraw = _call_site(scene_file)
+            profiler.sites.setdefault(id(self), site)
+            update_function = _wrap(profiler, self, update_function, site,
+                                    "always_redraw" if redraw else "updater")
+        return original_add_updater(self, update_function, index, call_updater)
+
+    @functools.wraps(original_remove_updater)
+    def remove_updater(self, update_function):
+        # Callers hold the function they registered, not our wrapper.
+        for updater in [u for u in self.updaters if getattr(u, "profiled_function", None) is update_function]:
+            original_remove_updater(self, updater)
+        return original_remove_updater(self, update_function)
+
+    @functools.wraps(original_display)
+    def display_vectorized(self, vmobject, ctx):
+        profiler = _active
+        if profiler is None:
+            return original_display(self, vmobject, ctx)
+        started = time.perf_counter()
+        try:
+            return original_display(self, vmobject, ctx)
+        finally:
+            owner = profiler.owners.get(id(vmobject), vmobject)
+            profiler.record(("raster", profiler.label(owner), None), time.perf_counter() - started)
+
+    @functools.wraps(original_play)
+    def play(self, scene, *args, **kwargs):
+        profiler = _active
+        if profiler is None:
+            return original_play(self, scene, *args, **kwargs)
+        profiler.begin_play(scene)
+        try:
+            return original_play(self, scene, *args, **kwargs)
+        finally:
+            profiler.end_play(scene)
+
+    Mobject.add_updater = add_updater
+    Mobject.remove_updater = remove_updater
+    Camera.display_vectorized = display_vectorized
+    CairoRenderer.play = play
+    _installed = True
+
+
+def requested(job=None):
+    # Profile directory asked for by the job or the environment, if any.
+    return (job or {}).get("profile") or os.environ.get(PROFILE_ENV) or None
+
+
+def top_rows(directory, limit=10):
+    # Heaviest rows over every play report in a scene's profile directory.
+    rows = []
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".csv"):
+            with open(os.path.join(directory, name), newline="") as handle:
+                for row in csv.DictReader(handle):
+                    row["play"] = name[len("play_"):-len(".csv")]
+                    rows.append(row)
+    return sorted(rows, key=lambda row: float(row["total_ms"]), reverse=True)[:limit]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a scene with the mobject profiler and print the hot spots.")
+    parser.add_argument("file")
+    parser.add_argument("scenes", nargs="*")
+    parser.add_argument("-o", "--output", default=os.path.join("media", "profiles"))
+    parser.add_argument("--no-alloc", action="store_true", help="skip allocation tracking (lower overhead)")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    if args.no_alloc:
+        os.environ[ALLOC_ENV] = "0"
+
+    import render_worker
+
+    outcome = render_worker.run_job({"file": args.file, "scenes": args.scenes or None, "preview": False,
+                                     "profile": os.path.abspath(args.output)})
+    if outcome["status"] != "ok":
+        print(outcome.get("error", ""))
+        sys.exit(1)
+    for scene in outcome["scenes"]:
+        directory = os.path.join(args.output, scene)
+        print(f"🔬 {scene}: reports in {directory}")
+        for row in top_rows(directory, args.top):
+            print(f"   play {row['play']} {row['kind']:<13} {float(row['total_ms']):9.2f} ms"
+                  f" {int(row['calls']):>6} calls {float(row['alloc_kb']):9.1f} KiB  {row['mobject']}"
+                  + (f"  {row['site']}: {row['code']}" if row["code"] else ""))
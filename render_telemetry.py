@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import functools
+import threading
+
+try:
+    import resource
+except ImportError:
+    # Windows: peak RSS is only read from /proc, which isn't there either.
+    resource = None
+
+HISTORY_FILE = "render_history.jsonl"
+
+_active = None
+_installed = False
+
+
+def _reset_peak_rss():
+    # Linux lets a process reset its own high-water mark, which makes the peak
+    # RSS of a warm worker meaningful per job instead of per process lifetime.
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if resource is None:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class SceneMetrics:
+    def __init__(self, scene_name):
+        self.scene = scene_name
+        self.module_load_s = 0.0
+        self.plays = []
+        self.frames_rendered = 0
+        self.frames_cached = 0
+        self.frames_elided = 0
+        self.segment_cache_hits = 0
+        self.segment_cache_misses = 0
+        self.frame_write_s = 0.0
+        self.combine_s = 0.0
+        self.render_s = 0.0
+        self.peak_rss_mb = 0.0
+
+    def __enter__(self):
+        global _active
+        _reset_peak_rss()
+        self._started = time.perf_counter()
+        _active = self
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+        self.render_s = time.perf_counter() - self._started
+        self.peak_rss_mb = round(_peak_rss_mb(), 1)
+        return False
+
+    def as_dict(self):
+        return {
+            "scene": self.scene,
+            "module_load_s": round(self.module_load_s, 4),
+            "render_s": round(self.render_s, 4),
+            "plays": self.plays,
+            "frames_rendered": self.frames_rendered,
+            "frames_cached": self.frames_cached,
+            "frames_elided": self.frames_elided,
+            "segment_cache_hits": self.segment_cache_hits,
+            "segment_cache_misses": self.segment_cache_misses,
+            "frame_write_s": round(self.frame_write_s, 4),
+            "combine_s": round(self.combine_s, 4),
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+
+
+def active_metrics():
+    return _active
+
+
+def install():
+    # Wraps the renderer entry points once per worker process. The wrappers are
+    # no-ops apart from a global check while no SceneMetrics is active.
+    global _installed
+    if _installed:
+        return
+    from manim.renderer.cairo_renderer import CairoRenderer
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    original_play = CairoRenderer.play
+    original_add_frame = CairoRenderer.add_frame
+    original_finish = SceneFileWriter.finish
+
+    @functools.wraps(original_play)
+    def play(self, scene, *args, **kwargs):
+        metrics = _active
+        if metrics is None:
+            return original_play(self, scene, *args, **kwargs)
+        graph = getattr(scene, "updater_graph", None)
+        before = graph.totals() if graph is not None else None
+        started = time.perf_counter()
+        original_play(self, scene, *args, **kwargs)
+        cached = bool(self.animations_hashes) and self.animations_hashes[-1] is not None and self.skip_animations
+        frames = int(round(scene.duration * self.camera.frame_rate))
+        if cached:
+            metrics.frames_cached += frames
+        metrics.plays.append({
+            "index": len(metrics.plays),
+            "animations": [type(animation).__name__ for animation in scene.animations or []],
+            "duration_s": round(time.perf_counter() - started, 4),
+            "frames": frames,
+            "cached": cached,
+        })
+        if graph is not None:
+            after = graph.totals()
+            metrics.plays[-1]["updaters"] = {key: after[key] - before[key] for key in after}
+
+    @functools.wraps(original_add_frame)
+    def add_frame(self, frame, num_frames=1):
+        metrics = _active
+        if metrics is None or self.skip_animations:
+            return original_add_frame(self, frame, num_frames)
+        started = time.perf_counter()
+        original_add_frame(self, frame, num_frames)
+        metrics.frame_write_s += time.perf_counter() - started
+        metrics.frames_rendered += num_frames
+
+    @functools.wraps(original_finish)
+    def finish(self, *args, **kwargs):
+        metrics = _active
+        started = time.perf_counter()
+        try:
+            return original_finish(self, *args, **kwargs)
+        finally:
+            if metrics is not None:
+                metrics.combine_s += time.perf_counter() - started
+
+    CairoRenderer.play = play
+    CairoRenderer.add_frame = add_frame
+    SceneFileWriter.finish = finish
+    _installed = True
+
+
+def git_revision(root):
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=root, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def job_record(job, result, worker_info, revision=None):
+    record = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": revision,
+        "job": job.get("id"),
+        "file": os.path.basename(job["file"]),
+        "scenes": job.get("scenes"),
+        "status": result["status"],
+        "worker_startup_s": round(worker_info["startup_time"], 4) if worker_info else None,
+        "worker_import_s": round(worker_info["import_time"], 4) if worker_info else None,
+        "warm": result.get("warm"),
+    }
+    if "started_at" in result and "event_time" in job:
+        record["event_to_start_s"] = round(result["started_at"] - job["event_time"], 4)
+    record["metrics"] = result.get("metrics", [])
+    return record
+
+
+class HistoryLog:
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def append(self, record):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+
+def format_summary(record, slowest=3):
+    lines = []
+    latency = record.get("event_to_start_s")
+    if record.get("warm"):
+        startup = "warm"
+    else:
+        startup = f"cold: startup {record.get('worker_startup_s') or 0:.2f}s + import {record.get('worker_import_s') or 0:.2f}s"
+    for metrics in record["metrics"]:
+        plays = metrics["plays"]
+        play_time = sum(play["duration_s"] for play in plays)
+        lines.append(
+            f"   ⏱ {metrics['scene']}: latency {latency if latency is not None else float('nan'):.2f}s"
+            f" | {startup} | load {metrics['module_load_s']:.2f}s"
+            f" | {len(plays)} plays {play_time:.2f}s"
+            f" | frames {metrics['frames_rendered']} rendered / {metrics['frames_cached']} cached"
+            f" / {metrics.get('frames_elided', 0)} elided"
+            f" | segments {metrics.get('segment_cache_hits', 0)} hit / {metrics.get('segment_cache_misses', 0)} miss"
+            f" | write {metrics['frame_write_s']:.2f}s + combine {metrics['combine_s']:.2f}s"
+            f" | peak RSS {metrics['peak_rss_mb']:.0f} MB | {record['status']}"
+        )
+        for play in sorted(plays, key=lambda p: p["duration_s"], reverse=True)[:slowest]:
+            names = ", ".join(play["animations"]) or "-"
+            updaters = play.get("updaters")
+            counts = f"  (updaters {updaters['calls']} run / {updaters['skipped']} skipped)" if updaters else ""
+            lines.append(f"      play {play['index']:>3}: {play['duration_s']:.3f}s  {names}{counts}")
+    return "\n".join(lines)
+
+
+def history_table(path, scene=None, last=10):
+    rows = []
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            for metrics in record.get("metrics", []):
+                if scene is None or metrics["scene"] == scene:
+                    rows.append((record, metrics))
+    rows = rows[-last:]
+    header = f"{'time':<20} {'commit':<9} {'scene':<28} {'status':<8} {'render':>8} {'plays':>6} {'rendered':>9} {'cached':>7} {'rss MB':>7}"
+    lines = [header, "-" * len(header)]
+    for record, metrics in rows:
+        lines.append(
+            f"{record['time']:<20} {record.get('commit') or '-':<9} {metrics['scene']:<28} {record['status']:<8} {metrics['render_s']:>7.2f}s"
+            f" {len(metrics['plays']):>6} {metrics['frames_rendered']:>9} {metrics['frames_cached']:>7}"
+            f" {metrics['peak_rss_mb']:>7.0f}"
+        )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize the watcher's render history log.")
+    parser.add_argument("log", nargs="?", default=os.path.join("media", HISTORY_FILE))
+    parser.add_argument("--scene")
+    parser.add_argument("--last", type=int, default=10)
+    args = parser.parse_args()
+    if not os.path.exists(args.log):
+        print(f"No render history at {args.log}")
+        sys.exit(1)
+    print(history_table(args.log, args.scene, args.last))
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+import io
+import os
+import sys
+import time
+import inspect
+import importlib.util
+import multiprocessing
+import threading
+import traceback
+import contextlib
+import render_telemetry
+import frame_elision
+import render_cache
+import asset_cache
+import render_profiler
+import preview_server
+
+QUALITY = "low_quality"
+MOVIE_EXTENSIONS = (".mp4", ".mov", ".webm", ".gif")
+# The worker's own instrumentation sits next to the scenes but survives the
+# purge: a fresh copy would patch manim again and lose the active job state.
+TOOLING_MODULES = {"render_worker", "render_telemetry", "frame_elision", "render_cache", "asset_cache",
+                   "render_profiler", "preview_server"}
+
+
+def _purge_user_modules(root):
+    # Helper modules under the watched root are reloaded with the scene file,
+    # so edits to them are picked up without restarting the worker.
+    root = os.path.abspath(root) + os.sep
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None)
+        if name in TOOLING_MODULES:
+            continue
+        if module_file and os.path.abspath(module_file).startswith(root):
+            del sys.modules[name]
+
+
+def load_scene_module(file_path, root=None):
+    file_path = os.path.abspath(file_path)
+    scene_dir = os.path.dirname(file_path)
+    _purge_user_modules(root or scene_dir)
+    for path in filter(None, (root, scene_dir)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    module_name = os.path.splitext(os.path.basename(file_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def scene_classes(module):
+    from manim import Scene
+
+    return [
+        obj for _, obj in inspect.getmembers(module, inspect.isclass)
+        if issubclass(obj, Scene) and obj is not Scene and obj.__module__ == module.__name__
+    ]
+
+
+def rendered_movie(media_dir, scenes):
+    # Newest movie manim wrote for any of the scenes under media_dir, if any.
+    names = {f"{scene}{extension}" for scene in scenes for extension in MOVIE_EXTENSIONS}
+    movies = [os.path.join(directory, name) for directory, _, files in os.walk(os.path.join(media_dir, "videos"))
+              for name in files if name in names]
+    return max(movies, key=os.path.getmtime, default=None)
+
+
+def run_job(job):
+    if job.get("capture_output"):
+        # Pooled jobs run concurrently; their output is returned with the result
+        # so the watcher can print each job as one contiguous block.
+        buffer = io.StringIO()
+        with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+            result = _run_job(job)
+        result["output"] = buffer.getvalue()
+        return result
+    return _run_job(job)
+
+
+def _run_job(job):
+    from manim import tempconfig
+
+    file_path = job["file"]
+    result = {"id": job.get("id"), "file": file_path, "scenes": [], "status": "ok",
+              "started_at": time.time(), "metrics": []}
+    cache = job.get("cache")
+    segments = render_cache.RenderCache(cache["directory"], cache["max_bytes"]) if cache else None
+    render_cache.use(segments)
+    profile_dir = render_profiler.requested(job)
+    if profile_dir:
+        render_profiler.install()
+    assets = job.get("assets")
+    asset_store = asset_cache.AssetStore(assets["directory"], assets["max_bytes"]) if assets else None
+    asset_cache.use(asset_store)
+    try:
+        started = time.perf_counter()
+        module = load_scene_module(file_path, job.get("root"))
+        module_load_s = time.perf_counter() - started
+        classes = scene_classes(module)
+        if job.get("scenes") is not None:
+            classes = [cls for cls in classes if cls.__name__ in job["scenes"]]
+        for scene_class in classes:
+            options = {"quality": job.get("quality", QUALITY), "input_file": file_path}
+            options.update(job.get("config", {}))
+            metrics = render_telemetry.SceneMetrics(scene_class.__name__)
+            metrics.module_load_s = module_load_s
+            profiler = (render_profiler.Profiler(profile_dir, scene_class.__name__) if profile_dir
+                        else contextlib.nullcontext())
+            preview_server.use(job.get("stream"), scene_class.__name__)
+            try:
+                with metrics, profiler, tempconfig(options):
+                    scene_class().render(preview=job.get("preview", True))
+            finally:
+                result["metrics"].append(metrics.as_dict())
+            result["scenes"].append(scene_class.__name__)
+    except Exception:
+        result["status"] = "error"
+        result["error"] = traceback.format_exc()
+    finally:
+        # The stores are walked for eviction once per job, not on every write.
+        for store in filter(None, (segments, asset_store)):
+            store.evict()
+    return result
+
+
+def serve(conn, spawned_at):
+    startup_time = time.time() - spawned_at
+    started = time.perf_counter()
+    import manim  # noqa: F401 -- paid once per worker, not once per render
+    render_telemetry.install()
+    frame_elision.install()
+    render_cache.install()
+    asset_cache.install()
+    preview_server.install()
+    conn.send({"type": "ready", "startup_time": startup_time, "import_time": time.perf_counter() - started})
+    served = 0
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        result = run_job(job)
+        result["warm"] = served > 0
+        served += 1
+        conn.send(result)
+
+
+class WarmRenderWorker:
+    def __init__(self):
+        self._context = multiprocessing.get_context("spawn")
+        self.process = None
+        self.conn = None
+        self.ready_info = None
+        self._cancelled = None
+
+    def start(self):
+        parent_conn, child_conn = self._context.Pipe()
+        self.process = self._context.Process(target=serve, args=(child_conn, time.time()), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.ready_info = None
+        # One per process, so a cancel followed by start() can't be mistaken
+        # for a crash of the new process or the other way around.
+        self._cancelled = threading.Event()
+
+    def is_alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def render(self, job):
+        if not self.is_alive():
+            self.start()
+        conn, process, cancelled = self.conn, self.process, self._cancelled
+        try:
+            if self.ready_info is None:
+                self.ready_info = conn.recv()
+            conn.send(job)
+            result = conn.recv()
+        except (EOFError, OSError):
+            if cancelled.is_set():
+                return {"id": job.get("id"), "file": job["file"], "scenes": [], "status": "cancelled"}
+            # Nobody asked it to stop: a crash, the OOM killer or a signal from
+            # outside. Flagged, since unlike a scene error it may not happen again.
+            process.join(timeout=5)
+            self._shutdown()
+            return {"id": job.get("id"), "file": job["file"], "scenes": [], "status": "error", "crashed": True,
+                    "error": f"render worker died (exit code {process.exitcode})"}
+        result["worker"] = self.ready_info
+        return result
+
+    def terminate(self):
+        # Cancels the job in flight, which render() then reports as cancelled.
+        if self._cancelled is not None:
+            self._cancelled.set()
+        self._shutdown()
+
+    def _shutdown(self):
+        process, conn = self.process, self.conn
+        self.process = None
+        self.conn = None
+        self.ready_info = None
+        if process is not None and process.is_alive():
+            process.terminate()
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+        if conn is not None:
+            conn.close()
+
+    def stop(self):
+        if self.is_alive():
+            try:
+                self.conn.send(None)
+                self.process.join(timeout=5)
+            except OSError:
+                pass
+        self.terminate()
+
+
+if __name__ == "__main__":
+    # One-shot usage: python render_worker.py scene_file.py [SceneName ...]
+    import manim  # noqa: F401
+    render_telemetry.install()
+    frame_elision.install()
+    scenes = sys.argv[2:] or None
+    outcome = run_job({"file": sys.argv[1], "scenes": scenes, "preview": False})
+    if outcome["status"] != "ok":
+        print(outcome.get("error", ""))
+        sys.exit(1)
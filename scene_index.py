@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+import os
+import ast
+import json
+import hashlib
+import threading
+
+INDEX_FILE = ".scene_hashes.json"
+MANIM_SCENE_BASES = {
+    "Scene",
+    "MovingCameraScene",
+    "ThreeDScene",
+    "SpecialThreeDScene",
+    "ZoomedScene",
+    "VectorScene",
+    "LinearTransformationScene",
+}
+
+
+def _base_names(class_node):
+    names = []
+    for base in class_node.bases:
+        if isinstance(base, ast.Name):
+            names.append(base.id)
+        elif isinstance(base, ast.Attribute):
+            names.append(base.attr)
+    return names
+
+
+def _module_definitions(tree):
+    definitions = {}
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            definitions[node.name] = node
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name in ast.walk(target):
+                    if isinstance(name, ast.Name):
+                        definitions[name.id] = node
+    return definitions
+
+
+def find_scene_classes(tree):
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    scenes = {}
+
+    def is_scene(name, seen=()):
+        if name in MANIM_SCENE_BASES:
+            return True
+        node = classes.get(name)
+        if node is None or name in seen:
+            return False
+        return any(is_scene(base, seen + (name,)) for base in _base_names(node))
+
+    for name, node in classes.items():
+        if any(is_scene(base) for base in _base_names(node)):
+            scenes[name] = node
+    return scenes
+
+
+def _dependency_closure(node, definitions):
+    # Module-level helpers and base classes reachable from the class body are part
+    # of its hash, so editing a shared helper re-renders every scene that uses it.
+    seen = {}
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen[id(current)] = current
+        for child in ast.walk(current):
+            if isinstance(child, ast.Name) and child.id in definitions:
+                pending.append(definitions[child.id])
+    return list(seen.values())
+
+
+def scene_hashes(source):
+    tree = ast.parse(source)
+    definitions = _module_definitions(tree)
+    imports = [ast.dump(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    hashes = {}
+    for name, node in find_scene_classes(tree).items():
+        digest = hashlib.sha256()
+        for statement in imports:
+            digest.update(statement.encode())
+        for dependency in sorted(ast.dump(n) for n in _dependency_closure(node, definitions)):
+            digest.update(dependency.encode())
+        hashes[name] = digest.hexdigest()
+    return hashes
+
+
+class SceneIndex:
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, INDEX_FILE)
+        self._lock = threading.Lock()
+        self._entries = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def _key(self, file_path):
+        return os.path.relpath(os.path.abspath(file_path), self.root)
+
+    def changed_scenes(self, file_path, force=False):
+        # Returns {scene name: hash} for scenes whose hash differs from the last
+        # successful render (every scene when forced). SyntaxError propagates.
+        try:
+            with open(file_path, encoding="utf-8") as f:
+                current = scene_hashes(f.read())
+        except OSError:
+            return {}
+        if force:
+            return current
+        with self._lock:
+            rendered = self._entries.get(self._key(file_path), {})
+        return {name: digest for name, digest in current.items() if rendered.get(name) != digest}
+
+    def mark_rendered(self, file_path, hashes):
+        with self._lock:
+            self._entries.setdefault(self._key(file_path), {}).update(hashes)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
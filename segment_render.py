@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from render_worker import QUALITY, load_scene_module
+
+# Renders one long Scene on several cores. A dry run with every play skipped
+# records each play's duration; the plays are then split into contiguous,
+# duration-balanced ranges and every range renders in its own process through
+# manim's from_animation_number/upto_animation_number. Skipped plays still run
+# construct() up to the range start, which restores the exact scene state at
+# that boundary without rasterizing anything. The per-range movies are
+# remuxed, not re-encoded, into one file.
+#
+# Updaters that take ``dt`` only see one step per skipped play, so scenes that
+# rely on them can drift between ranges; --verify catches that.
+
+
+def _scene(file_path, scene_name, root):
+    module = load_scene_module(file_path, root)
+    return getattr(module, scene_name)
+
+
+def _dry_run(file_path, scene_name, root):
+    from manim import tempconfig
+    from manim.renderer.cairo_renderer import CairoRenderer
+
+    durations = []
+    original_play = CairoRenderer.play
+
+    def play(self, scene, *args, **kwargs):
+        original_play(self, scene, *args, **kwargs)
+        durations.append(scene.duration)
+
+    CairoRenderer.play = play
+    try:
+        scene_class = _scene(file_path, scene_name, root)
+        with tempconfig({"quality": QUALITY, "dry_run": True, "from_animation_number": sys.maxsize,
+                         "input_file": file_path, "progress_bar": "none"}):
+            scene_class().render()
+    finally:
+        CairoRenderer.play = original_play
+    return durations
+
+
+def _render_range(file_path, scene_name, root, media_dir, first=0, last=-1):
+    from manim import tempconfig
+
+    scene_class = _scene(file_path, scene_name, root)
+    started = time.perf_counter()
+    with tempconfig({"quality": QUALITY, "media_dir": media_dir, "input_file": file_path, "progress_bar": "none",
+                     "from_animation_number": first, "upto_animation_number": last}):
+        scene = scene_class()
+        scene.render()
+    return str(scene.renderer.file_writer.movie_file_path), time.perf_counter() - started
+
+
+def partition(durations, parts):
+    # Contiguous play ranges [first, last] with roughly equal total duration;
+    # each cut goes on whichever side of a play lands closer to its boundary.
+    parts = max(1, min(parts, len(durations)))
+    target = sum(durations) / parts
+    ranges, first, total = [], 0, 0.0
+    for index, duration in enumerate(durations):
+        total += duration
+        while len(ranges) < parts - 1:
+            boundary = target * (len(ranges) + 1)
+            must_cut = len(durations) - index - 1 == parts - len(ranges) - 1
+            if total < boundary and not must_cut:
+                break
+            if index > first and total - boundary > boundary - (total - duration) and not must_cut:
+                ranges.append((first, index - 1))
+                first = index
+            else:
+                ranges.append((first, index))
+                first = index + 1
+                break
+    ranges.append((first, len(durations) - 1))
+    return ranges
+
+
+def concat_movies(movie_files, output_file):
+    # The same concat-demuxer stream copy manim uses to join partial movies,
+    # so the frames are the encoded packets of the ranges, untouched.
+    import io
+    import av
+
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    manifest = io.BytesIO("".join(f"file 'file:{os.path.abspath(f)}'\n" for f in movie_files).encode())
+    source = av.open(manifest, format="concat", options={"safe": "0", "an": "1"})
+    source_stream = source.streams.video[0]
+    output = av.open(output_file, mode="w")
+    stream = output.add_stream_from_template(template=source_stream)
+    for packet in source.demux(source_stream):
+        if packet.dts is None:
+            continue
+        packet.dts = None
+        packet.stream = stream
+        output.mux(packet)
+    source.close()
+    output.close()
+
+
+def frame_digests(movie_file):
+    import av
+
+    with av.open(movie_file) as container:
+        return [hashlib.md5(frame.to_ndarray().tobytes()).hexdigest() for frame in container.decode(video=0)]
+
+
+def render_segmented(file_path, scene_name, workers, media_dir="media", root=None):
+    file_path = os.path.abspath(file_path)
+    root = os.path.abspath(root or os.path.dirname(file_path))
+    context = multiprocessing.get_context("spawn")
+    report = {"scene": scene_name, "workers": workers}
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        durations = pool.submit(_dry_run, file_path, scene_name, root).result()
+        report["dry_run_s"] = time.perf_counter() - started
+        ranges = partition(durations, workers)
+        os.makedirs(media_dir, exist_ok=True)
+        scratch = tempfile.mkdtemp(prefix="segments-", dir=media_dir)
+        try:
+            futures = [
+                pool.submit(_render_range, file_path, scene_name, root, os.path.join(scratch, f"range_{k}"), first, last)
+                for k, (first, last) in enumerate(ranges)
+            ]
+            results = [future.result() for future in futures]
+            movie_files = [movie for movie, _ in results]
+            relative = os.path.relpath(movie_files[0], os.path.join(scratch, "range_0"))
+            output_file = os.path.join(os.path.abspath(media_dir), relative)
+            concat_movies(movie_files, output_file)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+    report.update(plays=len(durations), ranges=ranges, range_s=[elapsed for _, elapsed in results],
+                  output=output_file, total_s=time.perf_counter() - started)
+    return report
+
+
+def render_serial(file_path, scene_name, media_dir, root=None):
+    file_path = os.path.abspath(file_path)
+    root = os.path.abspath(root or os.path.dirname(file_path))
+    context = multiprocessing.get_context("spawn")
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        movie_file, _ = pool.submit(_render_range, file_path, scene_name, root, os.path.abspath(media_dir)).result()
+    return movie_file, time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render one Scene in parallel play ranges and join the movies.")
+    parser.add_argument("file")
+    parser.add_argument("scene")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--media-dir", default="media")
+    parser.add_argument("--verify", action="store_true", help="also render serially and compare every frame")
+    parser.add_argument("--benchmark", help="comma-separated worker counts to time, e.g. 1,2,4,8")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        with tempfile.TemporaryDirectory() as serial_dir:
+            _, serial_s = render_serial(args.file, args.scene, serial_dir)
+        print(f"serial: {serial_s:.2f}s")
+        for workers in [int(w) for w in args.benchmark.split(",")]:
+            report = render_segmented(args.file, args.scene, workers, args.media_dir)
+            print(f"{workers:>3} workers: {report['total_s']:.2f}s ({serial_s / report['total_s']:.2f}x)"
+                  f" | dry run {report['dry_run_s']:.2f}s | slowest range {max(report['range_s']):.2f}s")
+        sys.exit(0)
+
+    report = render_segmented(args.file, args.scene, args.workers, args.media_dir)
+    print(f"🎬 {args.scene}: {report['plays']} plays in {len(report['ranges'])} ranges {report['ranges']}"
+          f" -> {report['output']} ({report['total_s']:.2f}s)")
+    if args.verify:
+        with tempfile.TemporaryDirectory() as serial_dir:
+            serial_file, serial_s = render_serial(args.file, args.scene, serial_dir)
+            serial, segmented = frame_digests(serial_file), frame_digests(report["output"])
+        mismatch = next((i for i, (a, b) in enumerate(zip(serial, segmented)) if a != b), None)
+        if len(serial) == len(segmented) and mismatch is None:
+            print(f"✅ {len(serial)} frames identical to the serial render ({serial_s:.2f}s serial)")
+        else:
+            print(f"❌ serial {len(serial)} frames, segmented {len(segmented)} frames, first mismatch at {mismatch}")
+            sys.exit(1)
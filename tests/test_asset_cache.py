@@ -0,0 +1,46 @@
+import shutil
+
+import numpy as np
+import pytest
+
+manim = pytest.importorskip("manim")
+
+import asset_cache
+from asset_cache import AssetStore
+
+
+def _build(make, store):
+    asset_cache.use(store)
+    try:
+        return make()
+    finally:
+        asset_cache.use(None)
+
+
+@pytest.fixture
+def store(tmp_path):
+    asset_cache.install()
+    with manim.tempconfig({"media_dir": str(tmp_path / "media"), "verbosity": "ERROR"}):
+        yield AssetStore(str(tmp_path / "store"))
+
+
+@pytest.mark.parametrize("make", [
+    lambda: manim.Text("cached 42", color=manim.BLUE, stroke_width=1),
+    pytest.param(lambda: manim.MathTex(r"\frac{a}{b}", "=", "x^2", color=manim.RED),
+                 marks=pytest.mark.skipif(shutil.which("latex") is None, reason="needs LaTeX")),
+])
+def test_cached_svg_matches_a_fresh_parse(store, make):
+    uncached = _build(make, None)
+    _build(make, store)
+    assert store.stats["stored"] >= 1
+    cached = _build(make, store)
+    assert store.stats["hits"] >= 1
+
+    fresh, restored = uncached.family_members_with_points(), cached.family_members_with_points()
+    assert [type(m) for m in restored] == [type(m) for m in fresh]
+    for a, b in zip(fresh, restored):
+        np.testing.assert_allclose(b.points, a.points)
+        np.testing.assert_allclose(b.fill_rgbas, a.fill_rgbas)
+        np.testing.assert_allclose(b.stroke_rgbas, a.stroke_rgbas)
+        np.testing.assert_allclose(b.background_stroke_rgbas, a.background_stroke_rgbas)
+        assert b.stroke_width == a.stroke_width
@@ -0,0 +1,62 @@
+import os
+import shutil
+
+import pytest
+
+import render_cache
+from render_cache import RenderCache
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RenderCache(str(tmp_path / "store"), max_bytes=2500)
+
+
+def test_fetch_places_a_stored_segment(cache, tmp_path):
+    source = str(tmp_path / "job" / "ab12.mp4")
+    _write(source, b"segment")
+    cache.store("ab12.mp4", source)
+    target = str(tmp_path / "other" / "ab12.mp4")
+    assert cache.fetch("ab12.mp4", target)
+    with open(target, "rb") as f:
+        assert f.read() == b"segment"
+    # A copy, not a link: evicting the entry frees its bytes.
+    assert os.stat(target).st_nlink == 1
+    assert not cache.fetch("cd34.mp4", str(tmp_path / "other" / "cd34.mp4"))
+    assert cache.stats == {"hits": 1, "misses": 1, "stored": 1, "evicted": 0}
+
+
+def test_interrupted_fetch_leaves_nothing_at_the_target(cache, tmp_path, monkeypatch):
+    source = str(tmp_path / "job" / "ab12.mp4")
+    _write(source, b"segment" * 100)
+    cache.store("ab12.mp4", source)
+
+    def copy_then_fail(src, dst):
+        with open(dst, "wb") as f:
+            f.write(b"seg")
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(render_cache, "fcntl", None)
+    monkeypatch.setattr(shutil, "copy2", copy_then_fail)
+    target = tmp_path / "partial" / "ab12.mp4"
+    assert not cache.fetch("ab12.mp4", str(target))
+    assert os.listdir(target.parent) == []
+
+
+def test_evict_trims_least_recently_used_entries(cache, tmp_path):
+    for k in range(4):
+        source = str(tmp_path / "job" / f"ab{k}.mp4")
+        _write(source, bytes(1000))
+        cache.store(f"ab{k}.mp4", source)
+        os.utime(cache._path(f"ab{k}.mp4"), (k, k))
+    # store() leaves trimming to the end of the job.
+    assert len(cache.entries()) == 4
+    cache.evict()
+    assert [os.path.basename(path) for _, _, path in cache.entries()] == ["ab2.mp4", "ab3.mp4"]
+    assert cache.stats["evicted"] == 2
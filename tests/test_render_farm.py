@@ -0,0 +1,68 @@
+import os
+import queue
+import signal
+import threading
+import time
+
+import render_worker
+from import_graph import ImportGraph
+from render_farm import FarmWorker, RenderFarm
+
+
+def _fake_serve(conn, spawned_at):
+    # Stands in for render_worker.serve in the spawned render process: the
+    # first attempt at a job hangs until it's killed, later ones "render".
+    conn.send({"pid": os.getpid(), "startup_s": 0.0})
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        marker = os.path.join(os.path.dirname(job["root"]), "first_attempt")
+        if not os.path.exists(marker):
+            with open(marker, "w") as f:
+                f.write(str(os.getpid()))
+            time.sleep(60)
+        movie = os.path.join(job["config"]["media_dir"], "videos", "scene", "480p15", f"{job['scenes'][0]}.mp4")
+        os.makedirs(os.path.dirname(movie))
+        with open(movie, "wb") as f:
+            f.write(b"movie")
+        conn.send({"id": job["id"], "file": job["file"], "scenes": list(job["scenes"]), "status": "ok",
+                   "started_at": time.time(), "metrics": [], "output": ""})
+
+
+def _wait_for(path, timeout=30.0):
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        assert time.time() < deadline, f"{path} never appeared"
+        time.sleep(0.05)
+
+
+def test_killed_render_process_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(render_worker, "serve", _fake_serve)
+    root = tmp_path / "project"
+    root.mkdir()
+    scene = root / "scene.py"
+    scene.write_text("from manim import Scene\n\n\nclass S(Scene):\n    pass\n")
+    graph = ImportGraph(str(root))
+    graph.scan()
+    farm = RenderFarm(("127.0.0.1", 0), graph, timeout=60, retries=1, token="secret")
+    farm.start()
+    slot = tmp_path / "slot"
+    worker = FarmWorker(farm.address, str(slot), "slot", token="secret")
+    threading.Thread(target=worker.run, daemon=True).start()
+    results = queue.Queue()
+    try:
+        farm.submit({"id": 1, "file": str(scene), "root": str(root), "scenes": ["S"],
+                     "config": {"media_dir": str(tmp_path / "media")}}, lambda job, result: results.put(result))
+        marker = slot / "first_attempt"
+        _wait_for(str(marker))
+        time.sleep(0.2)
+        os.kill(int(marker.read_text()), signal.SIGKILL)
+        result = results.get(timeout=60)
+    finally:
+        farm.stop()
+        worker.stop()
+    assert result["status"] == "ok", result.get("error")
+    assert result["farm_workers"] == ["slot"]
+    with open(result["movie"], "rb") as f:
+        assert f.read() == b"movie"
@@ -0,0 +1,159 @@
+import os
+import time
+import threading
+
+import pytest
+
+from watch_filters import HAS_INOTIFY, IgnoreRules, InotifyWatcher, PollingWatcher
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+        self._condition = threading.Condition()
+
+    def dispatch(self, event):
+        with self._condition:
+            self.events.append(event)
+            self._condition.notify_all()
+
+    def seen(self, event_type, path, timeout=5.0):
+        def found():
+            return any(e.event_type == event_type and path in (e.src_path, getattr(e, "dest_path", None))
+                       for e in self.events)
+
+        with self._condition:
+            return self._condition.wait_for(found, timeout)
+
+    def paths(self):
+        return {e.src_path for e in self.events}
+
+
+def write(path, text="x = 1\n"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = str(tmp_path)
+    write(os.path.join(root, ".gitignore"), "# comment\n\nbuild/\n/generated/*.py\n*.tmp\n!keep.tmp\n")
+    for name in ("scene.py", "pkg/helper.py", "media/videos/x.py", "build/out.py", "generated/a.py",
+                 "sub/generated/b.py", "__pycache__/c.py", ".git/d.py", "notes.tmp", "keep.tmp"):
+        write(os.path.join(root, name))
+    return root
+
+
+def test_ignore_rules_defaults_and_gitignore(tree):
+    rules = IgnoreRules(tree)
+    ignored = {name: rules.is_ignored(os.path.join(tree, name)) for name in (
+        "scene.py", "pkg/helper.py", "media/videos/x.py", "build/out.py", "generated/a.py",
+        "sub/generated/b.py", "__pycache__/c.py", ".git/d.py", "notes.tmp", "keep.tmp")}
+    assert ignored == {
+        "scene.py": False, "pkg/helper.py": False, "media/videos/x.py": True, "build/out.py": True,
+        # Patterns with a "/" are anchored at the root.
+        "generated/a.py": True, "sub/generated/b.py": False,
+        "__pycache__/c.py": True, ".git/d.py": True, "notes.tmp": True,
+        # Negation isn't supported, the line is skipped.
+        "keep.tmp": True,
+    }
+
+
+def test_ignore_rules_directory_patterns_and_outside_paths(tree):
+    rules = IgnoreRules(tree, patterns=["cache/"], media_dir="renders")
+    assert rules.is_ignored(os.path.join(tree, "cache"), is_dir=True)
+    assert not rules.is_ignored(os.path.join(tree, "cache"), is_dir=False)
+    assert rules.is_ignored(os.path.join(tree, "renders", "a.py"))
+    assert not rules.is_ignored(os.path.join(tree, "media", "a.py"))
+    assert rules.is_ignored(os.path.join(os.path.dirname(tree), "elsewhere.py"))
+    assert not rules.is_ignored(tree, is_dir=True)
+
+
+def test_ignore_rules_walk_prunes_ignored_subtrees(tree):
+    rules = IgnoreRules(tree)
+    walked = {os.path.relpath(os.path.join(dirpath, f), tree).replace(os.sep, "/")
+              for dirpath, _, filenames in rules.walk() for f in filenames}
+    assert walked == {".gitignore", "scene.py", "pkg/helper.py", "sub/generated/b.py"}
+
+
+def test_polling_watcher_reports_created_modified_and_deleted(tree):
+    recorder = Recorder()
+    watcher = PollingWatcher(recorder, IgnoreRules(tree), interval=0.05)
+    watcher.start()
+    try:
+        created = os.path.join(tree, "pkg", "new.py")
+        write(created)
+        assert recorder.seen("created", created)
+        write(os.path.join(tree, "scene.py"), "x = 2  # longer\n")
+        assert recorder.seen("modified", os.path.join(tree, "scene.py"))
+        os.remove(os.path.join(tree, "pkg", "helper.py"))
+        assert recorder.seen("deleted", os.path.join(tree, "pkg", "helper.py"))
+        write(os.path.join(tree, "media", "ignored.py"))
+        write(os.path.join(tree, "pkg", "notes.txt"))
+        time.sleep(0.3)
+    finally:
+        watcher.stop()
+        watcher.join()
+    assert os.path.join(tree, "media", "ignored.py") not in recorder.paths()
+    assert os.path.join(tree, "pkg", "notes.txt") not in recorder.paths()
+
+
+@pytest.mark.skipif(not HAS_INOTIFY, reason="inotify is Linux only")
+def test_inotify_watcher_watches_only_non_ignored_directories(tree):
+    recorder = Recorder()
+    watcher = InotifyWatcher(recorder, IgnoreRules(tree))
+    watcher.start()
+    try:
+        relative = {os.path.relpath(path, tree) for path in watcher.watched}
+        # generated/ itself isn't ignored, only the .py files in it.
+        assert relative == {".", "pkg", "generated", "sub", os.path.join("sub", "generated")}
+
+        write(os.path.join(tree, "pkg", "helper.py"), "x = 3\n")
+        assert recorder.seen("modified", os.path.join(tree, "pkg", "helper.py"))
+
+        # A new directory is watched, files written into it right away included.
+        nested = os.path.join(tree, "new", "deep", "scene2.py")
+        write(nested)
+        assert recorder.seen("created", nested)
+        assert os.path.join(tree, "new", "deep") in watcher.watched
+
+        # A new ignored directory is not.
+        write(os.path.join(tree, "build", "more", "x.py"))
+        os.makedirs(os.path.join(tree, "__pycache__", "inner"))
+
+        # A moved directory keeps its watches under the new name.
+        os.rename(os.path.join(tree, "new"), os.path.join(tree, "moved"))
+        assert recorder.seen("moved", os.path.join(tree, "moved"))
+        moved = os.path.join(tree, "moved", "deep", "scene3.py")
+        write(moved)
+        assert recorder.seen("created", moved)
+
+        # Moving it into an ignored directory drops them.
+        os.rename(os.path.join(tree, "moved"), os.path.join(tree, "media", "moved"))
+        assert recorder.seen("deleted", os.path.join(tree, "moved"))
+        deleted = os.path.join(tree, "sub")
+        os.rename(deleted, os.path.join(tree, "media", "sub"))
+        assert recorder.seen("deleted", deleted)
+        time.sleep(0.2)
+        assert {os.path.relpath(path, tree) for path in watcher.watched} == {".", "pkg", "generated"}
+    finally:
+        watcher.stop()
+        watcher.join()
+    assert not any("build" in path or "__pycache__" in path or "media" in path for path in recorder.paths())
+
+
+@pytest.mark.skipif(not HAS_INOTIFY, reason="inotify is Linux only")
+def test_inotify_watcher_uses_one_instance_for_many_directories(tree):
+    for k in range(300):
+        os.makedirs(os.path.join(tree, "many", f"d{k}"))
+    before = len(os.listdir("/proc/self/fd"))
+    watcher = InotifyWatcher(Recorder(), IgnoreRules(tree))
+    try:
+        assert len(watcher.watched) > 300
+        # The inotify fd and the two ends of the stop pipe.
+        assert len(os.listdir("/proc/self/fd")) - before == 3
+    finally:
+        watcher.start()
+        watcher.stop()
+        watcher.join()
@@ -0,0 +1,211 @@
+import numpy as np
+from manim import Arc, Arrow, BraceBetweenPoints, DashedLine, Dot, Line, Mobject, ORIGIN, RIGHT, TAU
+
+# In-place replacements for ``always_redraw(lambda: Dot(...))`` and friends.
+# Each tracked mobject is built once, remembers the mobjects (or point
+# callables) it follows in ``dependencies`` and rewrites its own points from
+# them in ``refresh``, which it registers as a regular updater. Mobject
+# identity, style and submobjects survive every frame.
+
+
+def _point(source):
+    if isinstance(source, Mobject):
+        return source.get_center()
+    if callable(source):
+        return np.asarray(source(), dtype=float)
+    return np.asarray(source, dtype=float)
+
+
+def _write_points(mobject, points):
+    # Reuse the existing buffer when the layout is unchanged.
+    if mobject.points.shape == points.shape:
+        mobject.points[:] = points
+    else:
+        mobject.points = np.array(points)
+
+
+# manim's Brace path is this wide without its straight sections, which grow
+# once length * sharpness exceeds it.
+BRACE_MIN_WIDTH = 0.90552
+
+_LINE_HANDLES = np.array([0.0, 1 / 3, 2 / 3, 1.0])[:, None]
+
+
+def _segment_points(start, end):
+    # The single cubic Line.set_points_as_corners produces for two corners.
+    return start + _LINE_HANDLES * (end - start)
+
+
+class TrackedMobject:
+    def _track(self, *dependencies):
+        self.dependencies = dependencies
+        self.refresh_updater = lambda m: m.refresh()
+        self.add_updater(self.refresh_updater)
+
+
+class TrackedDot(TrackedMobject, Dot):
+    # Sits at the mean of its sources: the midpoint of two dots, a centroid...
+    def __init__(self, *sources, **kwargs):
+        super().__init__(np.mean([_point(s) for s in sources], axis=0), **kwargs)
+        self._track(*sources)
+
+    def refresh(self):
+        self.move_to(np.mean([_point(s) for s in self.dependencies], axis=0))
+        return self
+
+
+class TrackedLine(TrackedMobject, Line):
+    def __init__(self, start, end, **kwargs):
+        super().__init__(_point(start), _point(end), **kwargs)
+        self._track(start, end)
+
+    def refresh(self):
+        start, end = (_point(s) for s in self.dependencies)
+        if self.buff or self.path_arc:
+            self.set_points_by_ends(start, end, buff=self.buff, path_arc=self.path_arc)
+        else:
+            self.start, self.end = start, end
+            _write_points(self, _segment_points(start, end))
+        return self
+
+
+class TrackedDashedLine(TrackedMobject, DashedLine):
+    def __init__(self, start, end, **kwargs):
+        self.dependencies = (start, end)
+        start, end = self._ends()
+        super().__init__(start, end, **kwargs)
+        self._dash_bounds = self._measure_dashes(start, end)
+        self._track(*self.dependencies)
+
+    def _ends(self):
+        return tuple(_point(s) for s in self.dependencies)
+
+    def _dash_count(self, length):
+        return max(2, int(np.ceil((length / self.dash_length) * self.dashed_ratio)))
+
+    def _measure_dashes(self, start, end):
+        # Each dash as (t0, t1) along start -> end, read off the dashes
+        # DashedLine laid out, so the spacing stays identical.
+        vector = end - start
+        length_sq = np.dot(vector, vector) or 1.0
+        return np.array([
+            [np.dot(dash.points[0] - start, vector), np.dot(dash.points[-1] - start, vector)]
+            for dash in self.submobjects
+        ]) / length_sq
+
+    def refresh(self):
+        start, end = self._ends()
+        self.start, self.end = start, end
+        vector = end - start
+        if self._dash_count(np.linalg.norm(vector)) != len(self.submobjects):
+            # The dash count follows the length; only then rebuild the dashes.
+            template = DashedLine(start, end, dash_length=self.dash_length, dashed_ratio=self.dashed_ratio)
+            self.set_submobjects([dash.match_style(self.submobjects[0]) for dash in template.submobjects])
+            self._dash_bounds = self._measure_dashes(start, end)
+        for dash, (t0, t1) in zip(self.submobjects, self._dash_bounds):
+            _write_points(dash, _segment_points(start + t0 * vector, start + t1 * vector))
+        return self
+
+
+class TrackedPerpendicularBisector(TrackedDashedLine):
+    # Dashed segment of ``length`` through the midpoint of a and b, at right
+    # angles to a -> b.
+    def __init__(self, a, b, length=6, **kwargs):
+        self.length = length
+        super().__init__(a, b, **kwargs)
+
+    def _ends(self):
+        a, b = (_point(s) for s in self.dependencies)
+        direction = b - a
+        normal = np.array([-direction[1], direction[0], 0.0])
+        norm = np.linalg.norm(normal)
+        if norm:
+            normal /= norm
+        middle = (a + b) / 2
+        return middle - normal * self.length / 2, middle + normal * self.length / 2
+
+
+class TrackedAngle(TrackedMobject, Arc):
+    # Same arc as Angle(Line(vertex, a), Line(vertex, b), radius=...): counter-
+    # clockwise from the vertex->a ray to the vertex->b ray.
+    def __init__(self, vertex, a, b, radius=0.4, **kwargs):
+        super().__init__(radius=radius, **kwargs)
+        self._track(vertex, a, b)
+        self.refresh()
+
+    def refresh(self):
+        vertex, a, b = (_point(s) for s in self.dependencies)
+        if np.allclose(a, vertex) or np.allclose(b, vertex):
+            # Angle degenerates to an empty mobject in this case.
+            self.angle_value = 0.0
+            self.clear_points()
+            return self
+        angle_1 = np.arctan2(a[1] - vertex[1], a[0] - vertex[0])
+        angle_2 = np.arctan2(b[1] - vertex[1], b[0] - vertex[0])
+        self.angle_value = angle_2 - angle_1 if angle_2 > angle_1 else TAU - (angle_1 - angle_2)
+        self.start_angle, self.angle, self.arc_center = angle_1, self.angle_value, vertex
+        self.generate_points()
+        return self
+
+    def get_value(self, degrees=False):
+        return self.angle_value * (360 / TAU) if degrees else self.angle_value
+
+
+class TrackedArrow(TrackedMobject, Arrow):
+    def __init__(self, start, end, **kwargs):
+        super().__init__(_point(start), _point(end), **kwargs)
+        self._track(start, end)
+
+    def refresh(self):
+        start, end = (_point(s) for s in self.dependencies)
+        start_tip = getattr(self, "start_tip", None)
+        tips = self.pop_tips()
+        self.set_points_by_ends(start, end, buff=self.buff, path_arc=self.path_arc)
+        length = self.get_default_tip_length()
+        for tip in tips:
+            # The tip shrinks with short arrows exactly as in Arrow.__init__.
+            if tip.length:
+                tip.scale(length / tip.length, about_point=tip.tip_point)
+            self.add_tip(tip=tip, at_start=tip is start_tip)
+        self._set_stroke_width_from_length()
+        return self
+
+
+class TrackedBrace(TrackedMobject, BraceBetweenPoints):
+    # BraceBetweenPoints whose shape only depends on the distance between its
+    # ends. Brace fits its path to the length with a uniform stretch, and past
+    # BRACE_MIN_WIDTH / sharpness the path's straight sections grow so that
+    # stretch stays 1 / sharpness: every point then moves linearly with the
+    # length. So per set of kwargs two canonical braces are built, at that
+    # length and one unit longer, and any length is interpolated (or, below
+    # it, squeezed) from them, then rotated and translated into place.
+    _shapes = {}
+
+    def __init__(self, point_1, point_2, **kwargs):
+        self._brace_kwargs = kwargs
+        super().__init__(_point(point_1), _point(point_2), **kwargs)
+        self._track(point_1, point_2)
+
+    def _shape(self, length):
+        key = repr(sorted(self._brace_kwargs.items()))
+        shape = self._shapes.get(key)
+        if shape is None:
+            shortest = BRACE_MIN_WIDTH / self._brace_kwargs.get("sharpness", 2)
+            base = BraceBetweenPoints(ORIGIN, shortest * RIGHT, **self._brace_kwargs).points
+            longer = BraceBetweenPoints(ORIGIN, (shortest + 1) * RIGHT, **self._brace_kwargs).points
+            shape = self._shapes[key] = (shortest, base, longer - base)
+        shortest, base, slope = shape
+        if length >= shortest:
+            return base + slope * (length - shortest)
+        return base * (length / shortest, 1, 1)
+
+    def refresh(self):
+        point_1, point_2 = (_point(s) for s in self.dependencies)
+        vector = point_2 - point_1
+        length = np.linalg.norm(vector[:2])
+        if not length:
+            return self
+        cos, sin = vector[:2] / length
+        rotation = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+        _write_points(self, self._shape(length) @ rotation.T + point_1)
+        return self
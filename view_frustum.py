@@ -1,7 +1,13 @@
 from manim import *
 import numpy as np
-
-class NBVVisualization(Scene):
+from voxel_traversal import fan_directions, grid_from_points, traverse
+from occupancy_grid import OccupancyGrid, candidate_poses, evaluate_views
+from numeric_tex import NumericMathTex
+from frame_elision import FrameElisionScene
+from adaptive_plot import plot_vectorized
+from batched_mobjects import BatchedCreate, BatchedStyleAnimation, BatchedUncreate, RayFan, VoxelField
+
+class NBVVisualization(FrameElisionScene, Scene):
     def create_entropy_animation(scene):
         # LaTeX formula
         formula = MathTex(
@@ -24,32 +30,26 @@ class NBVVisualization(Scene):
         x_label = axes.get_x_axis_label("p(x)")
         y_label = axes.get_y_axis_label("I_v(x)")
 
-        # Entropy function
+        # Entropy function (vectorized: takes and returns arrays)
         def entropy(p):
-            if p <= 0 or p >= 1:
-                return 0
-            return -p * np.log2(p) - (1-p) * np.log2(1-p)
-
-        # Plot the function
-        graph = axes.plot(
-            lambda x: entropy(x) if 0 < x < 1 else 0,
-            x_range=[0.001, 0.999],
-            color=YELLOW
-        )
+            p = np.asarray(p, dtype=float)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                h = -p * np.log2(p) - (1-p) * np.log2(1-p)
+            return np.where((p > 0) & (p < 1), h, 0.0)
+
+        # Plot the function, sampled densely only where it bends
+        graph = plot_vectorized(axes, entropy, x_range=[0.001, 0.999], color=YELLOW)
 
-        # Sliding point
+        # Sliding point, read off the graph's precomputed table
         t_tracker = ValueTracker(0.1)
-        point = always_redraw(lambda: Dot(
-                                  axes.c2p(t_tracker.get_value(), entropy(t_tracker.get_value())),
-                                  color=RED,
-                                  radius=0.08
-                              ))
+        point = Dot(graph.point_from_x(t_tracker.get_value()), color=RED, radius=0.08)
+        point.add_updater(lambda m: m.move_to(graph.point_from_x(t_tracker.get_value())))
 
         # Point coordinates text
-        coords = always_redraw(lambda: MathTex(
-                                   f"({t_tracker.get_value():.2f}, {entropy(t_tracker.get_value()):.2f})",
-                                   font_size=24
-                               ).next_to(point, UR, buff=0.1))
+        coords = NumericMathTex("({}, {})", t_tracker.get_value(), graph.table(t_tracker.get_value()), font_size=24)
+        coords.add_updater(lambda m: m.set_value(t_tracker.get_value(), graph.table(t_tracker.get_value()))
+                           .next_to(point, UR, buff=0.1))
+        coords.update()
 
         # Animations
         scene.play(Write(formula))
@@ -74,6 +74,54 @@ class NBVVisualization(Scene):
             Unwrite(formula)
         )
 
+    def create_view_ranking_animation(self, voxel_positions, camera_pos, view_angle, view_distance, num_rays):
+        # Occupancy grid: the plant voxels are observed as occupied, the free
+        # space the first camera saw is observed as empty, the rest is unknown
+        voxel_size = 0.5
+        grid = OccupancyGrid((12, 14), np.array([-2.75, -3.75]), voxel_size)
+        cells = np.round((np.array(voxel_positions)[:, :2] - grid.origin) / voxel_size - 0.5).astype(int)
+        grid.integrate(np.repeat(cells, 2, axis=0), np.empty((0, 2), dtype=int))
+        first_view = traverse(camera_pos[:2], fan_directions(0, view_angle, 4 * num_rays), grid.occupied(),
+                              grid.origin, voxel_size, max_distance=view_distance)
+        grid.integrate(np.empty((0, 2), dtype=int), np.argwhere(first_view.traversed & ~grid.occupied()))
+
+        # Score candidate views on a circle around the plant
+        poses = candidate_poses(np.array([0.25, 0]), 3.5, 12)
+        ranked = evaluate_views(grid, poses, fov=view_angle, resolution=4 * num_rays,
+                                max_distance=view_distance, workers=1)
+        gains = np.empty(len(poses))
+        gains[ranked.index] = ranked.gain
+        low, high = gains.min(), gains.max()
+
+        title = Text("Candidate views are ranked by information gain", font_size=28, color=WHITE)
+        title.to_edge(UP)
+        candidates = VGroup(*[
+            Dot(np.append(pose[:2], 0), radius=0.1,
+                color=interpolate_color(BLUE, RED, (gain - low) / (high - low) if high > low else 1))
+            for pose, gain in zip(poses, gains)
+        ])
+        table = VGroup(*[
+            Text(f"#{rank}  view {index}  {gain:.1f} bits", font_size=20, color=WHITE)
+            for rank, (index, gain) in enumerate(zip(ranked.index[:5], ranked.gain[:5]), 1)
+        ]).arrange(DOWN, aligned_edge=LEFT).to_edge(RIGHT)
+
+        best = poses[ranked.index[0]]
+        best_pos = np.append(best[:2], 0)
+        best_cone = Polygon(
+            best_pos,
+            best_pos + view_distance * np.array([np.cos(best[2] + view_angle / 2), np.sin(best[2] + view_angle / 2), 0]),
+            best_pos + view_distance * np.array([np.cos(best[2] - view_angle / 2), np.sin(best[2] - view_angle / 2), 0]),
+            color=RED, fill_opacity=0.15, stroke_width=2
+        )
+
+        self.play(Write(title))
+        self.play(LaggedStart(*[GrowFromCenter(dot) for dot in candidates], lag_ratio=0.1))
+        self.play(Write(table))
+        self.play(Indicate(candidates[ranked.index[0]]), Indicate(table[0]))
+        self.play(Create(best_cone))
+        self.wait(2)
+        self.play(Uncreate(best_cone), Unwrite(table), FadeOut(candidates), Unwrite(title))
+
     def construct(self):
         # Camera position and parameters
         camera_pos = np.array([-4, 0, 0])
@@ -112,17 +160,11 @@ class NBVVisualization(Scene):
         view_cone = Polygon(*view_cone_points, color=BLUE, fill_opacity=0.1, stroke_width=0)
 
         # Generate uniform rays (representing camera pixels)
-        rays = VGroup()
         ray_angles = np.linspace(-half_angle, half_angle, num_rays)
-
-        for angle in ray_angles:
-            ray_end = camera_pos + view_distance * np.array([np.cos(angle), np.sin(angle), 0])
-            ray = Line(camera_pos, ray_end, color=YELLOW, stroke_width=1, stroke_opacity=0.7)
-            rays.add(ray)
-
-        # Generate voxels (green boxes) inside view cone
-        visible_voxels = VGroup()
-        hit_voxels = VGroup()  # Voxels that intersect with rays
+        ray_ends = camera_pos + view_distance * np.column_stack(
+            [np.cos(ray_angles), np.sin(ray_angles), np.zeros(num_rays)]
+        )
+        rays = RayFan(camera_pos, ray_ends, color=YELLOW, width=1, opacity=0.7)
 
         # Define voxel positions inside the view cone
         voxel_positions = [
@@ -146,55 +188,34 @@ class NBVVisualization(Scene):
             np.array([1,  -1.5, 0]),
         ]
 
-        # Check which voxels are hit by rays
-        hit_positions = []
-        for pos in voxel_positions:
-            # Check if voxel is roughly aligned with any ray
-            vec_to_voxel = pos - camera_pos
-            angle_to_voxel = np.arctan2(vec_to_voxel[1], vec_to_voxel[0])
-
-            # Check if this angle is close to any ray angle
-            is_hit = False
-            for ray_angle in ray_angles:
-                if abs(angle_to_voxel - ray_angle) < 0.05:  # tolerance for intersection
-                    is_hit = True
-                    break
-
-            if is_hit:
-                hit_positions.append(pos)
-
-        # Create voxels
-        for pos in voxel_positions:
-            voxel = Square(side_length=0.5, color=GREEN, fill_opacity=0.7)
-            voxel.move_to(pos)
-
-            if pos.tolist() in [p.tolist() for p in hit_positions]:
-                # voxel.set_color(RED)
-                hit_voxels.add(voxel)
-            else:
-                visible_voxels.add(voxel)
-
-        # Generate occluded voxels outside view cone (dashed lines)
-        occluded_voxels = VGroup()
-        occluded_positions = [
-            np.array([2, 3.5, 0]),
-            np.array([3, -3, 0]),
-            np.array([4, 4, 0]),
-            np.array([1, -3.5, 0]),
-            np.array([5, 2.5, 0]),
-            np.array([0, 4, 0]),
-            np.array([2, -4, 0]),
-            np.array([4.5, -2.5, 0])
-        ]
-
-        for pos in occluded_positions:
-            # Create dashed square by using multiple small rectangles
-            voxel_outline = Square(side_length=0.3, color=GRAY, fill_opacity=0)
-            voxel_outline.move_to(pos)
+        # Cast the ray fan through an occupancy grid built from the voxels
+        voxel_size = 0.5
+        occupied, grid_origin, voxel_cells = grid_from_points(
+            np.array(voxel_positions)[:, :2], voxel_size
+        )
+        traversal = traverse(
+            camera_pos[:2],
+            fan_directions(np.arctan2(direction[1], direction[0]), view_angle, num_rays),
+            occupied,
+            grid_origin,
+            voxel_size,
+            max_distance=view_distance,
+        )
+        is_hit = np.zeros(occupied.shape, dtype=bool)
+        hit_cells = traversal.first_hit[traversal.first_hit[:, 0] >= 0]
+        is_hit[tuple(hit_cells.T)] = True
 
-            # Create dashed effect by breaking the outline
-            dashed_voxel = DashedVMobject(voxel_outline, num_dashes=8, color=GRAY)
-            occluded_voxels.add(dashed_voxel)
+        # Create voxels (each occupied cell once), classified by the traversal.
+        # Occupied cells in the shadow of a hit voxel get a dashed outline.
+        cells = np.unique(voxel_cells, axis=0)
+        hit_index = np.flatnonzero(is_hit[tuple(cells.T)])
+        voxels = VoxelField(
+            np.column_stack([grid_origin + (cells + 0.5) * voxel_size, np.zeros(len(cells))]),
+            side_length=voxel_size,
+            dashed=traversal.occluded[tuple(cells.T)] & ~is_hit[tuple(cells.T)],
+            color=GREEN,
+            fill_opacity=0.7,
+        ).style_dashed(GRAY)
 
 
 
@@ -233,7 +254,7 @@ class NBVVisualization(Scene):
         titlePart.move_to(UP * 2.5)
         self.play(Write(titlePart))
         # Add voxels
-        self.play(Create(visible_voxels), Create(hit_voxels), Create(occluded_voxels), run_time=2)
+        self.play(BatchedCreate(voxels), run_time=2)
         self.wait(0.5)
 
 
@@ -246,19 +267,23 @@ class NBVVisualization(Scene):
         )
         titlePart.move_to(UP * 2.5)
         self.play(Write(titlePart))
-        smallX = Tex(
-            r"$x$",
-            font_size=32
-        )
-        smallX.move_to(RIGHT*3 + DOWN)
-
-        arrow = Arrow(
-            start=smallX.get_center(),
-            end=hit_voxels[5].get_center(),
-            color=WHITE
-        )
-        self.play(Write(smallX), Create(arrow))
-        self.wait(0.5)
+        # Point at a ray-hit voxel, if the rays hit any
+        pointer = []
+        if len(hit_index):
+            smallX = Tex(
+                r"$x$",
+                font_size=32
+            )
+            smallX.move_to(RIGHT*3 + DOWN)
+
+            arrow = Arrow(
+                start=smallX.get_center(),
+                end=voxels.element_center(hit_index[min(5, len(hit_index) - 1)]),
+                color=WHITE
+            )
+            self.play(Write(smallX), Create(arrow))
+            self.wait(0.5)
+            pointer = [Uncreate(arrow), Uncreate(smallX)]
         text_block = MathTex(
             r"p(x) = 0 \rightarrow \text{ certainly empty} \\",
             r"p(x) = 0.5 \rightarrow \text{ uncertain} \\",
@@ -268,8 +293,8 @@ class NBVVisualization(Scene):
         ).to_edge(LEFT)
         self.play(Write(text_block))
         self.wait(1)
-        self.play(Unwrite(text_block), Uncreate(arrow), Uncreate(smallX))
-        self.play(Uncreate(visible_voxels), Uncreate(hit_voxels), Uncreate(occluded_voxels), run_time=2)
+        self.play(Unwrite(text_block), *pointer)
+        self.play(BatchedUncreate(voxels), run_time=2)
 
         # What is information gain
         self.play(Unwrite(titlePart))
@@ -313,7 +338,7 @@ class NBVVisualization(Scene):
         titlePart.move_to(UP * 2)
         self.play(Write(titlePart))
         # Add rays (uniform, representing pixel resolution)
-        self.play(Create(rays), run_time=2)
+        self.play(BatchedCreate(rays), run_time=2)
         self.wait(0.5)
 
         self.play(Unwrite(titlePart))
@@ -321,7 +346,7 @@ class NBVVisualization(Scene):
         titlePart.move_to(UP * 2)
         self.play(Write(titlePart))
         # Add voxels
-        self.play(Create(visible_voxels), Create(hit_voxels), Create(occluded_voxels), run_time=2)
+        self.play(BatchedCreate(voxels), run_time=2)
         self.wait(0.5)
 
         # Highlight ray-hit voxels
@@ -331,16 +356,14 @@ class NBVVisualization(Scene):
         self.wait(2)
 
         # Optional: Animate ray scanning
-        self.play(
-            *[ray.animate.set_stroke(opacity=1, width=3) for ray in rays],
-            run_time=1
-        )
-        self.play(
-            *[ray.animate.set_stroke(opacity=0.7, width=1) for ray in rays],
-            run_time=1
-        )
+        self.play(BatchedStyleAnimation(rays, opacity=1, width=3), run_time=1)
+        self.play(BatchedStyleAnimation(rays, opacity=0.7, width=1), run_time=1)
 
         self.wait(3)
 
+        # Next best view: score candidate views against the occupancy grid
+        self.play(*[FadeOut(mob) for mob in self.mobjects])
+        self.create_view_ranking_animation(voxel_positions, camera_pos, view_angle, view_distance, num_rays)
+
 # To run this code, save it as a .py file and run:
 # manim -pql filename.py NBVVisualization
\ No newline at end of file
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+from typing import NamedTuple
+
+import numpy as np
+
+
+class TraversalResult(NamedTuple):
+    first_hit: np.ndarray  # (rays, ndim) cell index of the first occupied cell, -1 when missed
+    hit_distance: np.ndarray  # (rays,) distance to the first hit, inf when missed
+    traversed: np.ndarray  # grid-shaped bool, cells crossed up to and including the first hit
+    occluded: np.ndarray  # grid-shaped bool, cells crossed after the first hit (in shadow)
+    ray_weight: np.ndarray = None  # (rays,) sum of ``weights`` over each ray's traversed cells
+
+
+def fan_directions(heading, view_angle, num_rays):
+    # Uniform 2D ray fan around ``heading`` (radians), as unit vectors.
+    angles = heading + np.linspace(-view_angle / 2, view_angle / 2, num_rays)
+    return np.stack([np.cos(angles), np.sin(angles)], axis=1)
+
+
+def _box_entry(origins, directions, lower, upper):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse = 1.0 / directions
+        t0 = (lower - origins) * inverse
+        t1 = (upper - origins) * inverse
+    t_near = np.nanmax(np.minimum(t0, t1), axis=1)
+    t_far = np.nanmin(np.maximum(t0, t1), axis=1)
+    return np.maximum(t_near, 0.0), t_far
+
+
+def traverse(origins, directions, occupied, grid_origin, cell_size, max_distance=np.inf, weights=None,
+             stop_at_hit=False):
+    # Amanatides-Woo voxel traversal, stepped for all rays at once: every loop
+    # iteration advances each active ray by one cell along its nearest boundary.
+    # With ``stop_at_hit`` rays end at their first hit and no shadow is computed.
+    occupied = np.asarray(occupied, dtype=bool)
+    shape = np.array(occupied.shape)
+    ndim = occupied.ndim
+    directions = np.atleast_2d(np.asarray(directions, dtype=float))[:, :ndim]
+    directions = directions / np.linalg.norm(directions, axis=1, keepdims=True)
+    origins = np.broadcast_to(np.asarray(origins, dtype=float)[..., :ndim], directions.shape)
+    grid_origin = np.asarray(grid_origin, dtype=float)[:ndim]
+    num_rays = len(directions)
+
+    first_hit = np.full((num_rays, ndim), -1, dtype=np.int64)
+    hit_distance = np.full(num_rays, np.inf)
+    traversed = np.zeros(occupied.shape, dtype=bool)
+    occluded = np.zeros(occupied.shape, dtype=bool)
+    ray_weight = np.zeros(num_rays) if weights is not None else None
+    weights_flat = np.asarray(weights, dtype=float).ravel() if weights is not None else None
+
+    t_enter, t_exit = _box_entry(origins, directions, grid_origin, grid_origin + shape * cell_size)
+    limit = np.minimum(t_exit, max_distance)
+    active = np.flatnonzero(t_enter < limit)
+    if not len(active):
+        return TraversalResult(first_hit, hit_distance, traversed, occluded, ray_weight)
+
+    o = origins[active]
+    d = directions[active]
+    limit = limit[active]
+    t_cell = t_enter[active]
+    start = o + d * t_cell[:, None]
+    cell = np.clip(np.floor((start - grid_origin) / cell_size).astype(np.int64), 0, shape - 1)
+    step = np.where(d > 0, 1, -1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        boundary = grid_origin + (cell + (step > 0)) * cell_size
+        t_max = np.where(d != 0, (boundary - o) / d, np.inf)
+        t_delta = np.where(d != 0, cell_size / np.abs(d), np.inf)
+    hit = np.zeros(len(active), dtype=bool)
+    flat_strides = np.array([int(np.prod(shape[i + 1:])) for i in range(ndim)])
+    flat = cell @ flat_strides
+    # Per-ray state is kept flattened ((rays * ndim,) for per-axis values) so
+    # the inner loop only does 1-D takes and puts.
+    step_flat = (step * flat_strides).ravel()
+    cell, step, t_max, t_delta = cell.ravel(), step.ravel(), t_max.ravel(), t_delta.ravel()
+    axis_size = np.tile(shape, len(active))
+    occupied_flat = occupied.ravel()
+    traversed_flat = traversed.ravel()
+    occluded_flat = occluded.ravel()
+    base = np.arange(len(active)) * ndim
+
+    while len(active):
+        if hit.any():
+            # Rays already past their first hit only record the shadow they cast.
+            occluded_flat[flat[hit]] = True
+            traversed_flat[flat[~hit]] = True
+        else:
+            traversed_flat[flat] = True
+        if weights_flat is not None:
+            ray_weight[active] += np.where(hit, 0.0, weights_flat[flat])
+        new_hits = occupied_flat[flat] & ~hit
+        if new_hits.any():
+            rays = np.flatnonzero(new_hits)
+            first_hit[active[rays]] = cell.reshape(-1, ndim)[rays]
+            hit_distance[active[rays]] = t_cell[rays]
+            hit[rays] = True
+
+        index = base + np.argmin(t_max.reshape(-1, ndim), axis=1)
+        t_cell = t_max[index]
+        moved = cell[index] + step[index]
+        cell[index] = moved
+        flat += step_flat[index]
+        t_max[index] = t_cell + t_delta[index]
+        keep = (t_cell < limit) & (moved >= 0) & (moved < axis_size[index])
+        if stop_at_hit:
+            keep &= ~hit
+        if not keep.all():
+            # Compact the per-ray state once rays leave the grid or their range.
+            per_axis = np.repeat(keep, ndim)
+            active, limit, t_cell, hit, flat = active[keep], limit[keep], t_cell[keep], hit[keep], flat[keep]
+            cell, step, step_flat = cell[per_axis], step[per_axis], step_flat[per_axis]
+            t_max, t_delta, axis_size = t_max[per_axis], t_delta[per_axis], axis_size[per_axis]
+            base = np.arange(len(active)) * ndim
+
+    return TraversalResult(first_hit, hit_distance, traversed, occluded, ray_weight)
+
+
+def grid_from_points(points, cell_size):
+    # Occupancy grid whose cell centres sit on the given (voxel centre) points.
+    points = np.asarray(points, dtype=float)
+    lower = points.min(axis=0) - cell_size / 2
+    index = np.round((points - lower - cell_size / 2) / cell_size).astype(np.int64)
+    occupied = np.zeros(index.max(axis=0) + 1, dtype=bool)
+    occupied[tuple(index.T)] = True
+    return occupied, lower, index
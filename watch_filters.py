@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+import os
+import errno
+import ctypes
+import select
+import fnmatch
+import threading
+from watchdog.events import (
+    FileSystemEventHandler,
+    DirCreatedEvent,
+    DirDeletedEvent,
+    DirMovedEvent,
+    FileCreatedEvent,
+    FileModifiedEvent,
+    FileDeletedEvent,
+    FileMovedEvent,
+)
+
+try:
+    from watchdog.observers import inotify_c
+except Exception:
+    # Not Linux, or a libc without inotify: the watchdog Observer is used instead.
+    inotify_c = None
+
+HAS_INOTIFY = inotify_c is not None
+
+DEFAULT_IGNORES = [".git/", "__pycache__/", ".scene_hashes.json"]
+POLL_INTERVAL = 1.0
+READ_BYTES = 64 * 1024
+
+
+class IgnoreRules:
+    # A gitignore subset: blank lines and comments are skipped, a trailing "/"
+    # matches directories only, patterns containing "/" are anchored at the
+    # root, everything else matches any path component. "!" negation is not
+    # supported and such lines are ignored.
+    def __init__(self, root, patterns=(), media_dir="media"):
+        self.root = os.path.abspath(root)
+        self.patterns = []
+        for pattern in DEFAULT_IGNORES + [media_dir.rstrip("/") + "/"] + self._gitignore() + list(patterns):
+            self._add(pattern)
+
+    def _gitignore(self):
+        path = os.path.join(self.root, ".gitignore")
+        try:
+            with open(path) as f:
+                return [line.rstrip("\n") for line in f]
+        except OSError:
+            return []
+
+    def _add(self, pattern):
+        pattern = pattern.strip()
+        if not pattern or pattern.startswith("#") or pattern.startswith("!"):
+            return
+        dir_only = pattern.endswith("/")
+        pattern = pattern.rstrip("/")
+        anchored = "/" in pattern
+        self.patterns.append((pattern.lstrip("/"), dir_only, anchored))
+
+    def _matches(self, relpath, is_dir):
+        parts = relpath.split("/")
+        for pattern, dir_only, anchored in self.patterns:
+            if dir_only and not is_dir:
+                continue
+            if anchored:
+                if fnmatch.fnmatch(relpath, pattern):
+                    return True
+            elif fnmatch.fnmatch(parts[-1], pattern):
+                return True
+        return False
+
+    def is_ignored(self, path, is_dir=False):
+        relpath = os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, "/")
+        if relpath.startswith(".."):
+            return True
+        if relpath == ".":
+            return False
+        parts = relpath.split("/")
+        for depth in range(1, len(parts)):
+            if self._matches("/".join(parts[:depth]), True):
+                return True
+        return self._matches(relpath, is_dir)
+
+    def walk(self, top=None):
+        # os.walk with ignored subtrees pruned before descending into them.
+        for dirpath, dirnames, filenames in os.walk(top or self.root):
+            dirnames[:] = [d for d in dirnames if not self.is_ignored(os.path.join(dirpath, d), True)]
+            filenames = [f for f in filenames if not self.is_ignored(os.path.join(dirpath, f))]
+            yield dirpath, dirnames, filenames
+
+
+class InotifyWatcher:
+    # Native watching on Linux through a single inotify instance, so the tree
+    # costs one fd however many directories it has, with a watch on every
+    # directory that isn't ignored and none below media/, .git/ and the like.
+    # Directories created, deleted or moved later gain or lose their watches
+    # as their events come in. Events reach the handler as watchdog events.
+    def __init__(self, handler, rules):
+        self.handler = handler
+        self.rules = rules
+        self._fd = inotify_c.inotify_init()
+        if self._fd == -1:
+            raise _inotify_error()
+        self._kill_r, self._kill_w = os.pipe()
+        self._mask = (inotify_c.InotifyConstants.IN_CREATE | inotify_c.InotifyConstants.IN_MODIFY
+                      | inotify_c.InotifyConstants.IN_ATTRIB | inotify_c.InotifyConstants.IN_DELETE
+                      | inotify_c.InotifyConstants.IN_MOVED_FROM | inotify_c.InotifyConstants.IN_MOVED_TO
+                      | inotify_c.InotifyConstants.IN_ONLYDIR)
+        self._paths = {}
+        self._wds = {}
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        try:
+            self.watch_tree(rules.root)
+        except OSError:
+            self._close()
+            raise
+
+    @property
+    def watched(self):
+        return sorted(self._wds)
+
+    def watch_tree(self, top):
+        # Watches top and every directory under it that isn't ignored. Returns
+        # the files found on the way, which a new directory may already hold
+        # by the time its watch is in place.
+        files = []
+        for dirpath, _, filenames in self.rules.walk(top):
+            if self._watch(dirpath):
+                files.extend(os.path.join(dirpath, filename) for filename in filenames)
+        return files
+
+    def _watch(self, path):
+        wd = inotify_c.inotify_add_watch(self._fd, os.fsencode(path), self._mask)
+        if wd == -1:
+            error = _inotify_error()
+            if error.errno in (errno.ENOENT, errno.ENOTDIR):
+                # Gone again before its watch was added.
+                return False
+            raise error
+        previous = self._paths.get(wd)
+        if previous is not None:
+            # The same directory under a new name, after a move.
+            self._wds.pop(previous, None)
+        self._paths[wd] = path
+        self._wds[path] = wd
+        return True
+
+    def _unwatch_tree(self, top):
+        prefix = top.rstrip(os.sep) + os.sep
+        for path in [p for p in self._wds if p == top or p.startswith(prefix)]:
+            wd = self._wds.pop(path)
+            self._paths.pop(wd, None)
+            inotify_c.inotify_rm_watch(self._fd, wd)
+
+    def _run(self):
+        try:
+            while not self._stopped:
+                readable, _, _ = select.select([self._fd, self._kill_r], [], [])
+                if self._kill_r in readable:
+                    return
+                self._process(os.read(self._fd, READ_BYTES))
+        finally:
+            self._close()
+
+    def _process(self, buffer):
+        constants = inotify_c.InotifyConstants
+        moves = {}
+        for wd, mask, cookie, name in inotify_c.Inotify._parse_event_buffer(buffer):
+            if mask & constants.IN_IGNORED:
+                path = self._paths.pop(wd, None)
+                if path is not None and self._wds.get(path) == wd:
+                    del self._wds[path]
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            path = os.path.join(directory, os.fsdecode(name)) if name else directory
+            is_dir = bool(mask & constants.IN_ISDIR)
+            if mask & constants.IN_MOVED_FROM:
+                moves[cookie] = (path, is_dir)
+            elif mask & constants.IN_MOVED_TO:
+                self._moved(moves.pop(cookie, (None, is_dir))[0], path, is_dir)
+            elif self.rules.is_ignored(path, is_dir):
+                continue
+            elif mask & constants.IN_CREATE:
+                self._created(path, is_dir)
+            elif mask & constants.IN_DELETE:
+                if is_dir:
+                    self._unwatch_tree(path)
+                self._dispatch(DirDeletedEvent(path) if is_dir else FileDeletedEvent(path))
+            elif not is_dir:
+                self._dispatch(FileModifiedEvent(path))
+        # Moved out of the watched tree.
+        for path, is_dir in moves.values():
+            self._moved(path, None, is_dir)
+
+    def _created(self, path, is_dir):
+        if not is_dir:
+            self._dispatch(FileCreatedEvent(path))
+            return
+        try:
+            files = self.watch_tree(path)
+        except OSError as e:
+            print(f"⚠ Couldn't watch {path} ({e})")
+            files = []
+        self._dispatch(DirCreatedEvent(path))
+        for file_path in files:
+            self._dispatch(FileCreatedEvent(file_path))
+
+    def _moved(self, source, destination, is_dir):
+        # Either end may be outside the tree (None) or ignored.
+        if source is not None and is_dir:
+            self._unwatch_tree(source)
+        source = source if source is not None and not self.rules.is_ignored(source, is_dir) else None
+        if destination is not None and self.rules.is_ignored(destination, is_dir):
+            destination = None
+        if source and destination:
+            if is_dir:
+                self.watch_tree(destination)
+            self._dispatch(DirMovedEvent(source, destination) if is_dir else FileMovedEvent(source, destination))
+        elif source:
+            self._dispatch(DirDeletedEvent(source) if is_dir else FileDeletedEvent(source))
+        elif destination:
+            self._created(destination, is_dir)
+
+    def _dispatch(self, event):
+        try:
+            self.handler.dispatch(event)
+        except OSError as e:
+            # Raising here would end the reader thread, and with it the watching.
+            print(f"⚠ Couldn't handle {event.event_type} event for {event.src_path} ({e})")
+
+    def _close(self):
+        for fd in (self._fd, self._kill_r, self._kill_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped = True
+        os.write(self._kill_w, b"!")
+
+    def join(self):
+        self._thread.join()
+
+
+def _inotify_error():
+    code = ctypes.get_errno()
+    if code == errno.EMFILE:
+        return OSError(code, "inotify instance limit reached")
+    if code == errno.ENOSPC:
+        return OSError(code, "inotify watch limit reached")
+    return OSError(code, os.strerror(code))
+
+
+class FilteredWatchHandler(FileSystemEventHandler):
+    # For watchdog's Observer where inotify isn't available: one recursive
+    # watch on the root, with events under ignored paths such as media/
+    # dropped before they reach the handler.
+    def __init__(self, observer, handler, rules):
+        super().__init__()
+        self.observer = observer
+        self.handler = handler
+        self.rules = rules
+
+    def watch_tree(self, top):
+        self.observer.schedule(self, top, recursive=True)
+
+    def dispatch(self, event):
+        if self.rules.is_ignored(event.src_path, event.is_directory):
+            return
+        try:
+            self.handler.dispatch(event)
+        except OSError as e:
+            # Raising here would end the observer thread, and with it the watching.
+            print(f"⚠ Couldn't handle {event.event_type} event for {event.src_path} ({e})")
+
+
+class PollingWatcher:
+    # Fallback for filesystems without inotify: an mtime+size index of the
+    # non-ignored .py files, rescanned every interval and diffed.
+    def __init__(self, handler, rules, interval=POLL_INTERVAL):
+        self.handler = handler
+        self.rules = rules
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._index = self._scan()
+
+    def _scan(self):
+        index = {}
+        for dirpath, _, filenames in self.rules.walk():
+            for filename in filenames:
+                if not filename.endswith(".py"):
+                    continue
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                index[path] = (stat.st_mtime_ns, stat.st_size)
+        return index
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            index = self._scan()
+            for path, signature in index.items():
+                previous = self._index.get(path)
+                if previous is None:
+                    self.handler.dispatch(FileCreatedEvent(path))
+                elif previous != signature:
+                    self.handler.dispatch(FileModifiedEvent(path))
+            for path in self._index.keys() - index.keys():
+                self.handler.dispatch(FileDeletedEvent(path))
+            self._index = index
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self):
+        self._thread.join()